@@ -0,0 +1,3 @@
+from .backtester import Backtester, BacktestResult
+from .performance_evaluator import PerformanceEvaluator
+from .optimizer import ParameterSweep, grid_parameters, random_parameters
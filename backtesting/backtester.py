@@ -0,0 +1,177 @@
+import logging
+import time
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtesting.performance_evaluator import PerformanceEvaluator
+from decision_engine.decision_maker import BUY, SELL, DecisionMaker
+from technical_analysis.batch_analyzer import BatchSMAAnalyzer
+from technical_analysis.technical_analyzer import SMATechnicalAnalyzer
+
+
+class BacktestResult(NamedTuple):
+    symbols: list
+    index: pd.Index
+    closes: np.ndarray     # (symbols, time)
+    positions: np.ndarray  # (symbols, time), weight of each symbol's sleeve held after the bar's close
+    returns: np.ndarray    # (symbols, time), net sleeve return earned during each bar
+    traded_value: np.ndarray  # (symbols, time), notional traded at each bar's close
+    costs: np.ndarray      # (symbols, time), transaction costs paid at each bar's close
+    sleeve_equity: np.ndarray  # (symbols, time)
+    equity: np.ndarray     # (time,), sum of the sleeves
+    initial_capital: float
+    metrics: dict
+
+    def fills(self, slippage_bps: float = 0.0) -> pd.DataFrame:
+        """
+        One row per position change, filled at the bar's close moved against the
+        trade by `slippage_bps`.
+        """
+        change = np.diff(self.positions, axis=1, prepend=0)
+        rows, columns = np.nonzero(change)
+        side = np.sign(change[rows, columns])
+        closes = self.closes[rows, columns]
+        return pd.DataFrame({
+            'timestamp': self.index[columns],
+            'symbol': np.asarray(self.symbols, dtype=object)[rows],
+            'side': np.where(side > 0, 'buy', 'sell'),
+            'quantity': self.traded_value[rows, columns] / closes,
+            'price': closes * (1 + side * slippage_bps / 1e4),
+            'cost': self.costs[rows, columns],
+        })
+
+    def pnl(self) -> pd.DataFrame:
+        """
+        Per-symbol profit and loss over the whole run, net of costs.
+        """
+        return pd.DataFrame({
+            'pnl': self.sleeve_equity[:, -1] - self.initial_capital / len(self.symbols),
+            'costs': self.costs.sum(axis=1),
+            'trades': np.count_nonzero(np.diff(self.positions, axis=1, prepend=0), axis=1),
+        }, index=pd.Index(self.symbols, name='symbol'))
+
+
+def hold_forward(signals) -> np.ndarray:
+    """
+    Carry the last non-NaN signal forward along the last axis; positions before
+    the first signal are flat (0).
+    """
+    signals = np.asarray(signals, dtype=float)
+    pad = [(0, 0)] * (signals.ndim - 1) + [(1, 0)]
+    padded = np.pad(signals, pad, constant_values=0.0)
+    last_valid = np.where(np.isnan(padded), 0, np.arange(padded.shape[-1]))
+    np.maximum.accumulate(last_valid, axis=-1, out=last_valid)
+    return np.take_along_axis(padded, last_valid, axis=-1)[..., 1:]
+
+
+class Backtester:
+    """
+    Vectorized daily backtest of the SMA crossover strategy.
+
+    Per-bar SMA scores are combined with sentiment and thresholded by
+    DecisionMaker itself: a buy signal goes long, a sell signal exits (or goes
+    short with backtest_allow_short), and a hold keeps the previous position. Decisions are taken at
+    a bar's close and filled at that close, so they earn from the next bar on.
+
+    Capital is split into equal per-symbol sleeves that compound
+    independently; costs (commission plus slippage, in basis points of the
+    traded notional) are charged on every position change.
+    """
+
+    def __init__(self, config, decision_maker: DecisionMaker = None, evaluator: PerformanceEvaluator = None):
+        self.config = config
+        # The live decision rule (weights, technical score scale, thresholds), so the backtest trades like it
+        self.decision_maker = decision_maker or DecisionMaker(config, None, None)
+        self.initial_capital = float(config.get('backtest_initial_capital', 100000))
+        self.commission_bps = float(config.get('backtest_commission_bps', 1))
+        self.slippage_bps = float(config.get('backtest_slippage_bps', 5))
+        self.allow_short = bool(config.get('backtest_allow_short', False))
+        self.evaluator = evaluator or PerformanceEvaluator()
+
+    def combined_scores(self, technical_scores, sentiment_scores=None) -> np.ndarray:
+        return self.decision_maker.combined_scores(0.0 if sentiment_scores is None else sentiment_scores,
+                                                   technical_scores)
+
+    def target_positions(self, combined) -> np.ndarray:
+        """
+        Position weights from combined scores: 1 after a buy signal, 0 (or -1 when
+        shorting is allowed) after a sell signal, unchanged on hold.
+        """
+        signals = self.decision_maker.signals(combined)
+        positions = np.where(signals == BUY, 1.0, np.nan)
+        positions[signals == SELL] = -1.0 if self.allow_short else 0.0
+        return hold_forward(positions)
+
+    def run(self, closes, technical_scores, sentiment_scores=None, symbols: list = None,
+            index=None) -> BacktestResult:
+        """
+        Backtest aligned (symbols, time) arrays.
+
+        :param closes: Close prices; NaN where a symbol has no bar (it is then held flat)
+        :param technical_scores: Per-bar SMA_Score, same shape as `closes`
+        :param sentiment_scores: Optional sentiment scores broadcastable to `closes`
+        :param symbols: Row labels, defaults to the row numbers
+        :param index: Column labels (timestamps), defaults to the column numbers
+        """
+        start = time.perf_counter()
+        closes = np.atleast_2d(np.asarray(closes, dtype=float))
+        n_symbols, n_bars = closes.shape
+        traded = ~np.isnan(closes)
+
+        combined = self.combined_scores(np.atleast_2d(technical_scores), sentiment_scores)
+        positions = np.where(traded, self.target_positions(combined), 0.0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bar_returns = np.nan_to_num(closes[:, 1:] / closes[:, :-1] - 1, nan=0.0, posinf=0.0, neginf=0.0)
+        gross = np.zeros_like(closes)
+        gross[:, 1:] = positions[:, :-1] * bar_returns
+        turnover = np.abs(np.diff(positions, axis=1, prepend=0))
+        cost_rate = (self.commission_bps + self.slippage_bps) / 1e4
+        # Trades happen at the close, after the bar's move: costs are a fraction of that sleeve value
+        net = (1 + gross) * (1 - turnover * cost_rate) - 1
+
+        sleeve = self.initial_capital / n_symbols
+        sleeve_equity = sleeve * np.cumprod(1 + net, axis=1)
+        equity_before = np.concatenate([np.full((n_symbols, 1), sleeve), sleeve_equity[:, :-1]], axis=1)
+        traded_value = turnover * equity_before * (1 + gross)
+        costs = traded_value * cost_rate
+        equity = sleeve_equity.sum(axis=0)
+
+        metrics = self.evaluator.evaluate(np.concatenate([[self.initial_capital], equity]), positions,
+                                          costs.sum(axis=0))
+        logging.info(f"Backtested {n_symbols} symbols over {n_bars} bars in {time.perf_counter() - start:.3f}s: "
+                     f"total return {metrics['total_return']:.2%}, sharpe {metrics['sharpe']:.2f}")
+        return BacktestResult(
+            symbols=list(symbols) if symbols is not None else list(range(n_symbols)),
+            index=pd.Index(index if index is not None else np.arange(n_bars)),
+            closes=closes, positions=positions, returns=net, traded_value=traded_value, costs=costs,
+            sleeve_equity=sleeve_equity, equity=equity, initial_capital=self.initial_capital, metrics=metrics)
+
+    def run_panel(self, panel: pd.DataFrame, analyzer: BatchSMAAnalyzer = None,
+                  sentiment: Optional[pd.DataFrame] = None) -> BacktestResult:
+        """
+        Backtest a long-format (symbol, timestamp, close) panel, scoring every
+        bar with BatchSMAAnalyzer on each symbol's own history.
+
+        :param sentiment: Optional wide frame of sentiment scores (timestamps x symbols)
+        """
+        analyzed = (analyzer or BatchSMAAnalyzer()).analyze_panel(panel)
+        closes = analyzed.pivot(index='timestamp', columns='symbol', values='close')
+        scores = analyzed.pivot(index='timestamp', columns='symbol', values='SMA_Score').fillna(0)
+        sentiment_scores = None
+        if sentiment is not None:
+            sentiment_scores = sentiment.reindex(index=closes.index, columns=closes.columns).fillna(0).to_numpy().T
+        return self.run(closes.to_numpy().T, scores.to_numpy().T, sentiment_scores,
+                        symbols=list(closes.columns), index=closes.index)
+
+    def run_frame(self, df: pd.DataFrame, symbol: str = None, sentiment_scores=None, **analyzer_options) -> BacktestResult:
+        """
+        Backtest one symbol's bars with SMATechnicalAnalyzer, using its per-bar
+        SMA_Score column rather than only the latest score.
+        """
+        analyzer = SMATechnicalAnalyzer(df=df, **analyzer_options)
+        analyzer.run_analysis()
+        return self.run(analyzer.df['close'].to_numpy(), analyzer.df['SMA_Score'].to_numpy(), sentiment_scores,
+                        symbols=[symbol if symbol is not None else 0], index=analyzer.df['timestamp'])
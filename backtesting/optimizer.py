@@ -0,0 +1,196 @@
+"""
+Parameter sweeps for the SMA strategy: SMA windows, trend window, decision
+thresholds and technical weight, evaluated over many symbols at once.
+
+Close prices are written once to a .npy file that every worker memory-maps,
+so the process pool shares one copy through the page cache instead of
+pickling frames. Tasks are grouped by indicator parameters, and each worker
+keeps the prefix sums of the closes and the SMA, strength and score arrays
+it has computed, so overlapping windows and threshold-only variations reuse
+earlier work.
+"""
+import itertools
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from backtesting.backtester import Backtester
+from technical_analysis.utils import prefix_sums, rolling_slope, score_lookup, window_mean
+
+INDICATOR_PARAMETERS = ('short_window', 'long_window', 'trend_window')
+DEFAULT_SEARCH_SPACE = {
+    'short_window': [5, 10, 20],
+    'long_window': [50, 100, 200],
+    'trend_window': [3, 5, 10],
+    'buy_threshold': [10, 20, 30],
+    'sell_threshold': [-10, -20, -30],
+    'technical_weight': [0.5, 1.0],
+}
+
+# Per-process sweep state, built once by init_worker
+_worker_state = {}
+
+
+def grid_parameters(space: Dict[str, list]) -> List[dict]:
+    """
+    Every combination of the search space, skipping short >= long windows and sell >= buy thresholds.
+    """
+    names = list(space)
+    combinations = (dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names)))
+    return [params for params in combinations if _is_valid(params)]
+
+
+def random_parameters(space: Dict[str, list], samples: int, seed: int = None) -> List[dict]:
+    """
+    `samples` distinct valid combinations drawn uniformly from the grid.
+    """
+    grid = grid_parameters(space)
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(len(grid), size=min(samples, len(grid)), replace=False)
+    return [grid[i] for i in sorted(picks)]
+
+
+def _is_valid(params: dict) -> bool:
+    if params.get('short_window', 0) >= params.get('long_window', np.inf):
+        return False
+    return params.get('sell_threshold', -np.inf) < params.get('buy_threshold', np.inf)
+
+
+class IndicatorCache:
+    """
+    Memoized SMA scores of one close array. Prefix sums are computed once; every
+    SMA window, (short, long) strength and (short, long, trend) score is
+    computed on first use and kept.
+    """
+
+    def __init__(self, closes: np.ndarray, scoring: dict = None):
+        self.closes = closes
+        self.scoring = scoring
+        self.prefix = prefix_sums(closes)
+        self._sma = {}
+        self._strength = {}
+        self._scores = {}
+
+    def sma(self, window: int) -> np.ndarray:
+        if window not in self._sma:
+            self._sma[window] = window_mean(self.prefix, window)
+        return self._sma[window]
+
+    def strength(self, short_window: int, long_window: int) -> np.ndarray:
+        key = (short_window, long_window)
+        if key not in self._strength:
+            long_sma = self.sma(long_window)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self._strength[key] = (self.sma(short_window) - long_sma) / long_sma * 100
+        return self._strength[key]
+
+    def scores(self, short_window: int, long_window: int, trend_window: int) -> np.ndarray:
+        key = (short_window, long_window, trend_window)
+        if key not in self._scores:
+            strength = self.strength(short_window, long_window)
+            self._scores[key] = score_lookup(strength, rolling_slope(strength, trend_window), self.scoring)
+        return self._scores[key]
+
+
+def init_worker(closes_path: str, config: dict, scoring: dict = None):
+    """
+    Memory-map the shared close array and build the indicator cache of the current process once.
+    """
+    closes = np.load(closes_path, mmap_mode='r')
+    _worker_state['cache'] = IndicatorCache(closes, scoring)
+    _worker_state['config'] = config
+
+
+def evaluate_group(indicator_params: dict, decision_params: List[dict]) -> List[dict]:
+    """
+    Backtest every decision parameter set for one combination of indicator parameters.
+    :return: One row of parameters and metrics per decision parameter set
+    """
+    cache = _worker_state['cache']
+    scores = cache.scores(*(indicator_params[name] for name in INDICATOR_PARAMETERS))
+    rows = []
+    for params in decision_params:
+        backtester = Backtester(dict(_worker_state['config'], **params))
+        metrics = backtester.run(cache.closes, scores).metrics
+        rows.append(dict(indicator_params, **params, **{name: float(value) for name, value in metrics.items()}))
+    return rows
+
+
+class ParameterSweep:
+    """
+    Evaluate many strategy parameter sets over the same (symbols, time) close
+    array and rank them by a metric.
+    """
+
+    def __init__(self, config, workers: int = 1, rank_by: str = 'sharpe', scoring: dict = None):
+        self.config = config
+        self.workers = workers
+        self.rank_by = rank_by
+        self.scoring = scoring
+
+    @staticmethod
+    def closes_from_panel(panel: pd.DataFrame) -> pd.DataFrame:
+        """
+        Wide (timestamps x symbols) close frame from a long (symbol, timestamp, close) panel.
+        """
+        return panel.pivot(index='timestamp', columns='symbol', values='close').sort_index()
+
+    @staticmethod
+    def group_parameters(parameter_sets: List[dict]) -> Dict[tuple, List[dict]]:
+        groups = {}
+        for params in parameter_sets:
+            key = tuple(params[name] for name in INDICATOR_PARAMETERS)
+            groups.setdefault(key, []).append({name: value for name, value in params.items()
+                                               if name not in INDICATOR_PARAMETERS})
+        return groups
+
+    def run(self, closes, parameter_sets: List[dict]) -> pd.DataFrame:
+        """
+        :param closes: (symbols, time) close array, or a wide (timestamps x symbols) frame
+        :param parameter_sets: Dictionaries with short_window, long_window and trend_window plus
+                               Backtester config overrides such as buy_threshold
+        :return: One row per parameter set with its metrics, best `rank_by` first
+        """
+        if isinstance(closes, pd.DataFrame):
+            closes = closes.to_numpy().T
+        closes = np.ascontiguousarray(np.atleast_2d(closes), dtype=float)
+        groups = self.group_parameters(parameter_sets)
+        start = time.perf_counter()
+
+        rows = []
+        with tempfile.TemporaryDirectory(prefix='sweep-') as directory:
+            closes_path = os.path.join(directory, 'closes.npy')
+            np.save(closes_path, closes)
+            if self.workers > 1 and len(groups) > 1:
+                with ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                         initargs=(closes_path, self.config, self.scoring)) as executor:
+                    futures = {executor.submit(evaluate_group, dict(zip(INDICATOR_PARAMETERS, key)), decisions): key
+                               for key, decisions in groups.items()}
+                    for future in as_completed(futures):
+                        try:
+                            rows.extend(future.result())
+                        except Exception as e:
+                            logging.error(f'Sweep failed for indicator parameters {futures[future]}: {e}',
+                                          exc_info=True)
+            else:
+                init_worker(closes_path, self.config, self.scoring)
+                try:
+                    for key, decisions in groups.items():
+                        rows.extend(evaluate_group(dict(zip(INDICATOR_PARAMETERS, key)), decisions))
+                finally:
+                    # Drop the memory map before the temporary file is removed
+                    _worker_state.clear()
+
+        logging.info(f"Swept {len(rows)} parameter sets ({len(groups)} indicator groups) over "
+                     f"{closes.shape[0]} symbols x {closes.shape[1]} bars in {time.perf_counter() - start:.2f}s")
+        table = pd.DataFrame(rows)
+        if table.empty:
+            return table
+        table = table.sort_values(self.rank_by, ascending=False, na_position='last', kind='stable')
+        return table.reset_index(drop=True).rename_axis('rank')
@@ -0,0 +1,74 @@
+import numpy as np
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+class PerformanceEvaluator:
+    """
+    Performance metrics of equity curves.
+
+    Every metric works along the last (time) axis, so a 1-D curve yields
+    scalars and a 2-D array of curves (e.g. one per symbol or per parameter
+    set) yields one value per row.
+    """
+
+    def __init__(self, periods_per_year: int = TRADING_DAYS_PER_YEAR, risk_free_rate: float = 0.0):
+        self.periods_per_year = periods_per_year
+        self.risk_free_rate = risk_free_rate
+
+    @staticmethod
+    def period_returns(equity) -> np.ndarray:
+        """
+        Simple returns between consecutive equity values; one element shorter than `equity`.
+        """
+        equity = np.asarray(equity, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return equity[..., 1:] / equity[..., :-1] - 1
+
+    @staticmethod
+    def drawdown(equity) -> np.ndarray:
+        """
+        Fractional distance below the running peak, <= 0, same shape as `equity`.
+        """
+        equity = np.asarray(equity, dtype=float)
+        return equity / np.maximum.accumulate(equity, axis=-1) - 1
+
+    def evaluate(self, equity, positions=None, costs=None) -> dict:
+        """
+        :param equity: Equity curve(s), shape (time,) or (runs, time)
+        :param positions: Optional position weights of shape (..., symbols, time), for exposure and turnover
+        :param costs: Optional transaction costs per bar, same leading shape as `equity`
+        :return: Dictionary of metric name -> scalar or per-run array
+        """
+        equity = np.asarray(equity, dtype=float)
+        returns = self.period_returns(equity)
+        periods = returns.shape[-1]
+        years = periods / self.periods_per_year if periods else np.nan
+        excess = returns - self.risk_free_rate / self.periods_per_year
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            total_return = equity[..., -1] / equity[..., 0] - 1
+            volatility = returns.std(axis=-1, ddof=1) if periods > 1 else np.full(returns.shape[:-1], np.nan)
+            downside = np.sqrt(np.mean(np.minimum(excess, 0) ** 2, axis=-1))
+            annualizer = np.sqrt(self.periods_per_year)
+            max_drawdown = self.drawdown(equity).min(axis=-1)
+            metrics = {
+                'total_return': total_return,
+                'cagr': (1 + total_return) ** (1 / years) - 1,
+                'annual_volatility': volatility * annualizer,
+                'sharpe': excess.mean(axis=-1) / volatility * annualizer,
+                'sortino': excess.mean(axis=-1) / downside * annualizer,
+                'max_drawdown': max_drawdown,
+            }
+            metrics['calmar'] = metrics['cagr'] / -max_drawdown
+
+        if positions is not None:
+            positions = np.asarray(positions, dtype=float)
+            trades = np.abs(np.diff(positions, axis=-1, prepend=0))
+            # Average fraction of the book that is invested, and traded fraction per year
+            metrics['exposure'] = np.abs(positions).mean(axis=(-2, -1))
+            metrics['annual_turnover'] = trades.sum(axis=-1).mean(axis=-1) / years
+            metrics['trades'] = np.count_nonzero(trades, axis=(-2, -1))
+        if costs is not None:
+            metrics['total_costs'] = np.asarray(costs, dtype=float).sum(axis=-1)
+        return metrics
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.backtester import Backtester, hold_forward
+from backtesting.optimizer import (DEFAULT_SEARCH_SPACE, IndicatorCache, ParameterSweep, grid_parameters,
+                                   random_parameters)
+from backtesting.performance_evaluator import PerformanceEvaluator
+from decision_engine.decision_maker import DecisionMaker
+from technical_analysis.batch_analyzer import BatchSMAAnalyzer
+
+
+def make_panel(symbols=3, n=400, seed=11):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(symbols):
+        close = 50 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+        frames.append(pd.DataFrame({
+            'symbol': f'S{i}',
+            'timestamp': pd.date_range('2015-01-01', periods=n, freq='D'),
+            'close': close,
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_hold_forward_carries_last_signal_and_starts_flat():
+    signals = np.array([[np.nan, 1, np.nan, np.nan, 0, np.nan, 1],
+                        [np.nan, np.nan, -1, np.nan, np.nan, 1, np.nan]])
+    np.testing.assert_array_equal(hold_forward(signals), [[0, 1, 1, 1, 0, 0, 1], [0, 0, -1, -1, -1, 1, 1]])
+
+
+def test_run_hand_computed_fills_pnl_and_costs():
+    config = {'backtest_initial_capital': 1000, 'backtest_commission_bps': 10, 'backtest_slippage_bps': 0,
+              'technical_weight': 1.0, 'sentiment_weight': 0.0, 'technical_score_scale': 10}
+    closes = np.array([10.0, 11.0, 12.0, 9.0])
+    # Buy at the first close, sell at the third: earns the 10 -> 12 move
+    scores = np.array([5, 0, -5, 0])
+    result = Backtester(config).run(closes, scores)
+
+    np.testing.assert_array_equal(result.positions[0], [1, 1, 0, 0])
+    expected_final = 1000 * (1 - 0.001) * 1.2 * (1 - 0.001)
+    assert result.equity[-1] == pytest.approx(expected_final)
+    assert result.costs.sum() == pytest.approx(1.0 + 1000 * 0.999 * 1.2 * 0.001)
+
+    fills = result.fills()
+    assert list(fills['side']) == ['buy', 'sell']
+    assert fills['quantity'].iloc[0] == pytest.approx(100.0)
+    assert result.pnl()['pnl'].iloc[0] == pytest.approx(expected_final - 1000)
+    assert result.metrics['trades'] == 2
+
+
+def test_thresholds_come_from_decision_maker():
+    decision_maker = DecisionMaker({'buy_threshold': 40, 'sell_threshold': -40, 'technical_weight': 0.5,
+                                    'sentiment_weight': 0.5, 'technical_score_scale': 10}, None, None)
+    backtester = Backtester({}, decision_maker)
+    # 0.5 * 10 * 10 = 50 >= 40 buys; 0.5 * 7 * 10 = 35 holds; 0.5 * -100 = -50 sells
+    technical, sentiment = np.array([10, 7, 0, 7]), np.array([0, 0, -100, 0])
+    positions = backtester.target_positions(backtester.combined_scores(technical, sentiment))
+    np.testing.assert_array_equal(positions, [1, 1, 0, 0])
+    # The same rule the live decision step applies
+    np.testing.assert_array_equal(decision_maker.signals(decision_maker.combined_scores(sentiment, technical)),
+                                  [1, 0, -1, 0])
+
+
+def test_panel_backtest_matches_per_symbol_analyzer():
+    panel = make_panel()
+    backtester = Backtester({'backtest_commission_bps': 2, 'backtest_slippage_bps': 3})
+    combined = backtester.run_panel(panel)
+    for i, symbol in enumerate(combined.symbols):
+        single = backtester.run_frame(panel[panel['symbol'] == symbol][['timestamp', 'close']], symbol)
+        np.testing.assert_array_equal(combined.positions[i], single.positions[0])
+        np.testing.assert_allclose(combined.sleeve_equity[i] * len(combined.symbols), single.equity, rtol=1e-12)
+
+
+def test_missing_bars_are_held_flat():
+    closes = np.array([[10.0, 11.0, np.nan, 12.0, 13.0]])
+    result = Backtester({'backtest_commission_bps': 0, 'backtest_slippage_bps': 0, 'technical_score_scale': 10}).run(
+        closes, np.full((1, 5), 10))
+    np.testing.assert_array_equal(result.positions[0], [1, 1, 0, 1, 1])
+    assert np.isfinite(result.equity).all()
+
+
+def test_performance_metrics_per_row():
+    evaluator = PerformanceEvaluator(periods_per_year=4)
+    equity = np.array([[100.0, 110.0, 99.0, 121.0, 121.0],
+                       [100.0, 100.0, 100.0, 100.0, 100.0]])
+    metrics = evaluator.evaluate(equity)
+    assert metrics['total_return'] == pytest.approx([0.21, 0.0])
+    assert metrics['cagr'][0] == pytest.approx(0.21)
+    assert metrics['max_drawdown'] == pytest.approx([99 / 110 - 1, 0.0])
+    single = evaluator.evaluate(equity[0])
+    assert single['sharpe'] == pytest.approx(metrics['sharpe'][0])
+
+
+def test_indicator_cache_matches_batch_analyzer():
+    closes = ParameterSweep.closes_from_panel(make_panel(symbols=4, n=300)).to_numpy().T
+    cache = IndicatorCache(closes)
+    for short_window, long_window, trend_window in [(10, 50, 5), (5, 50, 3), (10, 100, 5)]:
+        expected = BatchSMAAnalyzer(trend_window, [short_window, long_window]).calculate(closes)['SMA_Score']
+        np.testing.assert_array_equal(cache.scores(short_window, long_window, trend_window), expected)
+    # The 50-bar SMA is computed once and shared by both pairs that use it
+    assert sorted(cache._sma) == [5, 10, 50, 100]
+
+
+def test_grid_and_random_parameters_skip_invalid_combinations():
+    space = {'short_window': [10, 50], 'long_window': [50], 'trend_window': [5],
+             'buy_threshold': [20], 'sell_threshold': [-20, 30]}
+    assert grid_parameters(space) == [{'short_window': 10, 'long_window': 50, 'trend_window': 5,
+                                       'buy_threshold': 20, 'sell_threshold': -20}]
+    samples = random_parameters(DEFAULT_SEARCH_SPACE, 10, seed=1)
+    assert len(samples) == 10 and all(params['short_window'] < params['long_window'] for params in samples)
+
+
+def test_parallel_sweep_matches_serial_and_is_ranked():
+    closes = ParameterSweep.closes_from_panel(make_panel(symbols=3, n=500))
+    space = {'short_window': [5, 10], 'long_window': [50], 'trend_window': [3, 5],
+             'buy_threshold': [20, 40], 'sell_threshold': [-20]}
+    parameter_sets = grid_parameters(space)
+    serial = ParameterSweep({}, workers=1).run(closes, parameter_sets)
+    parallel = ParameterSweep({}, workers=2).run(closes, parameter_sets)
+
+    assert len(serial) == len(parameter_sets)
+    # Sets that never trade have no volatility and an undefined Sharpe; they rank last
+    ranked = serial['sharpe']
+    assert ranked.dropna().is_monotonic_decreasing and ranked.iloc[ranked.notna().sum():].isna().all()
+    columns = list(space) + ['sharpe', 'total_return', 'trades']
+    key = list(space)
+    pd.testing.assert_frame_equal(serial[columns].sort_values(key, ignore_index=True),
+                                  parallel[columns].sort_values(key, ignore_index=True))
@@ -0,0 +1,65 @@
+"""
+Benchmark close-price reads from ticker_data (pd.read_sql_query) against the
+memory-mapped bar cache.
+
+Requires DATABASE_URL to point at a PostgreSQL database with the ticker_data
+table; benchmark rows use the BENCH* symbols and are deleted afterwards, and
+the cache is written to a temporary directory.
+
+Usage: python -m benchmarks.bench_bar_cache [--symbols 100]
+"""
+import argparse
+import tempfile
+import time
+
+from benchmarks.bench_ticker_ingest import ROWS_PER_SYMBOL, chunks, clear, make_bars
+from config.settings import load_configurations
+from data_handling.connection_pool import get_pool
+from data_handling.data_fetcher import DataFetcher
+from data_handling.data_storage import DataStorage
+
+
+def main():
+    parser = argparse.ArgumentParser(description='bar cache read benchmark')
+    parser.add_argument('--symbols', type=int, default=100)
+    args = parser.parse_args()
+
+    bars = make_bars(args.symbols * ROWS_PER_SYMBOL)
+    start_date = bars['timestamp'].min().date()
+    end_date = bars['timestamp'].max().date()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        config = dict(load_configurations(), bar_cache_dir=cache_dir)
+        pool = get_pool(config)
+        storage = DataStorage(config)
+        fetcher = DataFetcher(config)
+        clear(pool)
+        symbols = []
+        for symbol, data in chunks(bars):
+            storage.bulk_store_bars(data, symbol, 'stock')
+            fetcher.bar_cache.write(symbol, 'stock', data, [(start_date, end_date)])
+            symbols.append(symbol)
+
+        start = time.perf_counter()
+        for symbol in symbols:
+            fetcher.fetch_close_prices(symbol, start_date, end_date)
+        sql = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for symbol in symbols:
+            fetcher.fetch_close_prices(symbol, start_date, end_date, asset_type='stock')
+        cached = time.perf_counter() - start
+
+        start = time.perf_counter()
+        closes = sum(float(fetcher.bar_cache.read_arrays(symbol, 'stock', start_date, end_date,
+                                                         columns=['close'])['close'].sum())
+                     for symbol in symbols)
+        mapped = time.perf_counter() - start
+        clear(pool)
+
+    print(f"rows={len(bars)} read_sql_query={sql:.2f}s cache_frame={cached:.2f}s "
+          f"speedup={sql / cached:.1f}x cache_arrays={mapped:.3f}s ({len(bars) / mapped:,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Throughput of the vectorized indicators on a (symbols, time) array, next to
+the equivalent pandas computation on a wide frame.
+
+Usage: python -m benchmarks.bench_indicators [--symbols 500] [--bars 5040]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from technical_analysis.indicators import atr, bollinger_bands, ema, macd, rolling_zscore, rsi, vwap_deviation
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Indicator throughput benchmark')
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--bars', type=int, default=5040)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    shape = (args.symbols, args.bars)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, shape), axis=1))
+    high = close * (1 + rng.uniform(0, 0.02, shape))
+    low = close * (1 - rng.uniform(0, 0.02, shape))
+    volume = rng.uniform(1e5, 1e6, shape)
+    vwap = (high + low + close) / 3
+    # pandas works down columns: one column per symbol
+    frame = pd.DataFrame(close.T)
+
+    cases = [
+        ('ema20', lambda: ema(close, 20), lambda: frame.ewm(span=20, adjust=False).mean()),
+        ('macd', lambda: macd(close), lambda: frame.ewm(span=12, adjust=False).mean()
+         - frame.ewm(span=26, adjust=False).mean()),
+        ('rsi14', lambda: rsi(close), lambda: frame.diff().clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()),
+        ('atr14', lambda: atr(high, low, close), None),
+        ('bollinger20', lambda: bollinger_bands(close), lambda: frame.rolling(20).std()),
+        ('zscore20', lambda: rolling_zscore(close), lambda: (frame - frame.rolling(20).mean())
+         / frame.rolling(20).std()),
+        ('vwap_dev10', lambda: vwap_deviation(close, vwap, volume, 10), None),
+    ]
+    cells = close.size
+    for name, numpy_func, pandas_func in cases:
+        numpy_seconds = timed(numpy_func)
+        line = f"{name:<12} numpy={numpy_seconds:.3f}s ({cells / numpy_seconds / 1e6:.0f}M cells/s)"
+        if pandas_func is not None:
+            line += f" pandas={timed(pandas_func):.3f}s"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Benchmark row-wise assign_sma_score against the vectorized score_lookup.
+
+Usage: python -m benchmarks.bench_sma_scoring [--rows 1000000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from technical_analysis.technical_analyzer import SMATechnicalAnalyzer
+from technical_analysis.utils import score_lookup
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SMA scoring benchmark')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'SMA_Strength_Percent': rng.uniform(-40, 40, args.rows),
+        'SMA_Strength_Slope': rng.uniform(-2, 2, args.rows),
+    })
+    analyzer = SMATechnicalAnalyzer(df=df.head(1))
+
+    start = time.perf_counter()
+    expected = df.apply(analyzer.assign_sma_score, axis=1).to_numpy()
+    row_wise = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scores = score_lookup(df['SMA_Strength_Percent'], df['SMA_Strength_Slope'])
+    vectorized = time.perf_counter() - start
+
+    assert np.array_equal(scores, expected)
+    print(f"rows={args.rows} apply={row_wise:.3f}s lookup={vectorized:.4f}s "
+          f"speedup={row_wise / vectorized:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
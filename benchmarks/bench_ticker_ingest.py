@@ -0,0 +1,91 @@
+"""
+Benchmark the row-wise executemany insert against the COPY-based bulk loader.
+
+Requires DATABASE_URL to point at a PostgreSQL database with the ticker_data
+table; benchmark rows use the BENCH* symbols and are deleted afterwards.
+
+Usage: python -m benchmarks.bench_ticker_ingest [--sizes 10000 100000 1000000] [--skip-legacy-above 100000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from config.settings import load_configurations
+from data_handling.connection_pool import get_pool
+from data_handling.data_storage import DataStorage
+
+ROWS_PER_SYMBOL = 10000
+
+
+def make_bars(rows):
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows)))
+    return pd.DataFrame({
+        'timestamp': np.tile(pd.date_range('1990-01-01', periods=ROWS_PER_SYMBOL, freq='D'),
+                             -(-rows // ROWS_PER_SYMBOL))[:rows],
+        'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+        'volume': rng.integers(1_000, 1_000_000, rows).astype(float),
+        'trade_count': rng.integers(10, 10_000, rows),
+        'vwap': close,
+    })
+
+
+def chunks(bars):
+    for i, start in enumerate(range(0, len(bars), ROWS_PER_SYMBOL)):
+        yield f'BENCH{i}', bars.iloc[start:start + ROWS_PER_SYMBOL]
+
+
+def legacy_store(pool, bars):
+    """ The previous DataFetcher.store_data_in_db implementation """
+    with pool.connection() as connection, connection.cursor() as cursor:
+        for symbol, data in chunks(bars):
+            cursor.executemany("""
+                INSERT INTO ticker_data (symbol, asset_type, timestamp, open, high, low, close, volume, trade_count, vwap)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (symbol, asset_type, timeframe, timestamp) DO NOTHING
+            """, [
+                (symbol, 'stock', row['timestamp'].strftime('%Y-%m-%d'), row['open'], row['high'],
+                 row['low'], row['close'], row['volume'], row['trade_count'], row['vwap'])
+                for index, row in data.iterrows()
+            ])
+
+
+def clear(pool):
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute("DELETE FROM ticker_data WHERE symbol LIKE 'BENCH%%'")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ticker_data ingest benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--skip-legacy-above', type=int, default=None,
+                        help='Skip the slow row-wise path for sizes above this')
+    args = parser.parse_args()
+
+    config = load_configurations()
+    pool = get_pool(config)
+    storage = DataStorage(config)
+    for size in args.sizes:
+        bars = make_bars(size)
+        clear(pool)
+        legacy = None
+        if args.skip_legacy_above is None or size <= args.skip_legacy_above:
+            start = time.perf_counter()
+            legacy_store(pool, bars)
+            legacy = time.perf_counter() - start
+            clear(pool)
+
+        start = time.perf_counter()
+        for symbol, data in chunks(bars):
+            storage.bulk_store_bars(data, symbol, 'stock')
+        bulk = time.perf_counter() - start
+        clear(pool)
+
+        legacy_text = f"{legacy:.2f}s speedup={legacy / bulk:.1f}x" if legacy is not None else 'skipped'
+        print(f"rows={size} executemany={legacy_text} copy={bulk:.2f}s ({size / bulk:,.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
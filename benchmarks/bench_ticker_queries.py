@@ -0,0 +1,111 @@
+"""
+Benchmark close-price range queries on ticker_data before and after the schema
+migrations (DOUBLE PRECISION columns, covering index), and optionally after
+monthly partitioning.
+
+Requires DATABASE_URL to point at a PostgreSQL database. Everything runs in a
+scratch schema (bench_migrations) that is dropped afterwards.
+
+Usage: python -m benchmarks.bench_ticker_queries [--symbols 200] [--days 2500] [--queries 500] [--partition]
+"""
+import argparse
+import datetime
+import time
+
+import numpy as np
+
+from config.settings import load_configurations
+from data_handling.connection_pool import ConnectionPool
+from data_handling.migrations import migrate, partition_ticker_data
+
+SCHEMA = 'bench_migrations'
+FIRST_DAY = datetime.date(2000, 1, 1)
+
+
+def with_search_path(database_url):
+    separator = '&' if '?' in database_url else '?'
+    return f'{database_url}{separator}options=-csearch_path%3D{SCHEMA}'
+
+
+def load_rows(pool, symbols, days):
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute(f"""
+            INSERT INTO ticker_data (symbol, asset_type, timestamp, open, high, low, close, volume, trade_count, vwap)
+            SELECT 'S' || s, 'stock', DATE '2000-01-01' + d,
+                   100 + d * 0.01, 101 + d * 0.01, 99 + d * 0.01, 100.5 + d * 0.01, 1000000 + s, 5000, 100.2
+            FROM generate_series(1, {symbols}) AS s, generate_series(0, {days - 1}) AS d
+        """)
+
+
+def vacuum_analyze(pool):
+    connection = pool.getconn()
+    try:
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute('VACUUM ANALYZE ticker_data')
+        connection.autocommit = False
+    finally:
+        pool.putconn(connection)
+
+
+def time_queries(pool, query, symbols, days, queries, extra_params=()):
+    rng = np.random.default_rng(0)
+    latencies = []
+    with pool.connection() as connection, connection.cursor() as cursor:
+        for _ in range(queries):
+            # One year of one random symbol, as fetch_close_prices reads it
+            first = FIRST_DAY + datetime.timedelta(days=int(rng.integers(0, days - 365)))
+            params = (f'S{rng.integers(1, symbols + 1)}', first, first + datetime.timedelta(days=365))
+            start = time.perf_counter()
+            cursor.execute(query, params + tuple(extra_params))
+            cursor.fetchall()
+            latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+    return f"p50={np.percentile(latencies, 50):.2f}ms p99={np.percentile(latencies, 99):.2f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ticker_data query latency before/after migrations')
+    parser.add_argument('--symbols', type=int, default=200)
+    parser.add_argument('--days', type=int, default=2500)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--partition', action='store_true', help='Also measure after monthly partitioning')
+    args = parser.parse_args()
+
+    config = load_configurations()
+    pool = ConnectionPool(with_search_path(config['database_url']))
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+        cursor.execute(f'CREATE SCHEMA {SCHEMA}')
+    try:
+        migrate(pool, target=1)
+        load_rows(pool, args.symbols, args.days)
+        vacuum_analyze(pool)
+        before = time_queries(pool, """
+            SELECT timestamp, close FROM ticker_data
+            WHERE symbol = %s AND timestamp BETWEEN %s AND %s ORDER BY timestamp ASC
+        """, args.symbols, args.days, args.queries)
+        print(f"rows={args.symbols * args.days} before (DECIMAL, unique index only): {before}")
+
+        migrate(pool)
+        vacuum_analyze(pool)
+        after_query = """
+            SELECT timestamp, close FROM ticker_data
+            WHERE symbol = %s AND timestamp BETWEEN %s AND %s AND timeframe = %s ORDER BY timestamp ASC
+        """
+        after = time_queries(pool, after_query, args.symbols, args.days, args.queries, ('1Day',))
+        print(f"rows={args.symbols * args.days} after (DOUBLE PRECISION, covering index): {after}")
+
+        if args.partition:
+            partition_ticker_data(pool, 'month')
+            vacuum_analyze(pool)
+            partitioned = time_queries(pool, after_query, args.symbols, args.days, args.queries, ('1Day',))
+            print(f"rows={args.symbols * args.days} after monthly partitioning: {partitioned}")
+    finally:
+        with pool.connection() as connection, connection.cursor() as cursor:
+            cursor.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+        pool.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -12,11 +12,51 @@ def load_configurations():
         'technical_weight': float(os.getenv('TECHNICAL_WEIGHT', 0.5)),
         'buy_threshold': float(os.getenv('BUY_THRESHOLD', 20)),
         'sell_threshold': float(os.getenv('SELL_THRESHOLD', -20)),
+        'technical_score_scale': float(os.getenv('TECHNICAL_SCORE_SCALE', 10)),
+        'max_position_weight': float(os.getenv('MAX_POSITION_WEIGHT', 0.1)),
+        'max_gross_exposure': float(os.getenv('MAX_GROSS_EXPOSURE', 1.0)),
+        'min_order_value': float(os.getenv('MIN_ORDER_VALUE', 0)),
+        'allow_fractional_shares': os.getenv('ALLOW_FRACTIONAL_SHARES', 'false').lower() == 'true',
+        'order_max_concurrency': int(os.getenv('ORDER_MAX_CONCURRENCY', 8)),
+        'order_requests_per_second': float(os.getenv('ORDER_REQUESTS_PER_SECOND', 3)),
+        'order_sells_first': os.getenv('ORDER_SELLS_FIRST', 'true').lower() == 'true',
+        'simulated_balance': float(os.getenv('SIMULATED_BALANCE', 10000)),
+        'simulated_order_latency': float(os.getenv('SIMULATED_ORDER_LATENCY', 0.05)),
         'database_url': os.getenv('DATABASE_URL', 'default_database_url'),
+        'db_pool_min_size': int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+        'db_pool_max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+        'db_pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', 30)),
+        'db_pool_health_check': os.getenv('DB_POOL_HEALTH_CHECK', 'true').lower() == 'true',
+        'bulk_ingest_batch_size': int(os.getenv('BULK_INGEST_BATCH_SIZE', 50000)),
+        'coverage_merge_days': int(os.getenv('COVERAGE_MERGE_DAYS', 5)),
+        'alpaca_batch_size': int(os.getenv('ALPACA_BATCH_SIZE', 100)),
+        'alpaca_fetch_workers': int(os.getenv('ALPACA_FETCH_WORKERS', 4)),
+        'bar_cache_dir': os.getenv('BAR_CACHE_DIR', 'cache/bars'),
+        'bar_cache_verify': os.getenv('BAR_CACHE_VERIFY', 'true').lower() == 'true',
+        'llm_cache_path': os.getenv('LLM_CACHE_PATH', 'cache/llm_cache.sqlite3'),
+        'llm_cache_ttl': float(os.getenv('LLM_CACHE_TTL', 3600)),
+        'llm_cache_max_entries': int(os.getenv('LLM_CACHE_MAX_ENTRIES', 10000)),
+        'pplx_max_concurrency': int(os.getenv('PPLX_MAX_CONCURRENCY', 4)),
+        'pplx_requests_per_second': float(os.getenv('PPLX_REQUESTS_PER_SECOND', 0.8)),
+        'openai_max_concurrency': int(os.getenv('OPENAI_MAX_CONCURRENCY', 16)),
+        'openai_requests_per_second': float(os.getenv('OPENAI_REQUESTS_PER_SECOND', 8)),
+        'sentiment_batch_size': int(os.getenv('SENTIMENT_BATCH_SIZE', 10)),
+        'sentiment_batch_token_budget': int(os.getenv('SENTIMENT_BATCH_TOKEN_BUDGET', 6000)),
         'alpaca_api_key': os.getenv('ALPACA_API_KEY', 'default_api_key'),
         'alpaca_api_secret': os.getenv('ALPACA_API_SECRET', 'default_api_secret'),
         'pplx_api_key': os.getenv('PPLX_API_KEY', 'default_api_key'),
-        'polygon_api_key': os.getenv('POLYGON_API_KEY', 'default_api')
+        'polygon_api_key': os.getenv('POLYGON_API_KEY', 'default_api'),
+        'polygon_base_url': os.getenv('POLYGON_BASE_URL', 'https://api.polygon.io'),
+        'polygon_timeout': float(os.getenv('POLYGON_TIMEOUT', 10)),
+        'polygon_max_retries': int(os.getenv('POLYGON_MAX_RETRIES', 5)),
+        'polygon_backoff_base': float(os.getenv('POLYGON_BACKOFF_BASE', 0.5)),
+        'polygon_pool_size': int(os.getenv('POLYGON_POOL_SIZE', 10)),
+        'polygon_cache_path': os.getenv('POLYGON_CACHE_PATH', 'cache/polygon_cache.sqlite3'),
+        'polygon_cache_ttl': float(os.getenv('POLYGON_CACHE_TTL', 900)),
+        'backtest_initial_capital': float(os.getenv('BACKTEST_INITIAL_CAPITAL', 100000)),
+        'backtest_commission_bps': float(os.getenv('BACKTEST_COMMISSION_BPS', 1)),
+        'backtest_slippage_bps': float(os.getenv('BACKTEST_SLIPPAGE_BPS', 5)),
+        'backtest_allow_short': os.getenv('BACKTEST_ALLOW_SHORT', 'false').lower() == 'true'
     }
 
     logging.info(config)
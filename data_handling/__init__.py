@@ -2,3 +2,5 @@ from .data_fetcher import DataFetcher
 from .data_processor import DataProcessor
 from .data_storage import DataStorage
 from .account_manager import AccountManager
+from .connection_pool import ConnectionPool, get_pool, close_all_pools
+from .simulated_broker import SimulatedBroker, OrderRejected
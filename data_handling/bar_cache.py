@@ -0,0 +1,249 @@
+import datetime
+import fcntl
+import json
+import logging
+import os
+import re
+import shutil
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import psycopg2
+
+from data_handling.coverage import DateRange, IntervalSet
+from data_handling.data_storage import DAILY_TIMEFRAME
+
+# Columns stored by the cache, one .npy file each, and their on-disk dtypes
+CACHE_DTYPES = {
+    'timestamp': 'datetime64[ns]',
+    'open': 'float64',
+    'high': 'float64',
+    'low': 'float64',
+    'close': 'float64',
+    'volume': 'float64',
+    'trade_count': 'int64',
+    'vwap': 'float64',
+}
+
+# Appends create a segment each; past this many, the next write compacts the key into one
+MAX_SEGMENTS = 32
+
+
+class BarCache:
+    """
+    On-disk columnar bar store used as a read-through tier in front of ticker_data.
+
+    Every (timeframe, asset_type, symbol) key is a directory holding a meta.json
+    (row count, covered date ranges, segment list) and one or more immutable
+    segments: v<version>/ directories with one NumPy .npy file per column, in
+    timestamp order. Reads memory-map the column files, so loading a range is a
+    binary search plus zero-copy slices (concatenated only when the range spans
+    segments). Bars newer than everything cached are appended as a new segment;
+    other writes, and appends beyond MAX_SEGMENTS, rewrite the key into a single
+    segment. meta.json is switched atomically, and readers of a previous layout
+    keep their mappings.
+    """
+
+    def __init__(self, root: str, timeframe: str = DAILY_TIMEFRAME):
+        self.root = root
+        self.timeframe = timeframe
+
+    def _key_dir(self, symbol: str, asset_type: str) -> str:
+        # Symbols such as 'BTC/USD' are not valid path components
+        return os.path.join(self.root, self.timeframe, asset_type, re.sub(r'[^A-Za-z0-9.\-]', '_', symbol))
+
+    def _read_meta(self, key_dir: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(key_dir, 'meta.json')) as meta_file:
+                return json.load(meta_file)
+        except (OSError, ValueError):
+            return None
+
+    @contextmanager
+    def _locked(self, key_dir: str):
+        # Serializes writers of the same key across worker processes
+        os.makedirs(key_dir, exist_ok=True)
+        with open(os.path.join(key_dir, '.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _meta_coverage(meta: Optional[dict]) -> IntervalSet:
+        if meta is None:
+            return IntervalSet()
+        return IntervalSet([(datetime.date.fromisoformat(start), datetime.date.fromisoformat(end))
+                            for start, end in meta['coverage']])
+
+    def coverage(self, symbol: str, asset_type: str) -> IntervalSet:
+        """
+        Date ranges for which the cache holds every stored bar.
+        """
+        return self._meta_coverage(self._read_meta(self._key_dir(symbol, asset_type)))
+
+    def _load_segments(self, key_dir: str, meta: dict, columns: List[str]) -> List[Dict[str, np.ndarray]]:
+        return [{column: np.load(os.path.join(key_dir, segment, f'{column}.npy'), mmap_mode='r') for column in columns}
+                for segment in meta['segments']]
+
+    def _load_columns(self, key_dir: str, meta: dict, columns: List[str]) -> Dict[str, np.ndarray]:
+        segments = self._load_segments(key_dir, meta, columns)
+        if len(segments) == 1:
+            return segments[0]
+        return {column: np.concatenate([segment[column] for segment in segments]) for column in columns}
+
+    def read_arrays(self, symbol: str, asset_type: str, start_date: datetime.date, end_date: datetime.date,
+                    columns: List[str] = None) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Memory-mapped column slices of the bars between start_date and end_date.
+
+        :param columns: Columns to load; defaults to every CACHE_DTYPES column
+        :return: Dictionary of column -> read-only array, or None if the range is not fully cached
+        """
+        key_dir = self._key_dir(symbol, asset_type)
+        meta = self._read_meta(key_dir)
+        if meta is None or self._meta_coverage(meta).missing(start_date, end_date):
+            return None
+        columns = list(columns or CACHE_DTYPES)
+        try:
+            segments = self._load_segments(key_dir, meta, sorted(set(columns) | {'timestamp'}))
+        except (OSError, ValueError) as e:
+            logging.warning(f"Bar cache for {symbol} is unreadable, ignoring it: {e}")
+            return None
+        slices = []
+        for arrays in segments:
+            timestamps = arrays['timestamp']
+            lo = np.searchsorted(timestamps, np.datetime64(start_date, 'ns'), side='left')
+            hi = np.searchsorted(timestamps, np.datetime64(end_date, 'ns'), side='right')
+            slices.append({column: arrays[column][lo:hi] for column in columns})
+        overlapping = [arrays for arrays in slices if len(arrays[columns[0]])]
+        if len(overlapping) <= 1:
+            # Zero-copy unless the range spans segments
+            return overlapping[0] if overlapping else slices[0]
+        return {column: np.concatenate([arrays[column] for arrays in overlapping]) for column in columns}
+
+    def read(self, symbol: str, asset_type: str, start_date: datetime.date,
+             end_date: datetime.date) -> Optional[pd.DataFrame]:
+        """
+        Bars between start_date and end_date as a frame with the CACHE_DTYPES
+        columns, or None if the range is not fully cached.
+        """
+        arrays = self.read_arrays(symbol, asset_type, start_date, end_date)
+        if arrays is None:
+            return None
+        return pd.DataFrame(arrays)
+
+    def write(self, symbol: str, asset_type: str, bars: pd.DataFrame, covered: List[DateRange]):
+        """
+        Merge bars into the cache and mark the `covered` date ranges as complete.
+        Bars already cached win over new ones, matching ON CONFLICT DO NOTHING in ticker_data.
+        Bars newer than the cached ones are appended as a segment in O(new bars).
+
+        :param bars: Frame with the CACHE_DTYPES columns (timestamps normalized to dates)
+        :param covered: Inclusive date ranges for which `bars` holds every stored bar
+        """
+        key_dir = self._key_dir(symbol, asset_type)
+        with self._locked(key_dir):
+            meta = self._read_meta(key_dir)
+            coverage = self._meta_coverage(meta)
+            for start, end in covered:
+                coverage.add(start, end)
+            new = (bars[list(CACHE_DTYPES)].astype(CACHE_DTYPES)
+                   .drop_duplicates('timestamp', keep='first').sort_values('timestamp', kind='stable'))
+            segments = meta['segments'] if meta is not None else []
+            rows = meta['rows'] if meta is not None else 0
+
+            if segments:
+                last = self._load_segments(key_dir, {'segments': segments[-1:]}, ['timestamp'])[0]['timestamp']
+                appendable = len(last) == 0 or new.empty or new['timestamp'].iloc[0] > last[-1]
+                if not appendable or len(segments) >= MAX_SEGMENTS:
+                    # Out-of-order bars or too many segments: rewrite the key as one segment
+                    existing = pd.DataFrame(self._load_columns(key_dir, meta, list(CACHE_DTYPES)))
+                    new = (pd.concat([existing, new], ignore_index=True)
+                           .drop_duplicates('timestamp', keep='first').sort_values('timestamp', kind='stable'))
+                    segments, rows = [], 0
+
+            # Never reuse a version number: a reader may still map an invalidated version's files
+            versions = [int(entry[1:]) for entry in os.listdir(key_dir) if re.fullmatch(r'v\d+', entry)]
+            version = max(versions, default=0) + 1
+            if not new.empty or not segments:
+                version_dir = os.path.join(key_dir, f'v{version}')
+                os.makedirs(version_dir, exist_ok=True)
+                for column, dtype in CACHE_DTYPES.items():
+                    np.save(os.path.join(version_dir, f'{column}.npy'), new[column].to_numpy(dtype=dtype))
+                segments = segments + [f'v{version}']
+                rows += len(new)
+
+            meta = {
+                'segments': segments,
+                'rows': rows,
+                'coverage': [[start.isoformat(), end.isoformat()] for start, end in coverage.ranges],
+            }
+            meta_path = os.path.join(key_dir, 'meta.json')
+            with open(meta_path + '.tmp', 'w') as meta_file:
+                json.dump(meta, meta_file)
+            os.replace(meta_path + '.tmp', meta_path)
+
+            # Open mappings of unreferenced segments stay valid after their files are unlinked
+            for entry in os.listdir(key_dir):
+                if re.fullmatch(r'v\d+', entry) and entry not in segments:
+                    shutil.rmtree(os.path.join(key_dir, entry), ignore_errors=True)
+
+    def invalidate(self, symbol: str, asset_type: str):
+        key_dir = self._key_dir(symbol, asset_type)
+        with self._locked(key_dir):
+            try:
+                os.remove(os.path.join(key_dir, 'meta.json'))
+            except FileNotFoundError:
+                pass
+        logging.info(f"Invalidated bar cache for {symbol} ({asset_type})")
+
+    def verify(self, pool, symbol: str, asset_type: str) -> bool:
+        """
+        Compare the cached bars with ticker_data over the cached coverage (row
+        count, first and last date, sum of closes) and invalidate the entry on mismatch.
+
+        :return: True if the cache agrees with the database (or holds nothing for the key)
+        """
+        key_dir = self._key_dir(symbol, asset_type)
+        meta = self._read_meta(key_dir)
+        coverage = self._meta_coverage(meta)
+        if not coverage.ranges:
+            return True
+        try:
+            arrays = self._load_columns(key_dir, meta, ['timestamp', 'close'])
+        except (OSError, ValueError):
+            return True
+        timestamps = arrays['timestamp']
+        mask = np.zeros(len(timestamps), dtype=bool)
+        for start, end in coverage.ranges:
+            mask |= (timestamps >= np.datetime64(start, 'ns')) & (timestamps <= np.datetime64(end, 'ns'))
+        timestamps = timestamps[mask]
+
+        range_filter = ' OR '.join(['timestamp BETWEEN %s AND %s'] * len(coverage.ranges))
+        params = [symbol, asset_type, self.timeframe] + [date for date_range in coverage.ranges for date in date_range]
+        try:
+            with pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(f"""
+                    SELECT COUNT(*), MIN(timestamp)::date, MAX(timestamp)::date, COALESCE(SUM(close::float8), 0)
+                    FROM ticker_data
+                    WHERE symbol = %s AND asset_type = %s AND timeframe = %s AND ({range_filter})
+                """, params)
+                count, first, last, close_sum = cursor.fetchone()
+        except psycopg2.Error as e:
+            logging.error(f"Error verifying bar cache for {symbol}: {e}")
+            return True
+
+        cached = (len(timestamps),
+                  pd.Timestamp(timestamps[0]).date() if len(timestamps) else None,
+                  pd.Timestamp(timestamps[-1]).date() if len(timestamps) else None)
+        consistent = (cached == (count, first, last)
+                      and bool(np.isclose(np.sum(arrays['close'][mask]), close_sum, rtol=1e-9, atol=1e-6)))
+        if not consistent:
+            logging.warning(f"Bar cache for {symbol} disagrees with ticker_data "
+                            f"(cache rows/first/last {cached}, database {(count, first, last)}); invalidating")
+            self.invalidate(symbol, asset_type)
+        return consistent
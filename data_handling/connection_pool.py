@@ -0,0 +1,149 @@
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import pool as pg_pool
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+
+class ConnectionPool:
+    """
+    Thread-safe PostgreSQL connection pool shared by the data_handling classes.
+
+    Borrowing blocks for up to `timeout` seconds when all `max_size` connections
+    are in use instead of failing immediately. Connections are health-checked
+    when borrowed and replaced if they are closed or broken.
+    """
+
+    def __init__(self, database_url, min_size=1, max_size=10, timeout=30.0, health_check=True):
+        self.database_url = database_url
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check = health_check
+        self._pool = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def _get_pool(self):
+        # Created lazily so an unreachable database is retried on the next borrow
+        with self._lock:
+            if self._pool is None or self._pool.closed:
+                self._pool = pg_pool.ThreadedConnectionPool(self.min_size, self.max_size, self.database_url)
+                logging.info(f'Created PostgreSQL connection pool (min={self.min_size}, max={self.max_size})')
+            return self._pool
+
+    def _is_healthy(self, connection):
+        if connection.closed:
+            return False
+        if not self.health_check:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            connection.rollback()
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
+
+    def getconn(self):
+        """
+        Borrow a healthy connection; pair every call with putconn().
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise pg_pool.PoolError(f'No connection available within {self.timeout}s')
+        try:
+            pool = self._get_pool()
+            connection = pool.getconn()
+            if not self._is_healthy(connection):
+                logging.warning('Discarding broken PostgreSQL connection')
+                pool.putconn(connection, close=True)
+                connection = pool.getconn()
+            return connection
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, connection):
+        """
+        Return a borrowed connection, rolling back anything left uncommitted.
+        """
+        try:
+            pool = self._pool
+            if pool is None or pool.closed:
+                connection.close()
+                return
+            if not connection.closed and connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                try:
+                    connection.rollback()
+                except psycopg2.Error:
+                    connection.close()
+            try:
+                pool.putconn(connection, close=bool(connection.closed))
+            except pg_pool.PoolError:
+                # Borrowed from a pool that has since been closed and recreated
+                connection.close()
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection for the duration of a with-block. The transaction is
+        committed when the block exits normally and rolled back on exceptions.
+        """
+        connection = self.getconn()
+        try:
+            yield connection
+            connection.commit()
+        except Exception:
+            if not connection.closed:
+                connection.rollback()
+            raise
+        finally:
+            self.putconn(connection)
+
+    def close(self):
+        """
+        Close every connection held by the pool.
+        """
+        with self._lock:
+            if self._pool is not None and not self._pool.closed:
+                self._pool.closeall()
+                logging.info('Closed PostgreSQL connection pool')
+            self._pool = None
+
+
+# One pool per (process, database URL): pools must never be shared across a fork
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(config) -> ConnectionPool:
+    """
+    Return the shared connection pool for config['database_url'], creating it on first use.
+    """
+    key = (os.getpid(), config['database_url'])
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(
+                config['database_url'],
+                min_size=int(config.get('db_pool_min_size', 1)),
+                max_size=int(config.get('db_pool_max_size', 10)),
+                timeout=float(config.get('db_pool_timeout', 30)),
+                health_check=bool(config.get('db_pool_health_check', True)),
+            )
+        return _pools[key]
+
+
+def close_all_pools():
+    """
+    Close the pools created by this process.
+    """
+    with _pools_lock:
+        for key, connection_pool in list(_pools.items()):
+            if key[0] == os.getpid():
+                connection_pool.close()
+                del _pools[key]
@@ -0,0 +1,164 @@
+import datetime
+import logging
+from typing import List, Tuple
+
+import psycopg2
+
+DateRange = Tuple[datetime.date, datetime.date]
+
+ONE_DAY = datetime.timedelta(days=1)
+
+# Longest break between stored daily bars that is still a market closure
+# (Friday to Tuesday over a long weekend) rather than a hole in the history
+SEED_MAX_GAP_DAYS = 4
+
+
+class IntervalSet:
+    """
+    Sorted set of disjoint, inclusive date ranges. Overlapping or adjacent
+    ranges are merged on insert.
+    """
+
+    def __init__(self, ranges: List[DateRange] = None):
+        self.ranges = []
+        for start, end in ranges or []:
+            self.add(start, end)
+
+    def add(self, start: datetime.date, end: datetime.date):
+        if start > end:
+            return
+        merged = []
+        for range_start, range_end in self.ranges:
+            if range_end + ONE_DAY < start or end + ONE_DAY < range_start:
+                merged.append((range_start, range_end))
+            else:
+                start, end = min(start, range_start), max(end, range_end)
+        merged.append((start, end))
+        self.ranges = sorted(merged)
+
+    def missing(self, start: datetime.date, end: datetime.date) -> List[DateRange]:
+        """
+        Sub-ranges of [start, end] not covered by the set.
+        """
+        gaps = []
+        cursor = start
+        for range_start, range_end in self.ranges:
+            if range_end < cursor:
+                continue
+            if range_start > end:
+                break
+            if range_start > cursor:
+                gaps.append((cursor, range_start - ONE_DAY))
+            cursor = range_end + ONE_DAY
+            if cursor > end:
+                return gaps
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def intersection(self, start: datetime.date, end: datetime.date) -> List[DateRange]:
+        """
+        Covered sub-ranges of [start, end].
+        """
+        return [(max(start, range_start), min(end, range_end))
+                for range_start, range_end in self.ranges
+                if range_start <= end and range_end >= start]
+
+    def __eq__(self, other):
+        return isinstance(other, IntervalSet) and self.ranges == other.ranges
+
+    def __repr__(self):
+        return f'IntervalSet({self.ranges})'
+
+
+def merge_gaps(gaps: List[DateRange], max_covered_days: int = 0) -> List[DateRange]:
+    """
+    Merge gaps separated by at most `max_covered_days` of covered dates into one
+    request; re-reading a short covered stretch is cheaper than an extra API call.
+    """
+    merged = []
+    for start, end in sorted(gaps):
+        if merged and (start - merged[-1][1]).days - 1 <= max_covered_days:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class CoverageIndex:
+    """
+    Fetched date ranges per (symbol, asset_type, timeframe), stored in the
+    ticker_coverage table so that only missing ranges are requested from the API.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def load(self, symbol: str, asset_type: str, timeframe: str) -> IntervalSet:
+        try:
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT start_date, end_date FROM ticker_coverage
+                    WHERE symbol = %s AND asset_type = %s AND timeframe = %s
+                """, (symbol, asset_type, timeframe))
+                ranges = cursor.fetchall()
+                if not ranges:
+                    ranges = self._seed_from_ticker_data(cursor, symbol, asset_type, timeframe)
+                return IntervalSet(ranges)
+        except psycopg2.Error as e:
+            logging.error(f"Error loading coverage for {symbol}: {e}")
+            return IntervalSet()
+
+    def _seed_from_ticker_data(self, cursor, symbol, asset_type, timeframe):
+        # Rows stored before coverage tracking: each run of stored dates without a
+        # break longer than SEED_MAX_GAP_DAYS counts as fetched, so real holes stay missing
+        cursor.execute("""
+            SELECT MIN(day), MAX(day) FROM (
+                SELECT day, SUM(CASE WHEN day - previous_day > %s THEN 1 ELSE 0 END) OVER (ORDER BY day) AS island
+                FROM (
+                    SELECT day, LAG(day) OVER (ORDER BY day) AS previous_day
+                    FROM (
+                        SELECT DISTINCT timestamp::date AS day FROM ticker_data
+                        WHERE symbol = %s AND asset_type = %s AND timeframe = %s
+                    ) stored
+                ) days
+            ) islands
+            GROUP BY island ORDER BY 1
+        """, (SEED_MAX_GAP_DAYS, symbol, asset_type, timeframe))
+        coverage = IntervalSet(cursor.fetchall())
+        if not coverage.ranges:
+            return []
+        self._write(cursor, symbol, asset_type, timeframe, coverage)
+        logging.info(f"Seeded coverage for {symbol} from stored rows: {len(coverage.ranges)} ranges "
+                     f"from {coverage.ranges[0][0]} to {coverage.ranges[-1][1]}")
+        return coverage.ranges
+
+    def record(self, symbol: str, asset_type: str, timeframe: str, start: datetime.date, end: datetime.date):
+        """
+        Mark [start, end] as fetched, merging it with the stored ranges.
+        """
+        if start > end:
+            return
+        try:
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                # Serialize read-modify-write of the same key across processes
+                cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))",
+                               (f'ticker_coverage:{symbol}:{asset_type}:{timeframe}',))
+                cursor.execute("""
+                    SELECT start_date, end_date FROM ticker_coverage
+                    WHERE symbol = %s AND asset_type = %s AND timeframe = %s
+                """, (symbol, asset_type, timeframe))
+                coverage = IntervalSet(cursor.fetchall())
+                coverage.add(start, end)
+                self._write(cursor, symbol, asset_type, timeframe, coverage)
+        except psycopg2.Error as e:
+            logging.error(f"Error recording coverage for {symbol}: {e}")
+
+    def _write(self, cursor, symbol, asset_type, timeframe, coverage: IntervalSet):
+        cursor.execute("""
+            DELETE FROM ticker_coverage WHERE symbol = %s AND asset_type = %s AND timeframe = %s
+        """, (symbol, asset_type, timeframe))
+        cursor.executemany("""
+            INSERT INTO ticker_coverage (symbol, asset_type, timeframe, start_date, end_date)
+            VALUES (%s, %s, %s, %s, %s)
+        """, [(symbol, asset_type, timeframe, start, end) for start, end in coverage.ranges])
@@ -1,153 +1,371 @@
-from alpaca.data.historical import StockHistoricalDataClient, CryptoHistoricalDataClient
-from alpaca.data.requests import StockBarsRequest, CryptoBarsRequest
-from alpaca.data.timeframe import TimeFrame
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import datetime
 import logging
+import numpy as np
 import pandas as pd
 import psycopg2
-from psycopg2 import sql
 import traceback
-import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+from data_handling.bar_cache import BarCache
+from data_handling.connection_pool import get_pool
+from data_handling.coverage import CoverageIndex, IntervalSet, merge_gaps
+from data_handling.data_storage import DAILY_TIMEFRAME, DataStorage
+from utils.logger import summarize_frame
+
+# Column dtypes of the bar frames returned by fetch_ticker_data
+TICKER_DTYPES = {
+    'timestamp': 'datetime64[ns]',
+    'open': 'float64',
+    'high': 'float64',
+    'low': 'float64',
+    'close': 'float64',
+    'volume': 'float64',
+    'trade_count': 'int64',
+    'vwap': 'float64',
+}
+TICKER_SOURCES = ['db', 'api', 'cache']
+
+
+def empty_ticker_frame() -> pd.DataFrame:
+    return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in TICKER_DTYPES.items()})
+
+
+def bar_dates(bars: pd.DataFrame) -> pd.Series:
+    """
+    Bar timestamps as tz-naive UTC dates, matching the DATE column of ticker_data.
+    """
+    timestamps = pd.to_datetime(bars['timestamp'])
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_convert(None)
+    return timestamps.dt.normalize()
+
+
+def completed_bars(bars: pd.DataFrame, last_complete_day) -> pd.DataFrame:
+    """
+    The bars dated up to last_complete_day. Later bars are still forming and are
+    never stored, so every refetch returns their latest values from the API.
+    """
+    return bars[(bar_dates(bars) <= pd.Timestamp(last_complete_day)).to_numpy()]
+
+
+def to_ticker_frame(bars: pd.DataFrame, symbol: str, asset_type: str, source: str) -> pd.DataFrame:
+    """
+    Normalize DB rows or Alpaca bars to the TICKER_DTYPES layout plus symbol,
+    asset_type and a categorical source column. Timestamps become tz-naive UTC
+    dates, matching the DATE column of ticker_data. Missing trade counts become
+    0, as encode_copy_binary stores them.
+    """
+    frame = bars[list(TICKER_DTYPES)].assign(
+        timestamp=bar_dates(bars),
+        trade_count=pd.to_numeric(bars['trade_count']).fillna(0),
+    ).astype(TICKER_DTYPES)
+    frame.insert(0, 'asset_type', asset_type)
+    frame.insert(0, 'symbol', symbol)
+    frame['source'] = pd.Categorical.from_codes(
+        np.full(len(frame), TICKER_SOURCES.index(source)), categories=TICKER_SOURCES)
+    return frame.reset_index(drop=True)
 
 
 class DataFetcher:
     def __init__(self, config):
         self.config = config
-        self.client = StockHistoricalDataClient(
-            api_key=config['alpaca_api_key'],
-            secret_key=config['alpaca_api_secret']
-        )
-        self.crypto_client = CryptoHistoricalDataClient(
-            api_key=config['alpaca_api_key'],
-            secret_key=config['alpaca_api_secret']
-        )
-        self.database_url = config['database_url']
-        self.create_connection()
-        self.base_url = "https://api.polygon.io"
-        self.api_key = config['polygon_api_key']
-
-    def create_connection(self):
-        """ Create a database connection to the PostgreSQL database """
-        try:
-            self.connection = psycopg2.connect(self.database_url)
-            logging.info('Connected to the PostgreSQL database')
-        except psycopg2.Error as e:
-            logging.error(f'Error connecting to the PostgreSQL database: {e}')
-            self.connection = None
-
-    def get_latest_timestamp(self, symbol, asset_type):
-        """ Get the latest timestamp for the given symbol and asset type from the database """
-        if self.connection:
-            try:
-                with self.connection.cursor() as cursor:
-                    cursor.execute("""
-                        SELECT MAX(timestamp) FROM ticker_data WHERE symbol = %s AND asset_type = %s
-                    """, (symbol, asset_type))
-                    result = cursor.fetchone()
-                    logging.info(f"Latest timestamp for {symbol}: {result[0]}")
-                    return result[0] if result[0] else None
-            except psycopg2.Error as e:
-                tb = traceback.extract_tb(e.__traceback__)
-                filename, line, func, text = tb[-1]
-                logging.error(f"Error fetching latest timestamp in {filename} at line {line}: {e}")
-                return None
-        return None
-
-    def fetch_ticker_data(self, symbol, asset_type, start_date, end_date):
+        # Alpaca and Polygon clients are built on first use; runs served from the
+        # database or the bar cache never import alpaca-py or requests
+        self._client = None
+        self._crypto_client = None
+        self._polygon = None
+        self.pool = get_pool(config)
+        self.storage = DataStorage(config)
+        self.coverage = CoverageIndex(self.pool)
+        self.coverage_merge_days = int(config.get('coverage_merge_days', 5))
+        self.timeframe = DAILY_TIMEFRAME
+        self.alpaca_batch_size = int(config.get('alpaca_batch_size', 100))
+        self.alpaca_fetch_workers = int(config.get('alpaca_fetch_workers', 4))
+        self.bar_cache = BarCache(config['bar_cache_dir'], self.timeframe) if config.get('bar_cache_dir') else None
+        self.bar_cache_verify = bool(config.get('bar_cache_verify', True))
+        self._verified_cache_keys = set()
+
+    @property
+    def client(self):
+        if self._client is None:
+            from alpaca.data.historical import StockHistoricalDataClient
+            self._client = StockHistoricalDataClient(
+                api_key=self.config['alpaca_api_key'],
+                secret_key=self.config['alpaca_api_secret']
+            )
+        return self._client
+
+    @property
+    def crypto_client(self):
+        if self._crypto_client is None:
+            from alpaca.data.historical import CryptoHistoricalDataClient
+            self._crypto_client = CryptoHistoricalDataClient(
+                api_key=self.config['alpaca_api_key'],
+                secret_key=self.config['alpaca_api_secret']
+            )
+        return self._crypto_client
+
+    @property
+    def polygon(self):
+        if self._polygon is None:
+            from data_handling.polygon_client import PolygonClient
+            self._polygon = PolygonClient(self.config)
+        return self._polygon
+
+    def fetch_ticker_data(self, symbol, asset_type, start_date, end_date) -> pd.DataFrame:
+        """
+        Fetch data for the given symbol and asset type using the local bar cache,
+        Alpaca API or database.
+
+        Ranges held by the bar cache are memory-mapped from disk; the rest goes
+        through fetch_uncached_ticker_data and is written back to the cache.
+        Returns the same frame layout as fetch_uncached_ticker_data, with cached
+        rows marked as 'cache' in the source column.
+        """
+        if self.bar_cache is None:
+            return self.fetch_uncached_ticker_data(symbol, asset_type, start_date, end_date)
+        if self.bar_cache_verify and (symbol, asset_type) not in self._verified_cache_keys:
+            # Checked once per process, before the first cached read of the key
+            self.bar_cache.verify(self.pool, symbol, asset_type)
+            self._verified_cache_keys.add((symbol, asset_type))
+
+        coverage = self.bar_cache.coverage(symbol, asset_type)
+        last_complete_day = datetime.date.today() - datetime.timedelta(days=1)
+        frames = []
+        for range_start, range_end in coverage.intersection(start_date, end_date):
+            cached = self.bar_cache.read(symbol, asset_type, range_start, range_end)
+            if cached is None:
+                # Invalidated or rewritten concurrently; read the range through the database instead
+                coverage = IntervalSet()
+                frames = []
+                break
+            frames.append(to_ticker_frame(cached, symbol, asset_type, 'cache'))
+            logging.info(f"Read {len(cached)} records for {symbol} from the bar cache")
+
+        for range_start, range_end in coverage.missing(start_date, end_date):
+            fetched, complete = self._fetch_uncached(symbol, asset_type, range_start, range_end)
+            frames.append(fetched)
+            # Today's bar is still forming, so only complete days are cached; a partial
+            # result after a database error is returned but never cached
+            cache_end = min(range_end, last_complete_day)
+            if complete and range_start <= cache_end:
+                completed = fetched[fetched['timestamp'] <= pd.Timestamp(cache_end)]
+                self.bar_cache.write(symbol, asset_type, completed, [(range_start, cache_end)])
+
+        if not frames:
+            return to_ticker_frame(empty_ticker_frame(), symbol, asset_type, 'db')
+        combined_data = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        return combined_data.sort_values('timestamp', kind='stable', ignore_index=True)
+
+    def fetch_uncached_ticker_data(self, symbol, asset_type, start_date, end_date) -> pd.DataFrame:
         """
         Fetch data for the given symbol and asset type using Alpaca API or database.
 
+        Only the sub-ranges missing from the coverage index are requested from the
+        API (gaps close together are merged into one request); everything else is
+        served from the database.
+
         Parameters:
         symbol (str): The ticker symbol of the asset.
         asset_type (str): The type of the asset (e.g., 'stock').
         start_date (datetime): The start date of the required data range.
         end_date (datetime): The end date of the required data range.
+
+        Returns:
+        pd.DataFrame: One typed columnar frame (see TICKER_DTYPES) sorted by timestamp,
+        with a categorical 'source' column of 'db' or 'api'.
         """
-        latest_timestamp = self.get_latest_timestamp(symbol, asset_type)
-        db_data = []
-        api_data = []
+        return self._fetch_uncached(symbol, asset_type, start_date, end_date)[0]
 
-        if latest_timestamp and latest_timestamp >= start_date:
-            # Fetch data from the database for the available range
-            db_data = self.fetch_data_from_db(symbol, asset_type, start_date, min(latest_timestamp, end_date))
+    def _fetch_uncached(self, symbol, asset_type, start_date, end_date):
+        """
+        fetch_uncached_ticker_data, also returning whether every bar of the range
+        was fetched and stored (False after a database error).
+        """
+        coverage = self.coverage.load(symbol, asset_type, self.timeframe)
+        fetch_ranges = merge_gaps(coverage.missing(start_date, end_date), self.coverage_merge_days)
+        # Today's bar is still forming, so it is neither stored nor marked as covered
+        last_complete_day = datetime.date.today() - datetime.timedelta(days=1)
+
+        frames = []
+        fetched = IntervalSet()
+        complete = True
+        for request_start, request_end in fetch_ranges:
+            api_data = self.fetch_data_from_api(symbol, asset_type, request_start, request_end)
+            logging.info(f"Fetched {len(api_data)} records from the API for {request_start} to {request_end}")
+            stored = True
+            if not api_data.empty:
+                stored = self.store_data_in_db(completed_bars(api_data, last_complete_day), symbol, asset_type)
+                frames.append(to_ticker_frame(api_data, symbol, asset_type, 'api'))
+            # A range whose bars did not reach the database stays missing and is fetched again next time
+            if stored:
+                self.coverage.record(symbol, asset_type, self.timeframe, request_start,
+                                     min(request_end, last_complete_day))
+            complete = complete and stored
+            fetched.add(request_start, request_end)
+
+        db_ranges = fetched.missing(start_date, end_date)
+        if db_ranges:
+            db_data = self.fetch_data_from_db(symbol, asset_type, db_ranges)
+            if db_data is None:
+                complete = False
+                db_data = empty_ticker_frame()
             logging.info(f"Fetched {len(db_data)} records from the database")
-            logging.info(db_data)
-            # If the latest timestamp in the database is less than the end date, fetch the remaining data from the API
-            if latest_timestamp < end_date:
-                api_data = self.fetch_data_from_api(
-                    symbol, asset_type, latest_timestamp + datetime.timedelta(days=1), end_date)
-                logging.info(f"Fetched {len(api_data)} records from the API")
-        else:
-            # Fetch all data from the API if no data is available in the database
-            api_data = self.fetch_data_from_api(symbol, asset_type, start_date, end_date)
-            logging.info(f"Fetched {len(api_data)} records from the API")
-        if not api_data.empty:
-            self.store_data_in_db(api_data, symbol, asset_type)
+            logging.debug('Database rows for %s: %s', symbol, summarize_frame(db_data))
+            frames.append(to_ticker_frame(db_data, symbol, asset_type, 'db'))
 
+        if not frames:
+            return to_ticker_frame(empty_ticker_frame(), symbol, asset_type, 'db'), complete
         # Combine data from the database and API
-        combined_data = db_data + api_data.to_dict('records') if not api_data.empty else db_data
-        return combined_data
-
-    def fetch_data_from_db(self, symbol, asset_type, start_date, end_date):
-        """ Fetch data from the database """
-        if self.connection:
-            try:
-                with self.connection.cursor() as cursor:
-                    cursor.execute("""
-                        SELECT * FROM ticker_data WHERE symbol = %s AND asset_type = %s AND timestamp BETWEEN %s AND %s
-                    """, (symbol, asset_type, start_date, end_date))
-                    result = cursor.fetchall()
-                    return result
-            except psycopg2.Error as e:
-                logging.error(f"Error fetching data from database: {e}")
-                return []
-        return []
+        combined_data = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        return combined_data.sort_values('timestamp', kind='stable', ignore_index=True), complete
+
+    def fetch_data_from_db(self, symbol, asset_type, date_ranges) -> pd.DataFrame:
+        """
+        Fetch data from the database as a typed frame, without per-row Python objects beyond the cursor tuples.
+        :param date_ranges: List of inclusive (start_date, end_date) ranges to read
+        :return: The bars, or None if the query failed
+        """
+        range_filter = ' OR '.join(['timestamp BETWEEN %s AND %s'] * len(date_ranges))
+        params = [symbol, asset_type, self.timeframe] + [date for date_range in date_ranges for date in date_range]
+        try:
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute(f"""
+                    SELECT timestamp, open::float8, high::float8, low::float8, close::float8,
+                           volume::float8, trade_count::int8, vwap::float8
+                    FROM ticker_data
+                    WHERE symbol = %s AND asset_type = %s AND timeframe = %s AND ({range_filter})
+                    ORDER BY timestamp ASC
+                """, params)
+                return pd.DataFrame.from_records(cursor.fetchall(), columns=list(TICKER_DTYPES))
+        except psycopg2.Error as e:
+            logging.error(f"Error fetching data from database: {e}")
+            return None
+
+    def request_bars(self, asset_type, symbols, start_date, end_date) -> pd.DataFrame:
+        """
+        Request daily bars for one or many symbols in a single Alpaca call.
+        :return: The raw bars frame, indexed by (symbol, timestamp)
+        """
+        from alpaca.data.requests import StockBarsRequest, CryptoBarsRequest
+        from alpaca.data.timeframe import TimeFrame
 
-    def fetch_data_from_api(self, symbol, asset_type, start_date, end_date):
-        """ Fetch data from the Alpaca API """
         if asset_type == 'stock':
             request_params = StockBarsRequest(
-                symbol_or_symbols=symbol,
+                symbol_or_symbols=symbols,
                 timeframe=TimeFrame.Day,
                 start=start_date,
                 end=end_date
             )
-            bars = self.client.get_stock_bars(request_params).df
-            # bars.reset_index(inplace=True)
+            return self.client.get_stock_bars(request_params).df
         elif asset_type == 'crypto':
             request_params = CryptoBarsRequest(
-                symbol_or_symbols=symbol,
+                symbol_or_symbols=symbols,
                 timeframe=TimeFrame.Day,
                 start=start_date,
                 end=end_date
             )
-            bars = self.crypto_client.get_crypto_bars(request_params).df
+            return self.crypto_client.get_crypto_bars(request_params).df
         else:
             raise ValueError("Unsupported asset type")
 
+    def fetch_data_from_api(self, symbol, asset_type, start_date, end_date):
+        """ Fetch data from the Alpaca API """
+        bars = self.request_bars(asset_type, symbol, start_date, end_date)
+        if bars.empty:
+            return empty_ticker_frame()
         bars.reset_index(inplace=True)
         return bars
 
-    def store_data_in_db(self, data, symbol, asset_type):
-        """ Store fetched data in the database """
-        if self.connection:
-            try:
-                with self.connection.cursor() as cursor:
-                    insert_query = sql.SQL("""
-                        INSERT INTO ticker_data (symbol, asset_type, timestamp, open, high, low, close, volume, trade_count, vwap)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (symbol, asset_type, timestamp) DO NOTHING
-                    """)
-                    cursor.executemany(insert_query, [
-                        (symbol, asset_type, row['timestamp'].strftime('%Y-%m-%d'), row['open'], row['high'],
-                         row['low'], row['close'], row['volume'], row['trade_count'], row['vwap'])
-                        for index, row in data.iterrows()
-                    ])
-                    self.connection.commit()
-                    logging.info("Ticker data stored in the database.")
-            except psycopg2.Error as e:
-                logging.error(f"Error storing ticker data: {e}")
+    def fetch_bars_bulk(self, symbols_by_asset_type: Dict[str, List[str]], start_date, end_date,
+                        batch_size: int = None) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch bars for many symbols with batched multi-symbol requests. Batches of
+        every asset type run concurrently on a thread pool.
+
+        :param symbols_by_asset_type: e.g. {'stock': ['AAPL', 'MSFT'], 'crypto': ['BTC/USD']}
+        :param batch_size: Symbols per request; defaults to config['alpaca_batch_size']
+        :return: Dictionary of symbol -> bars frame (empty frame when no bars were returned
+                 or the symbol's batch failed)
+        """
+        return self._fetch_bars_batches(symbols_by_asset_type, start_date, end_date, batch_size)[0]
+
+    def _fetch_bars_batches(self, symbols_by_asset_type, start_date, end_date, batch_size=None):
+        """
+        fetch_bars_bulk, also returning the set of symbols whose batch request failed.
+        """
+        batch_size = batch_size or self.alpaca_batch_size
+        batches = [
+            (asset_type, symbols[i:i + batch_size])
+            for asset_type, symbols in symbols_by_asset_type.items()
+            for i in range(0, len(symbols), batch_size)
+        ]
+        results = {symbol: empty_ticker_frame() for symbols in symbols_by_asset_type.values() for symbol in symbols}
+        failed = set()
+        if not batches:
+            return results, failed
+
+        with ThreadPoolExecutor(max_workers=min(self.alpaca_fetch_workers, len(batches))) as executor:
+            futures = {
+                executor.submit(self.request_bars, asset_type, batch, start_date, end_date): batch
+                for asset_type, batch in batches
+            }
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    bars = future.result()
+                except Exception as e:
+                    # One failed batch must not discard the ones that succeeded
+                    logging.error(f"Error fetching bars for {len(batch)} symbols ({batch[0]}..{batch[-1]}): {e}")
+                    failed.update(batch)
+                    continue
+                if bars.empty:
+                    continue
+                # Split the (symbol, timestamp) multi-index result back into per-symbol frames
+                for symbol, symbol_bars in bars.groupby(level='symbol', sort=False):
+                    results[symbol] = symbol_bars.reset_index()
+        logging.info(f"Fetched bars for {len(results)} symbols in {len(batches)} batched requests"
+                     f"{f', {len(failed)} symbols failed' if failed else ''}")
+        return results, failed
+
+    def backfill_ticker_data(self, symbols, asset_type, start_date, end_date):
+        """
+        Fill the coverage gaps of many symbols with a few batched requests, so the
+        per-symbol fetch_ticker_data calls that follow are served from the database.
+        Each batch requests the envelope of its symbols' gaps.
+        """
+        gaps = {}
+        for symbol in symbols:
+            missing = self.coverage.load(symbol, asset_type, self.timeframe).missing(start_date, end_date)
+            if missing:
+                gaps[symbol] = (missing[0][0], missing[-1][1])
+        if not gaps:
+            return
+
+        # Group symbols by gap envelope so that each batch shares one date range
+        by_range = {}
+        for symbol, date_range in gaps.items():
+            by_range.setdefault(date_range, []).append(symbol)
+        last_complete_day = datetime.date.today() - datetime.timedelta(days=1)
+        for (range_start, range_end), range_symbols in by_range.items():
+            bars_by_symbol, failed = self._fetch_bars_batches({asset_type: range_symbols}, range_start, range_end)
+            for symbol, bars in bars_by_symbol.items():
+                # Failed requests and stores stay missing; fetch_ticker_data retries them per symbol
+                if symbol in failed:
+                    continue
+                bars = completed_bars(bars, last_complete_day)
+                if bars.empty or self.store_data_in_db(bars, symbol, asset_type):
+                    self.coverage.record(symbol, asset_type, self.timeframe, range_start,
+                                         min(range_end, last_complete_day))
+        logging.info(f"Backfilled {len(gaps)} symbols over {len(by_range)} date ranges")
+
+    def store_data_in_db(self, data, symbol, asset_type) -> bool:
+        """
+        Store fetched data in the database through the COPY-based bulk loader.
+        :return: False if the bars could not be stored
+        """
+        return self.storage.bulk_store_bars(data, symbol, asset_type, timeframe=self.timeframe) is not None
 
     def fetch_sentiment_data(self, symbol):
         """
@@ -156,53 +374,100 @@ class DataFetcher:
         # Placeholder for actual data fetching logic
         return [{'news': 'Positive news article', 'timestamp': '2021-01-01'}, {'news': 'Negative news article', 'timestamp': '2021-01-02'}]
 
-    def fetch_technical_analysis_data(self, symbol: str, indicator: str, window: str) -> Dict[str, Any]:
-
-        url = f"{self.base_url}/v1/indicators/{indicator}/{symbol}"
-        params = {
-            "timespan": "day",
-            "adjusted": "true",
-            "window": window,
-            "series_type": "close",
-            "order": "desc",
-            "limit": "10",
-            "apiKey": self.api_key
-        }
+    def fetch_technical_analysis_data(self, symbol: str, indicator: str, window: str,
+                                      start_date=None, end_date=None) -> Optional[Dict[str, Any]]:
+        """
+        Fetch every page of a Polygon indicator series, e.g. ('AAPL', 'sma', '10').
+        :return: Polygon payload (results.values holds all pages), or None if the request failed
+        """
+        import requests
+
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            logging.info(f"Technical indicator data for {symbol} ({indicator}): {data}")
+            data = self.polygon.get_indicator(symbol, indicator, int(window), start_date=start_date, end_date=end_date)
+            logging.info(f"Technical indicator data for {symbol} ({indicator}): "
+                         f"{len(data['results']['values'])} values")
             return data
         except requests.exceptions.RequestException as e:
             logging.error(f"Error fetching technical analysis data: {e}")
             return None
 
-    def fetch_close_prices(self, symbol: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+    def read_cached_close_prices(self, symbol: str, asset_type: Optional[str], start_date,
+                                 end_date) -> Optional[pd.DataFrame]:
+        """
+        Close prices from the bar cache, or None if the range is not fully cached.
+        """
+        if self.bar_cache is None or asset_type is None:
+            return None
+        arrays = self.bar_cache.read_arrays(symbol, asset_type, pd.Timestamp(start_date).date(),
+                                            pd.Timestamp(end_date).date(), columns=['timestamp', 'close'])
+        if arrays is None:
+            return None
+        return pd.DataFrame(arrays)
+
+    def fetch_close_prices(self, symbol: str, start_date: str, end_date: str,
+                           asset_type: Optional[str] = None) -> Optional[pd.DataFrame]:
         """
         Fetch the close prices for a given symbol between start_date and end_date.
 
         :param symbol: The ticker symbol (e.g., 'AAPL')
         :param start_date: The start date in 'YYYY-MM-DD' format
         :param end_date: The end date in 'YYYY-MM-DD' format
+        :param asset_type: When given, the bar cache is tried before the database
         :return: A pandas DataFrame with 'timestamp' and 'close' columns or None if an error occurs
         """
-        if not self.connection:
-            logging.error("Database connection is not established.")
-            return None
-
+        cached = self.read_cached_close_prices(symbol, asset_type, start_date, end_date)
+        if cached is not None:
+            logging.info(f"Read {len(cached)} close price records for {symbol} from the bar cache.")
+            return cached
         try:
             query = """
-                SELECT timestamp, close 
-                FROM ticker_data 
-                WHERE symbol = %s 
-                AND timestamp BETWEEN %s AND %s 
+                SELECT timestamp, close
+                FROM ticker_data
+                WHERE symbol = %s
+                AND timestamp BETWEEN %s AND %s
+                AND timeframe = %s
                 ORDER BY timestamp ASC
             """
-            df = pd.read_sql_query(query, self.connection, params=(symbol, start_date, end_date))
+            with self.pool.connection() as connection:
+                df = pd.read_sql_query(query, connection, params=(symbol, start_date, end_date, self.timeframe))
             logging.info(f"Fetched {len(df)} close price records for {symbol} from {start_date} to {end_date}.")
             return df
         except Exception as e:
             logging.error(f"Error fetching close prices: {e}")
             logging.debug(traceback.format_exc())
             return None
+
+    def fetch_close_prices_panel(self, symbols: List[str], start_date: str, end_date: str,
+                                 asset_type: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        Fetch close prices for many symbols in a single query.
+
+        :param symbols: List of ticker symbols
+        :param start_date: The start date in 'YYYY-MM-DD' format
+        :param end_date: The end date in 'YYYY-MM-DD' format
+        :param asset_type: When given, the panel is read from the bar cache if every symbol is cached
+        :return: A long-format pandas DataFrame with 'symbol', 'timestamp' and 'close' columns or None if an error occurs
+        """
+        cached = [self.read_cached_close_prices(symbol, asset_type, start_date, end_date) for symbol in symbols]
+        if symbols and all(frame is not None for frame in cached):
+            df = pd.concat([frame.assign(symbol=symbol) for symbol, frame in zip(symbols, cached)], ignore_index=True)
+            logging.info(f"Read {len(df)} close price records for {len(symbols)} symbols from the bar cache.")
+            return df[['symbol', 'timestamp', 'close']].sort_values(['symbol', 'timestamp'], kind='stable',
+                                                                     ignore_index=True)
+        try:
+            query = """
+                SELECT symbol, timestamp, close::float8 AS close
+                FROM ticker_data
+                WHERE symbol = ANY(%s)
+                AND timestamp BETWEEN %s AND %s
+                AND timeframe = %s
+                ORDER BY symbol, timestamp ASC
+            """
+            with self.pool.connection() as connection:
+                df = pd.read_sql_query(query, connection, params=(list(symbols), start_date, end_date, self.timeframe))
+            logging.info(f"Fetched {len(df)} close price records for {len(symbols)} symbols from {start_date} to {end_date}.")
+            return df
+        except Exception as e:
+            logging.error(f"Error fetching close prices: {e}")
+            logging.debug(traceback.format_exc())
+            return None
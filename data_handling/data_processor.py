@@ -1,95 +1,49 @@
 import logging
 import psycopg2
-from psycopg2 import sql, Error
+from psycopg2 import Error
 from typing import Dict, Any
 import pandas as pd
 
+from data_handling.connection_pool import get_pool
+from data_handling.data_storage import DataStorage
+from data_handling.migrations import maintain_partitions, migrate
+from utils.logger import summarize_frame
+
 
 class DataProcessor:
     def __init__(self, config):
         self.config = config
-        self.database_url = config['database_url']
-        self.create_connection()
-
-    def create_connection(self):
-        """
-        Create a database connection to the PostgreSQL database
-        """
-        try:
-            self.connection = psycopg2.connect(self.database_url)
-            logging.info('Connected to the PostgreSQL database')
-        except Error as e:
-            logging.error(f'Error connecting to the PostgreSQL database: {e}')
-            self.connection = None
+        self.pool = get_pool(config)
+        self.storage = DataStorage(config)
 
     def create_table(self):
         """
-        Create a table in the PostgreSQL database
+        Create or upgrade the tables in the PostgreSQL database by applying pending schema migrations
         """
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(
-                    sql.SQL("""
-                    CREATE TABLE IF NOT EXISTS ticker_data (
-                        id SERIAL PRIMARY KEY,
-                        symbol VARCHAR(10) NOT NULL,
-                        asset_type VARCHAR(10) NOT NULL,
-                        timestamp DATE NOT NULL,
-                        open DECIMAL NOT NULL,
-                        high DECIMAL NOT NULL,
-                        low DECIMAL NOT NULL,
-                        close DECIMAL NOT NULL,
-                        volume DECIMAL NOT NULL,
-                        trade_count INTEGER NOT NULL,
-                        vwap DECIMAL NOT NULL,
-                        UNIQUE (symbol, asset_type, timestamp)
-                    )
-                    """)
-                )
-                self.connection.commit()
-                logging.info('Table is exist or created successfully')
+            applied = migrate(self.pool)
+            logging.info(f'Tables are up to date (applied migrations: {applied or "none"})')
+            # Partitions ahead of today, so new bars never pile up in ticker_data_default
+            maintain_partitions(self.pool)
         except Error as e:
             logging.error(f'Error creating table: {e}')
 
     def process_ticker_data(self, bars, symbol, asset_type):
         """
         Process ticker data to prepare it for analysis and store it in the database.
+        Returns a columnar frame that shares its column data with `bars`.
         """
-        data = [{
-            "symbol": symbol,
-            "asset_type": asset_type,
-            "timestamp": row['timestamp'].strftime('%Y-%m-%d'),
-            "open": row['open'],
-            "high": row['high'],
-            "low": row['low'],
-            "close": row['close'],
-            "volume": row['volume'],
-            "trade_count": row['trade_count'],
-            "vwap": row['vwap']
-        } for index, row in bars.iterrows()]
+        data = bars.assign(symbol=symbol, asset_type=asset_type)[
+            ['symbol', 'asset_type', 'timestamp', 'open', 'high', 'low', 'close', 'volume', 'trade_count', 'vwap']]
 
-        logging.info(f'Processed ticker data: {data}')
+        logging.info('Processed ticker data for %s: %s', symbol, summarize_frame(data))
         # self.store_ticker_data(data)
         return data
 
     def store_ticker_data(self, data):
         """ Store processed ticker data into the database """
-        if self.connection:
-            try:
-                with self.connection.cursor() as cursor:
-                    insert_query = sql.SQL("""
-                        INSERT INTO ticker_data (symbol, asset_type, timestamp, open, high, low, close, volume, trade_count, vwap)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """)
-                    cursor.executemany(insert_query, [
-                        (d['symbol'], d['asset_type'], d['timestamp'], d['open'], d['high'],
-                         d['low'], d['close'], d['volume'], d['trade_count'], d['vwap'])
-                        for d in data
-                    ])
-                    self.connection.commit()
-                    logging.info("Ticker data stored in the database.")
-            except Error as e:
-                logging.error(f"Error storing ticker data: {e}")
+        for (symbol, asset_type), bars in data.groupby(['symbol', 'asset_type']):
+            self.storage.bulk_store_bars(bars, symbol, asset_type)
 
     def process_sentiment_data(self, sentiment_data):
         """
@@ -99,13 +53,11 @@ class DataProcessor:
         return sentiment_data
 
     def process_sma_data(self, sma_data: Dict[str, Any], window: int) -> pd.DataFrame:
+        # polygon_client pulls in requests, which the database-only paths do not need
+        from data_handling.polygon_client import indicator_values_to_frame
+
         if sma_data and "results" in sma_data and "values" in sma_data["results"]:
-            results = sma_data["results"]["values"]
-            df = pd.DataFrame(results)
-            df = df.rename(columns={'value': f'SMA{window}'})
-            # Convert timestamp from milliseconds to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            return df[['timestamp', f'SMA{window}']]
+            return indicator_values_to_frame(sma_data["results"]["values"], f'SMA{window}')
         else:
             raise ValueError("Invalid SMA data format or no data found.")
 
@@ -1,8 +1,24 @@
+import io
 import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from psycopg2 import Error
+
+from data_handling.connection_pool import get_pool
+
+# Bar columns of ticker_data written by the bulk loader, in COPY order
+BAR_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'trade_count', 'vwap']
+# ticker_data.timeframe of daily bars (Alpaca's TimeFrame.Day value)
+DAILY_TIMEFRAME = '1Day'
+
 
 class DataStorage:
     def __init__(self, config=None):
         self.config = config
+        self.pool = get_pool(config) if config else None
+        self.batch_size = int((config or {}).get('bulk_ingest_batch_size', 50000))
 
     def get_position(self, symbol, asset_type):
         """
@@ -17,4 +33,101 @@ class DataStorage:
         Save the trade information to the database.
         """
         # Placeholder for actual database interaction logic
-        pass
\ No newline at end of file
+        pass
+
+    def bulk_store_bars(self, data: pd.DataFrame, symbol: str, asset_type: str, batch_size: int = None,
+                        timeframe: str = DAILY_TIMEFRAME) -> Optional[int]:
+        """
+        Bulk load bars into ticker_data: stream them with binary COPY into a
+        temporary staging table in chunks of `batch_size` rows, then merge with a
+        single INSERT ... SELECT ... ON CONFLICT DO NOTHING.
+
+        :param data: DataFrame with the BAR_COLUMNS columns
+        :param symbol: The ticker symbol of the bars
+        :param asset_type: The type of the asset (e.g., 'stock')
+        :param batch_size: Rows per COPY chunk; defaults to config['bulk_ingest_batch_size']
+        :param timeframe: Bar timeframe stored in ticker_data.timeframe
+        :return: Number of new rows inserted (0 when every bar was already stored), or None if the store failed
+        """
+        if data.empty:
+            return 0
+        batch_size = batch_size or self.batch_size
+        columns = ', '.join(['symbol', 'asset_type'] + BAR_COLUMNS)
+
+        try:
+            with self.pool.connection() as connection, connection.cursor() as cursor:
+                cursor.execute("""
+                    CREATE TEMP TABLE ticker_data_staging (
+                        symbol TEXT, asset_type TEXT, timestamp TIMESTAMP,
+                        open FLOAT8, high FLOAT8, low FLOAT8, close FLOAT8,
+                        volume FLOAT8, trade_count BIGINT, vwap FLOAT8
+                    ) ON COMMIT DROP
+                """)
+                for start in range(0, len(data), batch_size):
+                    payload = encode_copy_binary(data.iloc[start:start + batch_size], symbol, asset_type, timeframe)
+                    cursor.copy_expert(
+                        f"COPY ticker_data_staging ({columns}) FROM STDIN WITH (FORMAT binary)", io.BytesIO(payload))
+                cursor.execute(f"""
+                    INSERT INTO ticker_data (timeframe, {columns})
+                    SELECT %s, {columns} FROM ticker_data_staging
+                    ON CONFLICT (symbol, asset_type, timeframe, timestamp) DO NOTHING
+                """, (timeframe,))
+                inserted = cursor.rowcount
+                connection.commit()
+            logging.info(f"Bulk stored {inserted} of {len(data)} bars for {symbol}.")
+            return inserted
+        except (ValueError, TypeError) as e:
+            # Bars that cannot be encoded for COPY (e.g. unparseable timestamps)
+            logging.error(f"Error encoding ticker data for {symbol}: {e}")
+            return None
+        except Error as e:
+            logging.error(f"Error bulk storing ticker data: {e}")
+            return None
+
+
+# PostgreSQL binary COPY framing and the TIMESTAMP epoch (2000-01-01, in microseconds since 1970-01-01)
+COPY_BINARY_HEADER = b'PGCOPY\n\xff\r\n\x00' + np.zeros(2, dtype='>i4').tobytes()
+COPY_BINARY_TRAILER = np.array([-1], dtype='>i2').tobytes()
+POSTGRES_EPOCH_DAYS = 10957
+POSTGRES_EPOCH_MICROSECONDS = POSTGRES_EPOCH_DAYS * 86_400_000_000
+
+
+def encode_copy_binary(data: pd.DataFrame, symbol: str, asset_type: str, timeframe: str = DAILY_TIMEFRAME) -> bytes:
+    """
+    Encode bars as a PostgreSQL binary COPY payload for the staging table.
+
+    Symbol and asset type are constant within a call, so every tuple has the
+    same size and the whole payload is one NumPy structured array. Timestamps
+    are encoded as TIMESTAMP (int8 microseconds); daily bars are truncated to
+    midnight UTC so they keep matching the dates already stored.
+    """
+    symbol_bytes = symbol.encode()
+    asset_type_bytes = asset_type.encode()
+    float_fields = ['open', 'high', 'low', 'close', 'volume']
+    dtype = np.dtype(
+        [('fields', '>i2'),
+         ('symbol_len', '>i4'), ('symbol', f'S{len(symbol_bytes)}'),
+         ('asset_type_len', '>i4'), ('asset_type', f'S{len(asset_type_bytes)}'),
+         ('timestamp_len', '>i4'), ('timestamp', '>i8')]
+        + [item for name in float_fields for item in ((f'{name}_len', '>i4'), (name, '>f8'))]
+        + [('trade_count_len', '>i4'), ('trade_count', '>i8'), ('vwap_len', '>i4'), ('vwap', '>f8')])
+
+    rows = np.empty(len(data), dtype=dtype)
+    rows['fields'] = 10
+    rows['symbol_len'], rows['symbol'] = len(symbol_bytes), symbol_bytes
+    rows['asset_type_len'], rows['asset_type'] = len(asset_type_bytes), asset_type_bytes
+
+    timestamps = pd.to_datetime(data['timestamp'])
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_convert(None)
+    if timeframe == DAILY_TIMEFRAME:
+        timestamps = timestamps.dt.normalize()
+    rows['timestamp_len'] = 8
+    rows['timestamp'] = timestamps.to_numpy().astype('datetime64[us]').astype(np.int64) - POSTGRES_EPOCH_MICROSECONDS
+    for name in float_fields + ['vwap']:
+        rows[f'{name}_len'] = 8
+        rows[name] = data[name].to_numpy(dtype=float)
+    rows['trade_count_len'] = 8
+    # Missing trade counts are stored as 0, like the int64 trade_count of ticker frames
+    rows['trade_count'] = pd.to_numeric(data['trade_count']).fillna(0).to_numpy(dtype=np.int64)
+    return COPY_BINARY_HEADER + rows.tobytes() + COPY_BINARY_TRAILER
@@ -0,0 +1,316 @@
+"""
+Versioned schema migrations for the trading database.
+
+Applied versions are recorded in schema_migrations. Runs are serialized across
+processes with an advisory lock, and every migration commits on its own.
+
+Usage:
+    python -m data_handling.migrations                    # apply pending migrations
+    python -m data_handling.migrations --status
+    python -m data_handling.migrations --partition month  # convert ticker_data to monthly partitions
+"""
+import argparse
+import datetime
+import logging
+from typing import Callable, List, NamedTuple
+
+import psycopg2
+
+# Arbitrary constant key for pg_advisory_xact_lock, shared by every migration run
+MIGRATION_LOCK_KEY = 728145011
+TICKER_DATA_COLUMNS = ['id', 'symbol', 'asset_type', 'timeframe', 'timestamp', 'open', 'high', 'low', 'close',
+                       'volume', 'trade_count', 'vwap']
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable
+
+
+def create_base_tables(cursor):
+    # The original schema; a no-op on databases created before migrations existed
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ticker_data (
+            id SERIAL PRIMARY KEY,
+            symbol VARCHAR(10) NOT NULL,
+            asset_type VARCHAR(10) NOT NULL,
+            timestamp DATE NOT NULL,
+            open DECIMAL NOT NULL,
+            high DECIMAL NOT NULL,
+            low DECIMAL NOT NULL,
+            close DECIMAL NOT NULL,
+            volume DECIMAL NOT NULL,
+            trade_count INTEGER NOT NULL,
+            vwap DECIMAL NOT NULL,
+            UNIQUE (symbol, asset_type, timestamp)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS ticker_coverage (
+            symbol VARCHAR(10) NOT NULL,
+            asset_type VARCHAR(10) NOT NULL,
+            timeframe VARCHAR(10) NOT NULL,
+            start_date DATE NOT NULL,
+            end_date DATE NOT NULL,
+            PRIMARY KEY (symbol, asset_type, timeframe, start_date)
+        )
+    """)
+
+
+def use_native_numeric_types(cursor):
+    cursor.execute("""
+        ALTER TABLE ticker_data
+            ALTER COLUMN open TYPE DOUBLE PRECISION,
+            ALTER COLUMN high TYPE DOUBLE PRECISION,
+            ALTER COLUMN low TYPE DOUBLE PRECISION,
+            ALTER COLUMN close TYPE DOUBLE PRECISION,
+            ALTER COLUMN volume TYPE DOUBLE PRECISION,
+            ALTER COLUMN trade_count TYPE BIGINT,
+            ALTER COLUMN vwap TYPE DOUBLE PRECISION
+    """)
+
+
+def add_timeframe(cursor):
+    # Intraday bars need a time of day and must not collide with the daily bar of the same date
+    cursor.execute("""
+        ALTER TABLE ticker_data
+            ADD COLUMN timeframe VARCHAR(10) NOT NULL DEFAULT '1Day',
+            ALTER COLUMN timestamp TYPE TIMESTAMP
+    """)
+    cursor.execute("ALTER TABLE ticker_data DROP CONSTRAINT IF EXISTS ticker_data_symbol_asset_type_timestamp_key")
+    cursor.execute("""
+        ALTER TABLE ticker_data
+            ADD CONSTRAINT ticker_data_symbol_asset_type_timeframe_timestamp_key
+            UNIQUE (symbol, asset_type, timeframe, timestamp)
+    """)
+
+
+def add_close_covering_index(cursor):
+    # Serves close-price range reads (fetch_close_prices) with index-only scans
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS ticker_data_symbol_timestamp_close
+        ON ticker_data (symbol, timestamp) INCLUDE (close, timeframe)
+    """)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'create base tables', create_base_tables),
+    Migration(2, 'double precision and bigint bar columns', use_native_numeric_types),
+    Migration(3, 'timeframe column and timestamp bars', add_timeframe),
+    Migration(4, 'covering index for close-price reads', add_close_covering_index),
+]
+
+
+def _lock(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    """)
+    cursor.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_KEY,))
+
+
+def applied_versions(pool) -> List[int]:
+    with pool.connection() as connection, connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('schema_migrations')")
+        if cursor.fetchone()[0] is None:
+            return []
+        cursor.execute("SELECT version FROM schema_migrations ORDER BY version")
+        return [row[0] for row in cursor.fetchall()]
+
+
+def migrate(pool, target: int = None, migrations: List[Migration] = None) -> List[int]:
+    """
+    Apply pending migrations up to `target` (default: all), each in its own transaction.
+    :return: Versions applied by this call
+    """
+    migrations = migrations or MIGRATIONS
+    applied = []
+    for migration in migrations:
+        if target is not None and migration.version > target:
+            break
+        with pool.connection() as connection, connection.cursor() as cursor:
+            _lock(cursor)
+            cursor.execute("SELECT 1 FROM schema_migrations WHERE version = %s", (migration.version,))
+            if cursor.fetchone() is not None:
+                continue
+            logging.info(f"Applying migration {migration.version}: {migration.name}")
+            migration.apply(cursor)
+            cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                           (migration.version, migration.name))
+        applied.append(migration.version)
+    return applied
+
+
+def _period_starts(start: datetime.date, end: datetime.date, interval: str) -> List[datetime.date]:
+    current = start.replace(day=1) if interval == 'month' else start.replace(month=1, day=1)
+    periods = []
+    while current <= end:
+        periods.append(current)
+        if interval == 'month':
+            current = (current.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+        else:
+            current = current.replace(year=current.year + 1)
+    return periods
+
+
+def _partition_bounds(period_start: datetime.date, interval: str):
+    if interval == 'month':
+        return (period_start.replace(day=28) + datetime.timedelta(days=4)).replace(day=1), period_start.strftime('%Y_%m')
+    return period_start.replace(year=period_start.year + 1), period_start.strftime('%Y')
+
+
+def _partition_horizon(interval: str, future_periods: int) -> datetime.date:
+    return datetime.date.today() + datetime.timedelta(days=(31 if interval == 'month' else 366) * future_periods)
+
+
+def create_partitions(cursor, start: datetime.date, end: datetime.date, interval: str = 'month'):
+    """
+    Create the ticker_data partitions covering [start, end] that do not exist yet.
+    Rows the default partition already holds for a new period are moved into it,
+    since PostgreSQL refuses a partition whose range overlaps default rows.
+    """
+    cursor.execute("SELECT to_regclass('ticker_data_default') IS NOT NULL")
+    has_default = cursor.fetchone()[0]
+    for period_start in _period_starts(start, end, interval):
+        period_end, suffix = _partition_bounds(period_start, interval)
+        if not has_default:
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS ticker_data_{suffix} PARTITION OF ticker_data
+                FOR VALUES FROM ('{period_start}') TO ('{period_end}')
+            """)
+            continue
+        cursor.execute(f"SELECT to_regclass('ticker_data_{suffix}') IS NOT NULL")
+        if cursor.fetchone()[0]:
+            continue
+        cursor.execute(f"CREATE TABLE ticker_data_{suffix} (LIKE ticker_data INCLUDING DEFAULTS)")
+        cursor.execute(f"""
+            WITH moved AS (
+                DELETE FROM ticker_data_default
+                WHERE timestamp >= '{period_start}' AND timestamp < '{period_end}'
+                RETURNING *
+            )
+            INSERT INTO ticker_data_{suffix} SELECT * FROM moved
+        """)
+        if cursor.rowcount:
+            logging.info(f"Moved {cursor.rowcount} rows from ticker_data_default into ticker_data_{suffix}")
+        cursor.execute(f"""
+            ALTER TABLE ticker_data ATTACH PARTITION ticker_data_{suffix}
+            FOR VALUES FROM ('{period_start}') TO ('{period_end}')
+        """)
+
+
+def maintain_partitions(pool, future_periods: int = 12) -> bool:
+    """
+    Keep `future_periods` partitions ahead of today on a partitioned ticker_data,
+    so new bars never accumulate in the default partition. A no-op on an
+    unpartitioned table; run at startup by DataProcessor.create_table.
+    :return: True if ticker_data is partitioned
+    """
+    with pool.connection() as connection, connection.cursor() as cursor:
+        _lock(cursor)
+        cursor.execute("""
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass('ticker_data')
+        """)
+        names = [row[0] for row in cursor.fetchall()]
+        periods = [name[len('ticker_data_'):] for name in names if name != 'ticker_data_default']
+        if not periods:
+            return False
+        interval = 'month' if '_' in periods[0] else 'year'
+        create_partitions(cursor, datetime.date.today(), _partition_horizon(interval, future_periods), interval)
+        return True
+
+
+def partition_ticker_data(pool, interval: str = 'month', future_periods: int = 12):
+    """
+    Convert ticker_data into a table range-partitioned on timestamp by month or
+    year, copying the existing rows. Partitions are created for the stored range
+    plus `future_periods` ahead (extended by maintain_partitions); a default
+    partition catches anything else. Requires the migrations to be applied first.
+    """
+    if interval not in ('month', 'year'):
+        raise ValueError(f"Unsupported partition interval: {interval}")
+    with pool.connection() as connection, connection.cursor() as cursor:
+        _lock(cursor)
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = 'ticker_data'::regclass")
+        if cursor.fetchone()[0] == 'p':
+            logging.info("ticker_data is already partitioned")
+            return
+        cursor.execute("SELECT MIN(timestamp)::date, MAX(timestamp)::date FROM ticker_data")
+        first, last = cursor.fetchone()
+        today = datetime.date.today()
+        first = first or today
+        last = max(last or today, _partition_horizon(interval, future_periods))
+
+        cursor.execute("ALTER TABLE ticker_data RENAME TO ticker_data_unpartitioned")
+        cursor.execute("ALTER INDEX IF EXISTS ticker_data_symbol_timestamp_close RENAME TO ticker_data_unpartitioned_close")
+        cursor.execute("ALTER TABLE ticker_data_unpartitioned RENAME CONSTRAINT ticker_data_pkey TO ticker_data_unpartitioned_pkey")
+        cursor.execute("""
+            ALTER TABLE ticker_data_unpartitioned
+            RENAME CONSTRAINT ticker_data_symbol_asset_type_timeframe_timestamp_key TO ticker_data_unpartitioned_key
+        """)
+        cursor.execute("""
+            CREATE TABLE ticker_data (
+                id INTEGER NOT NULL DEFAULT nextval('ticker_data_id_seq'),
+                symbol VARCHAR(10) NOT NULL,
+                asset_type VARCHAR(10) NOT NULL,
+                timeframe VARCHAR(10) NOT NULL DEFAULT '1Day',
+                timestamp TIMESTAMP NOT NULL,
+                open DOUBLE PRECISION NOT NULL,
+                high DOUBLE PRECISION NOT NULL,
+                low DOUBLE PRECISION NOT NULL,
+                close DOUBLE PRECISION NOT NULL,
+                volume DOUBLE PRECISION NOT NULL,
+                trade_count BIGINT NOT NULL,
+                vwap DOUBLE PRECISION NOT NULL,
+                PRIMARY KEY (id, timestamp),
+                CONSTRAINT ticker_data_symbol_asset_type_timeframe_timestamp_key
+                    UNIQUE (symbol, asset_type, timeframe, timestamp)
+            ) PARTITION BY RANGE (timestamp)
+        """)
+        add_close_covering_index(cursor)
+        create_partitions(cursor, first, last, interval)
+        cursor.execute("CREATE TABLE ticker_data_default PARTITION OF ticker_data DEFAULT")
+        columns = ', '.join(TICKER_DATA_COLUMNS)
+        cursor.execute(f"INSERT INTO ticker_data ({columns}) SELECT {columns} FROM ticker_data_unpartitioned")
+        logging.info(f"Moved {cursor.rowcount} rows into {interval}ly ticker_data partitions")
+        cursor.execute("ALTER SEQUENCE ticker_data_id_seq OWNED BY ticker_data.id")
+        cursor.execute("DROP TABLE ticker_data_unpartitioned")
+
+
+def main():
+    from config.settings import load_configurations
+    from data_handling.connection_pool import get_pool
+
+    parser = argparse.ArgumentParser(description='Database schema migrations')
+    parser.add_argument('--target', type=int, default=None, help='Migrate up to this version')
+    parser.add_argument('--status', action='store_true', help='Show applied and pending versions')
+    parser.add_argument('--partition', choices=['month', 'year'], default=None,
+                        help='Convert ticker_data to range partitions after migrating')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    pool = get_pool(load_configurations())
+    if args.status:
+        applied = applied_versions(pool)
+        for migration in MIGRATIONS:
+            state = 'applied' if migration.version in applied else 'pending'
+            print(f"{migration.version:>3} {state:<8} {migration.name}")
+        return
+    try:
+        print(f"Applied migrations: {migrate(pool, args.target) or 'none'}")
+        if args.partition:
+            partition_ticker_data(pool, args.partition)
+        maintain_partitions(pool)
+    except psycopg2.Error as e:
+        logging.error(f"Migration failed: {e}")
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
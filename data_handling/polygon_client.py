@@ -0,0 +1,147 @@
+import datetime
+import json
+import logging
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.response_cache import ResponseCache
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def indicator_values_to_frame(values: List[Dict[str, Any]], column: str) -> pd.DataFrame:
+    """
+    Polygon indicator values ({'timestamp': ms, 'value': ...}) as a frame with
+    'timestamp' and `column`, the layout of DataProcessor.process_sma_data.
+    """
+    df = pd.DataFrame(values, columns=['timestamp', 'value']).rename(columns={'value': column})
+    # Convert timestamp from milliseconds to datetime
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    return df[['timestamp', column]]
+
+
+class PolygonClient:
+    """
+    Polygon REST client for technical indicators.
+
+    Uses one pooled keep-alive session with timeouts, retries 429 and 5xx
+    responses with exponential backoff (honoring Retry-After), follows
+    `next_url` pagination and caches responses per
+    (symbol, indicator, window, date) in a local SQLite cache.
+    """
+
+    def __init__(self, config, session: requests.Session = None, cache: ResponseCache = None):
+        self.config = config
+        self.api_key = config['polygon_api_key']
+        self.base_url = config.get('polygon_base_url', 'https://api.polygon.io').rstrip('/')
+        self.timeout = float(config.get('polygon_timeout', 10))
+        self.max_retries = int(config.get('polygon_max_retries', 5))
+        self.backoff_base = float(config.get('polygon_backoff_base', 0.5))
+        self.backoff_max = float(config.get('polygon_backoff_max', 30))
+        self.session = session or self._make_session(int(config.get('polygon_pool_size', 10)))
+        cache_path = config.get('polygon_cache_path')
+        self.cache = cache if cache is not None else (
+            ResponseCache(cache_path, ttl=float(config.get('polygon_cache_ttl', 900))) if cache_path else None)
+
+    @staticmethod
+    def _make_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        # Full jitter keeps parallel clients from retrying in lockstep
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get_json(self, url: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        GET a Polygon URL with the API key, retrying rate-limited and transient failures.
+        """
+        params = dict(params or {}, apiKey=self.api_key)
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response.json()
+                error = requests.exceptions.HTTPError(f'{response.status_code} from {url}', response=response)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+            if attempt == self.max_retries:
+                raise error
+            delay = self._backoff(attempt, response)
+            logging.warning(f"Polygon request failed ({error}); retrying in {delay:.2f}s")
+            time.sleep(delay)
+
+    def get_indicator(self, symbol: str, indicator: str, window: int, timespan: str = 'day',
+                      series_type: str = 'close', start_date: datetime.date = None,
+                      end_date: datetime.date = None, limit: int = 5000) -> Dict[str, Any]:
+        """
+        Fetch every page of an indicator series.
+
+        :param indicator: Polygon indicator path, e.g. 'sma' or 'ema'
+        :param start_date: Optional first date (timestamp.gte)
+        :param end_date: Optional last date (timestamp.lte); also the cache date, defaults to today
+        :return: Polygon payload with all pages' values in results.values (newest first)
+        """
+        as_of = end_date or datetime.date.today()
+        cache_key = ResponseCache.make_key('polygon', symbol, indicator, window, timespan, series_type, start_date, as_of)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logging.info(f"Polygon {indicator}{window} for {symbol} as of {as_of} served from cache")
+                return json.loads(cached)
+
+        params = {
+            'timespan': timespan,
+            'adjusted': 'true',
+            'window': window,
+            'series_type': series_type,
+            'order': 'desc',
+            'limit': limit,
+        }
+        if start_date is not None:
+            params['timestamp.gte'] = str(start_date)
+        if end_date is not None:
+            params['timestamp.lte'] = str(end_date)
+
+        data = self.get_json(f'{self.base_url}/v1/indicators/{indicator}/{symbol}', params)
+        values = list((data.get('results') or {}).get('values') or [])
+        pages = 1
+        while data.get('next_url'):
+            # next_url carries the query itself except for the API key
+            data = self.get_json(data['next_url'])
+            values.extend((data.get('results') or {}).get('values') or [])
+            pages += 1
+        data.pop('next_url', None)
+        data.setdefault('results', {})['values'] = values
+        logging.info(f"Fetched {len(values)} {indicator}{window} values for {symbol} in {pages} pages")
+
+        if self.cache is not None:
+            # Series ending before today are final; today's may still change
+            ttl = None if as_of < datetime.date.today() else self.cache.ttl
+            self.cache.set(cache_key, json.dumps(data), ttl)
+        return data
+
+    def get_sma(self, symbol: str, window: int, start_date: datetime.date = None,
+                end_date: datetime.date = None) -> pd.DataFrame:
+        """
+        SMA series in the DataProcessor.process_sma_data layout: 'timestamp' and f'SMA{window}'.
+        """
+        data = self.get_indicator(symbol, 'sma', window, start_date=start_date, end_date=end_date)
+        return indicator_values_to_frame(data['results']['values'], f'SMA{window}')
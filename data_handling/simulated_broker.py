@@ -0,0 +1,91 @@
+import itertools
+import logging
+import threading
+import time
+
+from data_handling.account_manager import AccountManager
+
+
+class OrderRejected(Exception):
+    """
+    Raised by a broker that refuses an order (unknown symbol, insufficient cash or shares).
+    """
+
+
+class SimulatedBroker(AccountManager):
+    """
+    In-process broker behind the AccountManager interface, for paper runs and tests.
+
+    Orders fill immediately at the configured price after a simulated round
+    trip of `latency` seconds. Buys need enough cash and sells enough shares
+    (no margin, no shorting); anything else raises OrderRejected. Safe to call
+    from several threads at once.
+    """
+
+    def __init__(self, config, holdings=None, balance: float = None, prices=None, latency: float = None):
+        super().__init__(config)
+        self.holdings = dict(holdings or {})
+        self.balance = float(balance if balance is not None else config.get('simulated_balance', 10000.0))
+        self.prices = dict(prices or {})
+        self.latency = float(latency if latency is not None else config.get('simulated_order_latency', 0.0))
+        self.orders = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def set_prices(self, prices):
+        with self._lock:
+            self.prices.update(prices)
+
+    def fetch_account_data(self):
+        with self._lock:
+            return {"holdings": dict(self.holdings), "balance": self.balance}
+
+    def place_order(self, symbol, quantity, order_type):
+        """
+        Fill an order at the current simulated price.
+        :return: Order dictionary with id, status and fill price
+        """
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            with self._lock:
+                return self._fill(symbol, float(quantity), order_type)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _fill(self, symbol, quantity, order_type):
+        price = self.prices.get(symbol)
+        if price is None:
+            raise OrderRejected(f"No price for {symbol}")
+        if quantity <= 0:
+            raise OrderRejected(f"Invalid quantity {quantity} for {symbol}")
+        held = self.holdings.get(symbol, 0.0)
+        if order_type == 'buy':
+            cost = quantity * price
+            if cost > self.balance + 1e-9:
+                raise OrderRejected(f"Insufficient balance {self.balance:.2f} to buy {quantity} {symbol} for {cost:.2f}")
+            self.balance -= cost
+            held += quantity
+        elif order_type == 'sell':
+            if quantity > held + 1e-9:
+                raise OrderRejected(f"Cannot sell {quantity} {symbol}, holding {held}")
+            self.balance += quantity * price
+            held -= quantity
+        else:
+            raise OrderRejected(f"Unknown order type {order_type!r}")
+
+        if held:
+            self.holdings[symbol] = held
+        else:
+            self.holdings.pop(symbol, None)
+        order = {'id': f'sim-{next(self._ids)}', 'symbol': symbol, 'quantity': quantity, 'order_type': order_type,
+                 'status': 'filled', 'filled_avg_price': price}
+        self.orders.append(order)
+        logging.debug(f"Simulated {order_type} of {quantity} {symbol} at {price}")
+        return order
@@ -0,0 +1,269 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from data_handling.bar_cache import BarCache, CACHE_DTYPES
+from data_handling.coverage import IntervalSet, merge_gaps
+from data_handling.data_fetcher import DataFetcher, TICKER_DTYPES, empty_ticker_frame, to_ticker_frame
+from data_handling.data_storage import COPY_BINARY_HEADER, COPY_BINARY_TRAILER, encode_copy_binary
+from data_handling.migrations import MIGRATIONS, _period_starts
+
+
+def make_api_bars(n=3):
+    timestamps = pd.date_range('2024-01-02 05:00', periods=n, freq='D', tz='UTC')
+    return pd.DataFrame({
+        'symbol': 'AAPL', 'timestamp': timestamps,
+        'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': np.arange(n, dtype=float),
+        'volume': 100.0, 'trade_count': 7, 'vwap': 1.5,
+    })
+
+
+def test_to_ticker_frame_normalizes_api_and_db_rows():
+    api = to_ticker_frame(make_api_bars(), 'AAPL', 'stock', 'api')
+    db_rows = [(datetime.date(2024, 1, 1), 1.0, 2.0, 0.5, 9.0, 100.0, 7, 1.5)]
+    db = to_ticker_frame(pd.DataFrame.from_records(db_rows, columns=list(TICKER_DTYPES)), 'AAPL', 'stock', 'db')
+    combined = pd.concat([db, api], ignore_index=True)
+
+    assert list(combined.columns) == ['symbol', 'asset_type', *TICKER_DTYPES, 'source']
+    assert {column: str(combined[column].dtype) for column in TICKER_DTYPES} == TICKER_DTYPES
+    assert list(combined['timestamp'].dt.strftime('%Y-%m-%d')) == [
+        '2024-01-01', '2024-01-02', '2024-01-03', '2024-01-04']
+    assert list(combined['source']) == ['db', 'api', 'api', 'api']
+    assert combined['source'].dtype == 'category'
+
+
+def test_empty_ticker_frame_has_schema():
+    frame = to_ticker_frame(empty_ticker_frame(), 'AAPL', 'stock', 'db')
+    assert frame.empty
+    assert str(frame['close'].dtype) == 'float64'
+
+
+def d(day):
+    return datetime.date(2024, 1, day)
+
+
+def test_copy_encoding_stores_missing_trade_count_as_zero():
+    bars = make_api_bars().astype({'trade_count': float})
+    bars.loc[1, 'trade_count'] = np.nan
+    payload = encode_copy_binary(bars, 'AAPL', 'stock')
+    body = payload[len(COPY_BINARY_HEADER):-len(COPY_BINARY_TRAILER)]
+    rows = np.frombuffer(body, dtype=np.uint8).reshape(len(bars), -1)
+    # trade_count is the int8 field before the trailing vwap length and value
+    trade_counts = rows[:, -20:-12].copy().view('>i8').ravel()
+    assert list(trade_counts) == [7, 0, 7]
+
+
+def test_copy_encoding_keeps_intraday_times_and_truncates_daily_bars():
+    bars = make_api_bars().assign(timestamp=pd.to_datetime(['2024-01-02 14:30', '2024-01-02 14:31', '2024-01-03 05:00']))
+
+    def encoded_timestamps(timeframe):
+        body = encode_copy_binary(bars, 'AAPL', 'stock', timeframe)[len(COPY_BINARY_HEADER):-len(COPY_BINARY_TRAILER)]
+        rows = np.frombuffer(body, dtype=np.uint8).reshape(len(bars), -1)
+        # Field count, then length-prefixed 'AAPL' and 'stock', then the timestamp's length
+        offset = 2 + 4 + 4 + 4 + 5 + 4
+        microseconds = rows[:, offset:offset + 8].copy().view('>i8').ravel()
+        return list(np.datetime64('2000-01-01', 'us') + microseconds.astype('timedelta64[us]'))
+
+    assert [str(value) for value in encoded_timestamps('1Min')] == [
+        '2024-01-02T14:30:00.000000', '2024-01-02T14:31:00.000000', '2024-01-03T05:00:00.000000']
+    assert [str(value)[:16] for value in encoded_timestamps('1Day')] == [
+        '2024-01-02T00:00', '2024-01-02T00:00', '2024-01-03T00:00']
+
+
+def test_interval_set_merges_overlapping_and_adjacent_ranges():
+    coverage = IntervalSet([(d(10), d(12)), (d(1), d(3)), (d(4), d(5)), (d(11), d(20))])
+    assert coverage.ranges == [(d(1), d(5)), (d(10), d(20))]
+
+
+def test_interval_set_missing_and_intersection():
+    coverage = IntervalSet([(d(5), d(10)), (d(15), d(20))])
+    assert coverage.missing(d(1), d(25)) == [(d(1), d(4)), (d(11), d(14)), (d(21), d(25))]
+    assert coverage.missing(d(6), d(9)) == []
+    assert coverage.missing(d(8), d(16)) == [(d(11), d(14))]
+    assert IntervalSet().missing(d(1), d(2)) == [(d(1), d(2))]
+    assert coverage.intersection(d(8), d(16)) == [(d(8), d(10)), (d(15), d(16))]
+
+
+def test_merge_gaps_joins_gaps_around_short_covered_stretches():
+    gaps = [(d(1), d(4)), (d(8), d(9)), (d(20), d(25))]
+    assert merge_gaps(gaps, 3) == [(d(1), d(9)), (d(20), d(25))]
+    assert merge_gaps(gaps, 0) == gaps
+
+
+def test_fetch_bars_bulk_batches_and_splits_per_symbol():
+    requests = []
+
+    def request_bars(asset_type, symbols, start_date, end_date):
+        requests.append((asset_type, tuple(symbols)))
+        frames = [make_api_bars().assign(symbol=symbol) for symbol in symbols if symbol != 'EMPTY']
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames).set_index(['symbol', 'timestamp'])
+
+    fetcher = DataFetcher.__new__(DataFetcher)
+    fetcher.alpaca_batch_size = 2
+    fetcher.alpaca_fetch_workers = 4
+    fetcher.request_bars = request_bars
+    symbols = {'stock': ['AAPL', 'MSFT', 'NVDA'], 'crypto': ['BTC/USD', 'EMPTY']}
+    result = fetcher.fetch_bars_bulk(symbols, datetime.date(2024, 1, 1), datetime.date(2024, 1, 5))
+
+    assert sorted(requests) == [('crypto', ('BTC/USD', 'EMPTY')), ('stock', ('AAPL', 'MSFT')), ('stock', ('NVDA',))]
+    assert set(result) == {'AAPL', 'MSFT', 'NVDA', 'BTC/USD', 'EMPTY'}
+    assert result['EMPTY'].empty
+    assert list(result['MSFT']['symbol'].unique()) == ['MSFT']
+    assert len(result['BTC/USD']) == 3 and 'timestamp' in result['BTC/USD'].columns
+
+
+class RecordingCoverage:
+    def __init__(self, ranges=None):
+        self.ranges = ranges or []
+        self.recorded = []
+
+    def load(self, symbol, asset_type, timeframe):
+        return IntervalSet(self.ranges)
+
+    def record(self, symbol, asset_type, timeframe, start, end):
+        self.recorded.append((symbol, start, end))
+
+
+class FailingStorage:
+    def bulk_store_bars(self, data, symbol, asset_type, batch_size=None, timeframe=None):
+        return None
+
+
+def make_offline_fetcher(coverage, storage):
+    fetcher = DataFetcher.__new__(DataFetcher)
+    fetcher.coverage = coverage
+    fetcher.storage = storage
+    fetcher.coverage_merge_days = 0
+    fetcher.timeframe = '1Day'
+    fetcher.fetch_data_from_api = lambda symbol, asset_type, start, end: make_api_bars()
+    fetcher.fetch_data_from_db = lambda symbol, asset_type, ranges: empty_ticker_frame()
+    return fetcher
+
+
+def test_failed_store_leaves_range_uncovered():
+    coverage = RecordingCoverage()
+    fetcher = make_offline_fetcher(coverage, FailingStorage())
+    frame = fetcher.fetch_uncached_ticker_data('AAPL', 'stock', datetime.date(2024, 1, 2), datetime.date(2024, 1, 4))
+    # The fetched bars are still returned, but the range is requested again next time
+    assert len(frame) == 3 and coverage.recorded == []
+
+
+def test_fetch_keeps_bars_with_missing_trade_count():
+    bars = make_api_bars().astype({'trade_count': float})
+    bars.loc[1, 'trade_count'] = np.nan
+    coverage = RecordingCoverage()
+    fetcher = make_offline_fetcher(coverage, FailingStorage())
+    fetcher.fetch_data_from_api = lambda symbol, asset_type, start, end: bars
+    frame = fetcher.fetch_uncached_ticker_data('AAPL', 'stock', datetime.date(2024, 1, 2), datetime.date(2024, 1, 4))
+    assert list(frame['trade_count']) == [7, 0, 7]
+    assert frame['trade_count'].dtype == 'int64'
+
+
+def test_todays_forming_bar_is_returned_but_not_stored():
+    class RecordingStorage:
+        def __init__(self):
+            self.stored = []
+
+        def bulk_store_bars(self, data, symbol, asset_type, batch_size=None, timeframe=None):
+            self.stored.append(data)
+            return len(data)
+
+    today = datetime.date.today()
+    bars = make_api_bars().assign(timestamp=pd.date_range(end=pd.Timestamp(today, tz='UTC'), periods=3, freq='D'))
+    coverage, storage = RecordingCoverage(), RecordingStorage()
+    fetcher = make_offline_fetcher(coverage, storage)
+    fetcher.fetch_data_from_api = lambda symbol, asset_type, start, end: bars
+    frame = fetcher.fetch_uncached_ticker_data('AAPL', 'stock', today - datetime.timedelta(days=2), today)
+
+    assert len(frame) == 3
+    assert len(storage.stored) == 1 and len(storage.stored[0]) == 2
+    assert coverage.recorded == [('AAPL', today - datetime.timedelta(days=2), today - datetime.timedelta(days=1))]
+
+
+def test_database_errors_are_not_written_to_the_bar_cache(tmp_path):
+    coverage = RecordingCoverage([(datetime.date(2024, 1, 1), datetime.date(2024, 1, 10))])
+    fetcher = make_offline_fetcher(coverage, FailingStorage())
+    fetcher.fetch_data_from_db = lambda symbol, asset_type, ranges: None
+    fetcher.bar_cache = BarCache(str(tmp_path))
+    fetcher.bar_cache_verify = False
+    frame = fetcher.fetch_ticker_data('AAPL', 'stock', datetime.date(2024, 1, 2), datetime.date(2024, 1, 4))
+    assert frame.empty
+    assert fetcher.bar_cache.coverage('AAPL', 'stock') == IntervalSet()
+
+
+def test_backfill_keeps_successful_batches_when_one_fails():
+    def request_bars(asset_type, symbols, start_date, end_date):
+        if 'BAD' in symbols:
+            raise ConnectionError('batch failed')
+        return pd.concat([make_api_bars().assign(symbol=symbol) for symbol in symbols]).set_index(
+            ['symbol', 'timestamp'])
+
+    class StoredOnce(FailingStorage):
+        def bulk_store_bars(self, data, symbol, asset_type, batch_size=None, timeframe=None):
+            return None if symbol == 'MSFT' else len(data)
+
+    coverage = RecordingCoverage()
+    fetcher = make_offline_fetcher(coverage, StoredOnce())
+    fetcher.alpaca_batch_size = 2
+    fetcher.alpaca_fetch_workers = 2
+    fetcher.request_bars = request_bars
+    symbols = ['AAPL', 'MSFT', 'BAD', 'NVDA']
+    result = fetcher.fetch_bars_bulk({'stock': symbols}, datetime.date(2024, 1, 1), datetime.date(2024, 1, 5))
+    assert len(result['AAPL']) == 3 and result['BAD'].empty and result['NVDA'].empty
+
+    fetcher.backfill_ticker_data(symbols, 'stock', datetime.date(2024, 1, 1), datetime.date(2024, 1, 5))
+    # BAD and NVDA shared the failed batch and MSFT failed to store: only AAPL is covered
+    assert [symbol for symbol, _, _ in coverage.recorded] == ['AAPL']
+
+
+def test_bar_cache_round_trip_and_merge(tmp_path):
+    cache = BarCache(str(tmp_path))
+    bars = to_ticker_frame(make_api_bars(5), 'BTC/USD', 'crypto', 'api')
+    cache.write('BTC/USD', 'crypto', bars.iloc[:3], [(datetime.date(2024, 1, 2), datetime.date(2024, 1, 4))])
+
+    assert cache.read('BTC/USD', 'crypto', datetime.date(2024, 1, 1), datetime.date(2024, 1, 4)) is None
+    arrays = cache.read_arrays('BTC/USD', 'crypto', datetime.date(2024, 1, 3), datetime.date(2024, 1, 4),
+                               columns=['close'])
+    assert isinstance(arrays['close'], np.memmap)
+    np.testing.assert_array_equal(arrays['close'], [1.0, 2.0])
+
+    # Cached rows win over rewritten ones, like ON CONFLICT DO NOTHING
+    changed = bars.assign(close=bars['close'] + 100)
+    cache.write('BTC/USD', 'crypto', changed, [(datetime.date(2024, 1, 5), datetime.date(2024, 1, 6))])
+    frame = cache.read('BTC/USD', 'crypto', datetime.date(2024, 1, 2), datetime.date(2024, 1, 6))
+    assert list(frame['close']) == [0.0, 1.0, 2.0, 103.0, 104.0]
+    assert {column: str(frame[column].dtype) for column in CACHE_DTYPES} == CACHE_DTYPES
+    assert cache.coverage('BTC/USD', 'crypto') == IntervalSet([(datetime.date(2024, 1, 2), datetime.date(2024, 1, 6))])
+
+    # Newer bars are appended as a segment; reads spanning segments are stitched together
+    later = to_ticker_frame(make_api_bars(8), 'BTC/USD', 'crypto', 'api').iloc[5:]
+    cache.write('BTC/USD', 'crypto', later, [(datetime.date(2024, 1, 7), datetime.date(2024, 1, 9))])
+    meta = cache._read_meta(cache._key_dir('BTC/USD', 'crypto'))
+    assert len(meta['segments']) == 2 and meta['rows'] == 8
+    assert isinstance(cache.read_arrays('BTC/USD', 'crypto', datetime.date(2024, 1, 7), datetime.date(2024, 1, 9),
+                                        columns=['close'])['close'], np.memmap)
+    frame = cache.read('BTC/USD', 'crypto', datetime.date(2024, 1, 5), datetime.date(2024, 1, 8))
+    assert list(frame['close']) == [103.0, 104.0, 5.0, 6.0]
+    # An out-of-order write compacts everything into one segment
+    cache.write('BTC/USD', 'crypto', bars.iloc[:1], [])
+    assert len(cache._read_meta(cache._key_dir('BTC/USD', 'crypto'))['segments']) == 1
+    assert list(cache.read('BTC/USD', 'crypto', datetime.date(2024, 1, 2), datetime.date(2024, 1, 9))['close']) == [
+        0.0, 1.0, 2.0, 103.0, 104.0, 5.0, 6.0, 7.0]
+
+    cache.invalidate('BTC/USD', 'crypto')
+    assert cache.coverage('BTC/USD', 'crypto') == IntervalSet()
+    cache.write('BTC/USD', 'crypto', changed, [(datetime.date(2024, 1, 2), datetime.date(2024, 1, 6))])
+    frame = cache.read('BTC/USD', 'crypto', datetime.date(2024, 1, 2), datetime.date(2024, 1, 6))
+    assert list(frame['close']) == [100.0, 101.0, 102.0, 103.0, 104.0]
+
+
+def test_migrations_are_ordered_and_partition_periods():
+    versions = [migration.version for migration in MIGRATIONS]
+    assert versions == sorted(set(versions)) and versions[0] == 1
+    assert _period_starts(datetime.date(2023, 11, 15), datetime.date(2024, 2, 1), 'month') == [
+        datetime.date(2023, 11, 1), datetime.date(2023, 12, 1), datetime.date(2024, 1, 1), datetime.date(2024, 2, 1)]
+    assert _period_starts(datetime.date(2023, 11, 15), datetime.date(2024, 2, 1), 'year') == [
+        datetime.date(2023, 1, 1), datetime.date(2024, 1, 1)]
@@ -0,0 +1,70 @@
+import datetime
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from data_handling.polygon_client import PolygonClient, indicator_values_to_frame
+from utils.response_cache import ResponseCache
+
+
+class StubPolygonHandler(BaseHTTPRequestHandler):
+    """ Two-page SMA series; the first request of each run is rate limited """
+    requests = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        self.requests.append((url.path, query))
+        if len(self.requests) == 1:
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            return
+        assert query['apiKey'] == ['key']
+        if url.path == '/v1/indicators/sma/AAPL':
+            body = {'status': 'OK', 'next_url': f'http://{self.headers["Host"]}/v1/indicators/sma/AAPL/page2?cursor=abc',
+                    'results': {'values': [{'timestamp': 1704240000000, 'value': 11.0},
+                                           {'timestamp': 1704153600000, 'value': 10.0}]}}
+        else:
+            body = {'status': 'OK', 'results': {'values': [{'timestamp': 1704067200000, 'value': 9.0}]}}
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubPolygonHandler.requests = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubPolygonHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+
+def test_polygon_client_retries_paginates_and_caches(stub_server, tmp_path):
+    config = {'polygon_api_key': 'key', 'polygon_base_url': stub_server, 'polygon_backoff_base': 0.01}
+    client = PolygonClient(config, cache=ResponseCache(str(tmp_path / 'polygon.sqlite3')))
+    end = datetime.date(2024, 1, 3)
+    data = client.get_indicator('AAPL', 'sma', 10, end_date=end)
+
+    assert [value['value'] for value in data['results']['values']] == [11.0, 10.0, 9.0]
+    assert 'next_url' not in data
+    assert [path for path, query in StubPolygonHandler.requests] == [
+        '/v1/indicators/sma/AAPL', '/v1/indicators/sma/AAPL', '/v1/indicators/sma/AAPL/page2']
+    assert StubPolygonHandler.requests[1][1]['timestamp.lte'] == ['2024-01-03']
+
+    frame = client.get_sma('AAPL', 10, end_date=end)
+    assert len(StubPolygonHandler.requests) == 3
+    expected = indicator_values_to_frame(data['results']['values'], 'SMA10')
+    assert list(frame.columns) == ['timestamp', 'SMA10']
+    assert frame.equals(expected)
+    assert frame['timestamp'].iloc[-1] == datetime.datetime(2024, 1, 1)
@@ -1,3 +1,4 @@
 from .decision_maker import DecisionMaker
 from .risk_manager import RiskManager
 from .portfolio_manager import PortfolioManager
+from .execution import OrderExecutor, ExecutionReport, OrderAck, net_orders
@@ -1,4 +1,26 @@
 import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+BUY, HOLD, SELL = 1, 0, -1
+
+
+def _as_series(values, symbols=None, name=None) -> pd.Series:
+    """
+    Scores or prices as a float Series indexed by symbol, from a Series, a
+    dictionary or an array aligned with `symbols`.
+    """
+    if values is None:
+        return pd.Series(dtype=float, name=name)
+    if isinstance(values, pd.Series):
+        return values.astype(float)
+    if isinstance(values, dict):
+        return pd.Series(values, dtype=float, name=name)
+    if symbols is None:
+        raise ValueError(f"{name} given as an array needs the matching symbols")
+    return pd.Series(np.asarray(values, dtype=float), index=symbols, name=name)
 
 
 class DecisionMaker:
@@ -10,20 +32,119 @@ class DecisionMaker:
         self.technical_weight = config.get('technical_weight', 0.5)
         self.buy_threshold = config.get('buy_threshold', 20)
         self.sell_threshold = config.get('sell_threshold', -20)
+        # Brings technical scores to the -100..100 range of sentiment scores (10 for SMA scores, -7..10)
+        self.technical_score_scale = float(config.get('technical_score_scale', 1.0))
+        self.min_order_value = float(config.get('min_order_value', 0.0))
+        self.fractional_shares = bool(config.get('allow_fractional_shares', False))
+
+    def combined_scores(self, sentiment_scores, technical_scores) -> np.ndarray:
+        """
+        Weighted sum of sentiment and scaled technical scores; a missing score counts as neutral (0).
+        """
+        technical = self.technical_score_scale * np.nan_to_num(np.asarray(technical_scores, dtype=float))
+        return self.sentiment_weight * np.nan_to_num(np.asarray(sentiment_scores, dtype=float)) + \
+            self.technical_weight * technical
+
+    def signals(self, combined) -> np.ndarray:
+        """
+        BUY (1), SELL (-1) or HOLD (0) per symbol from the buy and sell thresholds.
+        """
+        combined = np.asarray(combined, dtype=float)
+        return np.where(combined >= self.buy_threshold, BUY, np.where(combined <= self.sell_threshold, SELL, HOLD))
+
+    def plan_positions(self, sentiment_scores, technical_scores, current_holdings: dict, prices,
+                       balance: float, symbols=None) -> pd.DataFrame:
+        """
+        Target positions for a whole universe in one vectorized pass.
+
+        Sells go flat and holds keep their current position. The exposure the
+        holds leave free (up to max_gross_exposure) is split across the buys in
+        proportion to their combined scores. RiskManager caps are then applied
+        to every target weight, and quantities are rounded toward zero to whole
+        shares unless fractional shares are allowed.
+
+        :param sentiment_scores: Series or dictionary by symbol, or an array aligned with `symbols`
+        :param technical_scores: Same layout as `sentiment_scores`
+        :param current_holdings: Dictionary of symbol -> quantity held
+        :param prices: Latest price per symbol (Series, dictionary or array aligned with `symbols`)
+        :param balance: Cash balance
+        :return: One row per symbol with combined score, signal, current and target weights and quantities
+        """
+        sentiment = _as_series(sentiment_scores, symbols, 'sentiment')
+        technical = _as_series(technical_scores, symbols, 'technical')
+        held = _as_series(current_holdings, name='current_quantity')
+        price = _as_series(prices, symbols, 'price')
+        universe = technical.index.union(sentiment.index, sort=False).union(held.index, sort=False)
+
+        price = price.reindex(universe).to_numpy()
+        current = held.reindex(universe).fillna(0.0).to_numpy()
+        combined = self.combined_scores(sentiment.reindex(universe), technical.reindex(universe))
+        signal = self.signals(combined)
+        # Without a price a symbol can be neither valued nor traded
+        priced = np.isfinite(price) & (price > 0)
+        signal = np.where(priced, signal, HOLD)
+
+        position_value = np.where(priced, current * np.nan_to_num(price), 0.0)
+        equity = float(balance) + position_value.sum()
+        if equity <= 0:
+            raise ValueError(f"Cannot size positions with non-positive equity {equity}")
+        current_weight = position_value / equity
+
+        target_weight = np.where(signal == HOLD, current_weight, 0.0)
+        buys = signal == BUY
+        if buys.any():
+            budget = max(self.risk_manager.max_gross_exposure - np.abs(target_weight).sum(), 0.0)
+            conviction = np.where(buys, np.maximum(combined, 0.0), 0.0)
+            total_conviction = conviction.sum()
+            if total_conviction > 0:
+                target_weight = target_weight + budget * conviction / total_conviction
+        target_weight = self.risk_manager.apply_limits(target_weight)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            target = np.where(priced, target_weight * equity / price, current)
+        if not self.fractional_shares:
+            target = np.trunc(target)
+        # Holds keep exactly what is held unless the risk caps trimmed them
+        trimmed = np.abs(target_weight) < np.abs(current_weight) - 1e-12
+        target = np.where((signal == HOLD) & ~trimmed, current, target)
+
+        return pd.DataFrame({
+            'combined_score': combined,
+            'signal': signal,
+            'price': price,
+            'current_quantity': current,
+            'current_weight': current_weight,
+            'target_weight': target_weight,
+            'target_quantity': target,
+        }, index=pd.Index(universe, name='symbol'))
 
-    def make_decision(self, sentiment_score, technical_score, current_holdings):
-        combined_score = (
-            self.sentiment_weight * sentiment_score +
-            self.technical_weight * technical_score
-        )
+    def make_decisions(self, sentiment_scores, technical_scores, current_holdings: dict, prices,
+                       balance: float, symbols=None) -> list:
+        """
+        The minimal order list that moves current holdings to the planned targets.
+        :return: List of {'symbol', 'quantity', 'order_type'} orders, as PortfolioManager.rebalance_portfolio takes
+        """
+        start = time.perf_counter()
+        plan = self.plan_positions(sentiment_scores, technical_scores, current_holdings, prices, balance, symbols)
+        delta = plan['target_quantity'].to_numpy() - plan['current_quantity'].to_numpy()
+        notional = np.abs(delta) * np.nan_to_num(plan['price'].to_numpy())
+        trade = (delta != 0) & (notional >= self.min_order_value)
 
-        decision = []
-        if combined_score >= self.buy_threshold:
-            decision.append({'symbol': 'AAPL', 'quantity': 10, 'order_type': 'buy'})
-        elif combined_score <= self.sell_threshold:
-            decision.append({'symbol': 'AAPL', 'quantity': 10, 'order_type': 'sell'})
-        else:
-            decision.append({'symbol': 'AAPL', 'quantity': 0, 'order_type': 'hold'})
+        # Plain lists: DataFrame.to_dict('records') costs more than the whole plan
+        orders = [
+            {'symbol': symbol, 'quantity': quantity, 'order_type': 'buy' if buy else 'sell'}
+            for symbol, quantity, buy in zip(plan.index[trade].tolist(), np.abs(delta[trade]).tolist(),
+                                             (delta[trade] > 0).tolist())
+        ]
+        logging.info(f'Decided {len(orders)} orders for {len(plan)} symbols '
+                     f'in {(time.perf_counter() - start) * 1000:.1f}ms')
+        return orders
 
+    def make_decision(self, sentiment_score, technical_score, current_holdings, symbol, price, balance: float):
+        """
+        Single-symbol form of make_decisions.
+        """
+        decision = self.make_decisions({symbol: sentiment_score}, {symbol: technical_score}, current_holdings,
+                                       {symbol: price}, balance)
         logging.info(f'Decision: {decision}')
         return decision
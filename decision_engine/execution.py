@@ -0,0 +1,131 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, List, NamedTuple, Optional
+
+from utils.helpers import latency_percentiles
+from utils.rate_limiter import RateLimiter
+
+ORDER_SIGNS = {'buy': 1.0, 'sell': -1.0}
+
+# Net quantities smaller than this are float noise from offsetting orders, not trades
+_QUANTITY_EPSILON = 1e-9
+
+
+def net_orders(decision) -> list:
+    """
+    Collapse a decision into at most one order per symbol: buys and sells of the
+    same symbol offset each other, and holds, zero quantities and fully offset
+    symbols are dropped. Symbols keep the order of their first action.
+
+    :param decision: List of {'symbol', 'quantity', 'order_type'} actions
+    :return: List of orders in the same format
+    """
+    net = {}
+    for action in decision:
+        order_type = action['order_type']
+        if order_type == 'hold':
+            continue
+        if order_type not in ORDER_SIGNS:
+            raise ValueError(f"Unknown order type {order_type!r} for {action['symbol']}")
+        net[action['symbol']] = net.get(action['symbol'], 0.0) + ORDER_SIGNS[order_type] * float(action['quantity'])
+    return [
+        {'symbol': symbol, 'quantity': abs(quantity), 'order_type': 'buy' if quantity > 0 else 'sell'}
+        for symbol, quantity in net.items() if abs(quantity) > _QUANTITY_EPSILON
+    ]
+
+
+class OrderAck(NamedTuple):
+    symbol: str
+    quantity: float
+    order_type: str
+    accepted: bool
+    # Whatever place_order returned (e.g. the broker's order), or None when rejected
+    response: Any
+    error: Optional[str]
+    # Seconds spent in place_order, excluding the wait for a rate-limit token
+    latency: float
+
+
+class ExecutionReport(NamedTuple):
+    acks: List[OrderAck]
+    elapsed: float
+
+    @property
+    def accepted(self) -> List[OrderAck]:
+        return [ack for ack in self.acks if ack.accepted]
+
+    @property
+    def rejected(self) -> List[OrderAck]:
+        return [ack for ack in self.acks if not ack.accepted]
+
+    def latency(self) -> dict:
+        return latency_percentiles([ack.latency for ack in self.acks])
+
+
+class OrderExecutor:
+    """
+    Submit a decision's orders to an AccountManager concurrently.
+
+    Orders are netted per symbol, then sent from a thread pool of at most
+    `order_max_concurrency` threads through a shared rate limiter
+    (`order_requests_per_second`). Acknowledgements are recorded as each order
+    completes, in completion order, and a failed order becomes a rejected ack
+    instead of aborting the batch. With `order_sells_first`, sells are
+    acknowledged before any buy is sent so their proceeds can fund the buys.
+    """
+
+    def __init__(self, config, account_manager, rate_limiter=None):
+        self.config = config
+        self.account_manager = account_manager
+        self.max_concurrency = int(config.get('order_max_concurrency', 8))
+        self.sells_first = bool(config.get('order_sells_first', True))
+        self.rate_limiter = rate_limiter or RateLimiter(float(config.get('order_requests_per_second', 3)))
+
+    def _place(self, order) -> OrderAck:
+        self.rate_limiter.acquire()
+        start = time.perf_counter()
+        try:
+            response = self.account_manager.place_order(order['symbol'], order['quantity'], order['order_type'])
+            accepted, error = True, None
+        except Exception as e:
+            response, error, accepted = None, f'{type(e).__name__}: {e}', False
+        return OrderAck(order['symbol'], order['quantity'], order['order_type'], accepted, response, error,
+                        time.perf_counter() - start)
+
+    def _acknowledge(self, ack: OrderAck, acks: list):
+        acks.append(ack)
+        if ack.accepted:
+            logging.debug(f"Order acknowledged: {ack.order_type} {ack.quantity} {ack.symbol} "
+                          f"in {ack.latency * 1000:.1f}ms")
+        else:
+            logging.error(f"Order rejected: {ack.order_type} {ack.quantity} {ack.symbol}: {ack.error}")
+
+    def execute(self, decision) -> ExecutionReport:
+        """
+        Net the decision and submit the resulting orders.
+        :param decision: List of {'symbol', 'quantity', 'order_type'} actions
+        :return: ExecutionReport with one ack per submitted order
+        """
+        start = time.perf_counter()
+        orders = net_orders(decision)
+        acks = []
+        if not orders:
+            return ExecutionReport(acks, time.perf_counter() - start)
+
+        sells = [order for order in orders if order['order_type'] == 'sell']
+        buys = [order for order in orders if order['order_type'] == 'buy']
+        waves = [sells, buys] if self.sells_first else [sells + buys]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(orders))) as pool:
+            for wave in waves:
+                futures = [pool.submit(self._place, order) for order in wave]
+                for future in as_completed(futures):
+                    self._acknowledge(future.result(), acks)
+
+        report = ExecutionReport(acks, time.perf_counter() - start)
+        latency = report.latency()
+        logging.info(f"Executed {len(orders)} orders netted from {len(decision)} actions in "
+                     f"{report.elapsed * 1000:.1f}ms: {len(report.accepted)} accepted, "
+                     f"{len(report.rejected)} rejected, submission p50 {latency['p50'] * 1000:.1f}ms "
+                     f"p99 {latency['p99'] * 1000:.1f}ms")
+        return report
@@ -1,21 +1,19 @@
-import logging
+from decision_engine.execution import ExecutionReport, OrderExecutor
 
 
 class PortfolioManager:
-    def __init__(self, config, account_manager):
+    def __init__(self, config, account_manager, executor=None):
         self.config = config
         self.account_manager = account_manager
+        self.executor = executor or OrderExecutor(config, account_manager)
 
-    def rebalance_portfolio(self, decision):
+    def rebalance_portfolio(self, decision) -> ExecutionReport:
         """
-        Rebalance the portfolio based on the trading decision.
+        Rebalance the portfolio based on the trading decision: orders are netted
+        per symbol and submitted concurrently by the OrderExecutor.
+        :return: ExecutionReport with the acknowledgement of every order
         """
-        for action in decision:
-            symbol = action['symbol']
-            quantity = action['quantity']
-            order_type = action['order_type']
-            self.account_manager.place_order(symbol, quantity, order_type)
-        logging.info(f"Rebalanced portfolio based on decision: {decision}")
+        return self.executor.execute(decision)
 
     def get_holdings(self):
         """
@@ -1,6 +1,11 @@
+import numpy as np
+
+
 class RiskManager:
     def __init__(self, config):
         self.config = config
+        self.max_position_weight = float(config.get('max_position_weight', 0.1))
+        self.max_gross_exposure = float(config.get('max_gross_exposure', 1.0))
 
     def assess_risk(self, current_holdings, market_data):
         """
@@ -9,3 +14,18 @@ class RiskManager:
         # Placeholder for actual risk assessment logic
         risk_level = 0.1  # Example risk level
         return risk_level
+
+    def apply_limits(self, target_weights) -> np.ndarray:
+        """
+        Cap target portfolio weights: each position to +/- max_position_weight of
+        equity, then all positions scaled down together if their gross exposure
+        exceeds max_gross_exposure.
+        :param target_weights: Array of target weights (position value / equity), one per symbol
+        :return: Capped weights, same shape
+        """
+        weights = np.clip(np.nan_to_num(np.asarray(target_weights, dtype=float)),
+                          -self.max_position_weight, self.max_position_weight)
+        gross = np.abs(weights).sum()
+        if gross > self.max_gross_exposure:
+            weights *= self.max_gross_exposure / gross
+        return weights
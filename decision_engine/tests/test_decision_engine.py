@@ -0,0 +1,84 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from decision_engine.decision_maker import BUY, HOLD, SELL, DecisionMaker
+from decision_engine.risk_manager import RiskManager
+
+CONFIG = {'sentiment_weight': 0.5, 'technical_weight': 0.5, 'buy_threshold': 20, 'sell_threshold': -20,
+          'max_position_weight': 0.5, 'max_gross_exposure': 1.0}
+
+
+def make_decision_maker(**overrides):
+    config = dict(CONFIG, **overrides)
+    return DecisionMaker(config, RiskManager(config), None)
+
+
+def test_risk_limits_cap_positions_then_gross_exposure():
+    risk_manager = RiskManager({'max_position_weight': 0.4, 'max_gross_exposure': 1.0})
+    np.testing.assert_allclose(risk_manager.apply_limits([0.6, 0.2, -0.7, np.nan]), [0.4, 0.2, -0.4, 0.0])
+    np.testing.assert_allclose(risk_manager.apply_limits([0.4, 0.4, 0.4, 0.4]), [0.25, 0.25, 0.25, 0.25])
+
+
+def test_plan_sizes_buys_by_conviction_and_keeps_holds():
+    decision_maker = make_decision_maker()
+    sentiment = pd.Series({'AAA': 60, 'BBB': 20, 'CCC': 0, 'DDD': -80})
+    technical = pd.Series({'AAA': 60, 'BBB': 20, 'CCC': 0, 'DDD': 0})
+    prices = {'AAA': 10.0, 'BBB': 20.0, 'CCC': 50.0, 'DDD': 5.0}
+    plan = decision_maker.plan_positions(sentiment, technical, {'CCC': 40, 'DDD': 100}, prices, balance=7500)
+
+    assert list(plan['signal']) == [BUY, BUY, HOLD, SELL]
+    # Equity 10000; the hold keeps 20%, the buys split the remaining 80% as 60:20 and AAA is capped at 50%
+    np.testing.assert_allclose(plan['target_weight'], [0.5, 0.2, 0.2, 0.0])
+    np.testing.assert_array_equal(plan['target_quantity'], [500, 100, 40, 0])
+
+
+def test_make_decisions_returns_minimal_orders():
+    decision_maker = make_decision_maker(min_order_value=50, max_position_weight=0.25)
+    orders = decision_maker.make_decisions(
+        {'AAA': 60, 'BBB': 0, 'CCC': -80, 'DDD': 60}, {'AAA': 60, 'BBB': 0, 'CCC': 0, 'DDD': 60},
+        {'AAA': 249, 'BBB': 10, 'CCC': 20}, {'AAA': 10.0, 'BBB': 30.0, 'CCC': 5.0, 'DDD': 10.0}, balance=7110)
+    # Equity 10000: both buys are capped at 25% (250 shares). AAA is one share (10.0) short of that,
+    # below min_order_value, and the BBB hold needs no order
+    assert orders == [{'symbol': 'CCC', 'quantity': 20.0, 'order_type': 'sell'},
+                      {'symbol': 'DDD', 'quantity': 250.0, 'order_type': 'buy'}]
+
+
+def test_make_decision_sizes_a_single_symbol_against_the_balance():
+    decision_maker = make_decision_maker(max_position_weight=0.5)
+    assert decision_maker.make_decision(60, 60, {}, 'AAA', 10.0, balance=1000) == [
+        {'symbol': 'AAA', 'quantity': 50.0, 'order_type': 'buy'}]
+    with pytest.raises(TypeError):
+        decision_maker.make_decision(60, 60, {}, 'AAA', 10.0)
+
+
+def test_risk_caps_trim_overweight_holds_and_unpriced_symbols_are_left_alone():
+    decision_maker = make_decision_maker(max_position_weight=0.25)
+    orders = decision_maker.make_decisions({'AAA': 0, 'ZZZ': 0}, {'AAA': 0, 'ZZZ': 0}, {'AAA': 50, 'ZZZ': 7},
+                                           {'AAA': 10.0}, balance=500)
+    assert orders == [{'symbol': 'AAA', 'quantity': 25.0, 'order_type': 'sell'}]
+
+
+def test_array_inputs_and_fractional_shares():
+    decision_maker = make_decision_maker(allow_fractional_shares=True)
+    plan = decision_maker.plan_positions(np.array([100.0, 0.0]), np.array([100.0, 0.0]), {}, np.array([3.0, 1.0]),
+                                         balance=1000, symbols=['AAA', 'BBB'])
+    assert plan.loc['AAA', 'target_quantity'] == pytest.approx(500 / 3)
+    with pytest.raises(ValueError):
+        decision_maker.plan_positions(np.array([1.0]), np.array([1.0]), {}, np.array([1.0]), balance=1000)
+
+
+def test_thousands_of_symbols_per_tick():
+    rng = np.random.default_rng(0)
+    symbols = [f'S{i}' for i in range(5000)]
+    decision_maker = make_decision_maker(max_position_weight=0.01)
+    holdings = dict(zip(symbols[::3], rng.integers(1, 100, len(symbols[::3])).astype(float)))
+    args = (rng.uniform(-100, 100, 5000), rng.uniform(-100, 100, 5000), holdings, rng.uniform(5, 500, 5000))
+
+    decision_maker.make_decisions(*args, balance=1e6, symbols=symbols)
+    start = time.perf_counter()
+    orders = decision_maker.make_decisions(*args, balance=1e6, symbols=symbols)
+    elapsed = time.perf_counter() - start
+    assert orders and elapsed < 0.5
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from data_handling.simulated_broker import OrderRejected, SimulatedBroker
+from decision_engine.execution import OrderExecutor, net_orders
+from decision_engine.portfolio_manager import PortfolioManager
+from utils.rate_limiter import RateLimiter
+
+CONFIG = {'order_max_concurrency': 4, 'order_requests_per_second': 1000, 'order_sells_first': True}
+
+
+def test_net_orders_offsets_per_symbol_and_drops_holds():
+    decision = [
+        {'symbol': 'AAA', 'quantity': 10, 'order_type': 'buy'},
+        {'symbol': 'BBB', 'quantity': 5, 'order_type': 'hold'},
+        {'symbol': 'CCC', 'quantity': 3, 'order_type': 'sell'},
+        {'symbol': 'AAA', 'quantity': 4, 'order_type': 'sell'},
+        {'symbol': 'CCC', 'quantity': 3, 'order_type': 'buy'},
+        {'symbol': 'DDD', 'quantity': 0, 'order_type': 'buy'},
+        {'symbol': 'EEE', 'quantity': 2, 'order_type': 'sell'},
+    ]
+    assert net_orders(decision) == [{'symbol': 'AAA', 'quantity': 6.0, 'order_type': 'buy'},
+                                    {'symbol': 'EEE', 'quantity': 2.0, 'order_type': 'sell'}]
+    with pytest.raises(ValueError):
+        net_orders([{'symbol': 'AAA', 'quantity': 1, 'order_type': 'short'}])
+
+
+def test_simulated_broker_fills_and_rejects():
+    broker = SimulatedBroker({}, holdings={'AAA': 5}, balance=100, prices={'AAA': 10.0})
+    order = broker.place_order('AAA', 5, 'sell')
+    assert order['status'] == 'filled' and order['filled_avg_price'] == 10.0
+    assert broker.get_holdings() == {'holdings': {}, 'balance': 150.0}
+    for args in [('AAA', 16, 'buy'), ('AAA', 1, 'sell'), ('ZZZ', 1, 'buy')]:
+        with pytest.raises(OrderRejected):
+            broker.place_order(*args)
+
+
+def test_rebalance_submits_concurrently_with_bounded_parallelism():
+    symbols = [f'S{i}' for i in range(20)]
+    broker = SimulatedBroker({}, holdings={'S0': 10}, balance=1000, prices=dict.fromkeys(symbols, 1.0), latency=0.05)
+    decision = [{'symbol': symbol, 'quantity': 10, 'order_type': 'buy'} for symbol in symbols[1:]]
+    decision.append({'symbol': 'S0', 'quantity': 10, 'order_type': 'sell'})
+
+    start = time.perf_counter()
+    report = PortfolioManager(CONFIG, broker).rebalance_portfolio(decision)
+    elapsed = time.perf_counter() - start
+
+    # One sell wave, then 19 buys four at a time: 1 + 5 round trips instead of 20
+    assert len(report.accepted) == 20 and not report.rejected
+    assert broker.max_in_flight == 4
+    assert elapsed < 0.05 * 12
+    assert report.acks[0].symbol == 'S0'
+    assert report.latency()['count'] == 20 and report.latency()['p50'] >= 0.05
+    assert broker.get_holdings()['holdings'] == dict.fromkeys(symbols[1:], 10.0)
+
+
+def test_sells_first_funds_buys_and_rejections_do_not_abort_the_batch():
+    decision = [{'symbol': 'AAA', 'quantity': 10, 'order_type': 'buy'},
+                {'symbol': 'ZZZ', 'quantity': 1, 'order_type': 'buy'},
+                {'symbol': 'BBB', 'quantity': 10, 'order_type': 'sell'}]
+    broker = SimulatedBroker({}, holdings={'BBB': 10}, balance=0, prices={'AAA': 10.0, 'BBB': 10.0}, latency=0.01)
+    report = OrderExecutor(CONFIG, broker).execute(decision)
+
+    assert {ack.symbol for ack in report.accepted} == {'AAA', 'BBB'}
+    [rejected] = report.rejected
+    assert rejected.symbol == 'ZZZ' and 'No price' in rejected.error
+    assert broker.get_holdings() == {'holdings': {'AAA': 10.0}, 'balance': 0.0}
+
+
+def test_rate_limiter_spaces_submissions():
+    broker = SimulatedBroker({}, balance=100, prices={f'S{i}': 1.0 for i in range(6)})
+    executor = OrderExecutor(CONFIG, broker, rate_limiter=RateLimiter(20, burst=2))
+    start = time.perf_counter()
+    report = executor.execute([{'symbol': f'S{i}', 'quantity': 1, 'order_type': 'buy'} for i in range(6)])
+    # Two orders go straight out, the other four at 20 per second
+    assert len(report.accepted) == 6
+    assert 0.18 <= time.perf_counter() - start < 0.5
@@ -1,34 +1,87 @@
 import argparse
 import logging
+import os
 import sys
 import pandas as pd
-import schedule
 import time
 import signal
 import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from config.settings import load_configurations
 from sentiment_analysis.services.company_news_service import CompanyNewsService
-from utils.logger import initialize_logging
+from utils.logger import SampledLog, initialize_logging, summarize_frame
 from data_handling.data_fetcher import DataFetcher
 from data_handling.data_processor import DataProcessor
+from data_handling.connection_pool import close_all_pools
 from sentiment_analysis.sentiment_analyzer import SentimentAnalyzer
 from technical_analysis.technical_analyzer import TechnicalAnalyzer
 from technical_analysis.technical_analyzer import SMATechnicalAnalyzer
+from technical_analysis.technical_analyzer import IncrementalSMAAnalyzer
 from decision_engine.decision_maker import DecisionMaker
 from data_handling.account_manager import AccountManager
 from decision_engine.portfolio_manager import PortfolioManager
 from decision_engine.risk_manager import RiskManager
+from utils.helpers import timed_stage
+from utils.startup_profile import format_import_report, profile_imports
+
+# Per-process components, built once by init_worker and reused for every symbol
+_worker_components = {}
+
+# Resident service started with --serve
+_service = None
+
+# Per-bar messages of the streaming analyzers, one in every 100 per symbol
+_bar_log = SampledLog(every=100)
 
 
 def parse_input_arguments():
     parser = argparse.ArgumentParser(description='Algorithmic Trading Application')
-    parser.add_argument('symbol', type=str, help='Trading symbol (e.g., AAPL for stocks, BTC for crypto)')
+    parser.add_argument('symbol', type=str, nargs='?',
+                        help='Trading symbol (e.g., AAPL for stocks, BTC for crypto)')
     parser.add_argument('asset_type', type=str, choices=['stock', 'crypto'], help='Type of asset (stock or crypto)')
     parser.add_argument('start_date', type=str, help='Start date for data retrieval (YYYY-MM-DD)')
-    parser.add_argument('end_date', type=str, help='End date for data retrieval (YYYY-MM-DD)')
+    parser.add_argument('end_date', type=str, help="End date for data retrieval (YYYY-MM-DD or 'today')")
+    parser.add_argument('--symbols', type=str, nargs='+', default=[], help='Additional trading symbols')
+    parser.add_argument('--universe-file', type=str, help='File with one trading symbol per line')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes for per-symbol pipelines')
+    parser.add_argument('--serve', action='store_true', help='Keep components warm and rerun on a schedule')
+    parser.add_argument('--interval', type=int, default=60, help='Seconds between runs in --serve mode')
+    parser.add_argument('--profile-startup', type=int, nargs='?', const=15, metavar='TOP',
+                        help='Report import times of a cold start (like python -X importtime) and exit')
     args = parser.parse_args()
-    return args.symbol, args.asset_type, args.start_date, args.end_date
+    args.symbols = resolve_symbols(args)
+    if not args.symbols:
+        parser.error('a symbol, --symbols or --universe-file is required')
+    return args
+
+
+def resolve_symbols(args):
+    """
+    Merge the positional symbol, --symbols and --universe-file into one ordered, de-duplicated list.
+    """
+    symbols = ([args.symbol] if args.symbol else []) + args.symbols
+    if args.universe_file:
+        with open(args.universe_file, 'r') as universe_file:
+            symbols += [line.split('#')[0].strip() for line in universe_file]
+    return list(dict.fromkeys(symbol for symbol in symbols if symbol))
+
+
+def parse_date(value):
+    """
+    Parse a YYYY-MM-DD date; 'today' resolves to the current date at call time.
+    """
+    if value == 'today':
+        return datetime.date.today()
+    return datetime.datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def profile_startup(top=15):
+    """
+    Import this module in a fresh interpreter with -X importtime and print where the startup time goes.
+    """
+    timings, wall = profile_imports('main', cwd=os.path.dirname(os.path.abspath(__file__)))
+    print(format_import_report(timings, 'main', wall, top))
 
 
 def handle_exceptions(exc_type, exc_value, exc_traceback):
@@ -47,9 +100,16 @@ def job():
         shutdown_procedure()
 
 
+def service_job():
+    try:
+        _service.tick()
+    except Exception as e:
+        logging.error(f"Error during service tick: {e}", exc_info=True)
+
+
 def shutdown_procedure():
     logging.info('Shutting down application...')
-    # Add any cleanup code here
+    close_all_pools()
 
 
 def signal_handler(sig, frame):
@@ -58,15 +118,189 @@ def signal_handler(sig, frame):
     sys.exit(0)
 
 
+def init_worker(config):
+    """
+    Open the database connections and API clients of the current process once.
+    """
+    _worker_components['data_fetcher'] = DataFetcher(config)
+    _worker_components['data_processor'] = DataProcessor(config)
+
+
+def run_symbol_pipeline(symbol, asset_type, start_date, end_date, keep_analyzer=False):
+    """
+    Fetch, process and analyze one symbol with the components of the current process.
+    :param keep_analyzer: Include the SMATechnicalAnalyzer in the result (in-process runs only)
+    :return: Dictionary with the technical scores and per-stage timings
+    """
+    data_fetcher = _worker_components['data_fetcher']
+    data_processor = _worker_components['data_processor']
+    timings = {}
+
+    # Retrieve market data as one columnar frame, sorted by timestamp
+    with timed_stage(timings, 'fetch'):
+        combined_data = data_fetcher.fetch_ticker_data(symbol, asset_type, start_date, end_date)
+
+    # Process new data fetched from the API
+    with timed_stage(timings, 'process'):
+        api_data = combined_data[combined_data['source'] == 'api']
+        if not api_data.empty:
+            processed_api_data = data_processor.process_ticker_data(api_data, symbol, asset_type)
+            logging.info('Processed new ticker data for %s: %s', symbol, summarize_frame(processed_api_data))
+
+    with timed_stage(timings, 'analyze'):
+        # Analyze the fetched frame in place instead of re-reading close prices from the database
+        technical_analyzer = SMATechnicalAnalyzer(df=combined_data, trend_window=5, sma_windows=[10, 50], copy=False)
+
+        # Run Analysis
+        technical_scores = technical_analyzer.run_analysis()
+
+    result = {'symbol': symbol, 'pid': os.getpid(), 'technical_scores': technical_scores, 'timings': timings}
+    if keep_analyzer:
+        result['analyzer'] = technical_analyzer
+    return result
+
+
+def run_pipelines(config, symbols, asset_type, start_date, end_date, workers=1):
+    """
+    Run the per-symbol pipelines, fanned out over a process pool when workers > 1.
+    :return: List of pipeline results for the symbols that succeeded
+    """
+    results = []
+    if workers > 1 and len(symbols) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(config,)) as executor:
+            futures = {
+                executor.submit(run_symbol_pipeline, symbol, asset_type, start_date, end_date): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logging.error(f'Pipeline failed for {futures[future]}: {e}', exc_info=True)
+        results.sort(key=lambda result: symbols.index(result['symbol']))
+    else:
+        if not _worker_components:
+            init_worker(config)
+        for symbol in symbols:
+            try:
+                results.append(run_symbol_pipeline(symbol, asset_type, start_date, end_date))
+            except Exception as e:
+                logging.error(f'Pipeline failed for {symbol}: {e}', exc_info=True)
+    return results
+
+
+def log_run_summary(results):
+    """
+    Log per-stage timing totals for each worker process.
+    """
+    per_worker = {}
+    for result in results:
+        worker = per_worker.setdefault(result['pid'], {'symbols': 0, 'timings': {}})
+        worker['symbols'] += 1
+        for stage, seconds in result['timings'].items():
+            worker['timings'][stage] = worker['timings'].get(stage, 0.0) + seconds
+
+    for pid, worker in sorted(per_worker.items()):
+        stages = ', '.join(f'{stage}={seconds:.3f}s' for stage, seconds in worker['timings'].items())
+        logging.info(f"Worker {pid}: {worker['symbols']} symbols, {stages}")
+
+
+class TradingService:
+    """
+    Resident mode: configuration, database connections and API clients are built
+    once and kept warm across schedule ticks. The first tick analyzes the full
+    history of each symbol; later ticks fetch the last bar seen again (it may
+    still have been forming) plus any newer bars and feed them to an
+    IncrementalSMAAnalyzer.
+    """
+
+    def __init__(self, args):
+        self.args = args
+        self.config = load_configurations()
+        init_worker(self.config)
+        self.data_fetcher = _worker_components['data_fetcher']
+        self.data_processor = _worker_components['data_processor']
+        self.data_processor.create_table()
+        self.technical_analyzer = TechnicalAnalyzer(self.config)
+        self.news_service = CompanyNewsService(self.config)
+        self.risk_manager = RiskManager(self.config)
+        self.account_manager = AccountManager(self.config)
+        self.portfolio_manager = PortfolioManager(self.config, self.account_manager)
+        self.decision_maker = DecisionMaker(self.config, self.risk_manager, self.portfolio_manager)
+        # symbol -> {'analyzer': IncrementalSMAAnalyzer, 'last_date': datetime.date}
+        self.streams = {}
+        logging.info(f'Trading service started for {len(args.symbols)} symbols')
+
+    def tick(self):
+        """
+        Run one scheduled iteration over all symbols.
+        :return: Dictionary of symbol -> technical scores
+        """
+        start_date = parse_date(self.args.start_date)
+        end_date = parse_date(self.args.end_date)
+
+        results = []
+        for symbol in self.args.symbols:
+            try:
+                if symbol in self.streams:
+                    results.append(self.update_symbol(symbol, end_date))
+                else:
+                    results.append(self.warm_symbol(symbol, start_date, end_date))
+            except Exception as e:
+                logging.error(f'Pipeline failed for {symbol}: {e}', exc_info=True)
+        log_run_summary(results)
+        technical_scores = {result['symbol']: result['technical_scores'] for result in results}
+        logging.info(f'Technical scores: {technical_scores}')
+        return technical_scores
+
+    def warm_symbol(self, symbol, start_date, end_date):
+        """
+        Run the full pipeline once and keep an incremental analyzer for later ticks.
+        """
+        result = run_symbol_pipeline(symbol, self.args.asset_type, start_date, end_date, keep_analyzer=True)
+        analyzer = result.pop('analyzer')
+        last_date = analyzer.df['timestamp'].iloc[-1].date() if not analyzer.df.empty else start_date
+        self.streams[symbol] = {'analyzer': IncrementalSMAAnalyzer.from_analyzer(analyzer), 'last_date': last_date}
+        return result
+
+    def update_symbol(self, symbol, end_date):
+        """
+        Fetch the last bar seen and the bars after it, and update the streaming
+        analyzer. The last bar replaces its earlier, possibly partial, version.
+        """
+        stream = self.streams[symbol]
+        analyzer = stream['analyzer']
+        last_date = stream['last_date']
+        timings = {}
+        if last_date <= end_date:
+            with timed_stage(timings, 'fetch'):
+                new_bars = self.data_fetcher.fetch_ticker_data(symbol, self.args.asset_type, last_date, end_date)
+            with timed_stage(timings, 'analyze'):
+                for bar in new_bars.to_dict('records'):
+                    bar_date = pd.Timestamp(bar['timestamp']).date()
+                    if bar_date == last_date:
+                        analyzer.update_last(bar)
+                    else:
+                        analyzer.update(bar)
+                    stream['last_date'] = bar_date
+                    _bar_log.debug(symbol, 'Streamed bar %s for %s: %s', stream['last_date'], symbol, analyzer.scores)
+        return {'symbol': symbol, 'pid': os.getpid(), 'technical_scores': dict(analyzer.scores), 'timings': timings}
+
+
+def start_service(args):
+    global _service
+    _service = TradingService(args)
+    return _service
+
+
 def main():
     # Initialization
     sys.excepthook = handle_exceptions
     config = load_configurations()
-    symbol, asset_type, start_date, end_date = parse_input_arguments()
+    args = parse_input_arguments()
     logging.info('Starting Algorithmic Trading Application')
 
     # Initialize components
-    data_fetcher = DataFetcher(config)
     data_processor = DataProcessor(config)
     data_processor.create_table()
     technical_analyzer = TechnicalAnalyzer(config)
@@ -82,35 +316,18 @@ def main():
     decision_maker = DecisionMaker(config, risk_manager, portfolio_manager)
 
     # Convert start_date and end_date to datetime.date objects
-    start_date = datetime.datetime.strptime(start_date, '%Y-%m-%d').date()
-    end_date = datetime.datetime.strptime(end_date, '%Y-%m-%d').date()
-
-    # Retrieve market data
-    combined_data = data_fetcher.fetch_ticker_data(symbol, asset_type, start_date, end_date)
-
-    # Separate data retrieved from the database and new data fetched from the API
-    db_data = [data for data in combined_data if 'source' in data and data['source'] == 'db']
-    api_data = [data for data in combined_data if 'source' in data and data['source'] == 'api']
-
-    # Process new data fetched from the API
-    if api_data:
-        processed_api_data = data_processor.process_ticker_data(api_data, symbol, asset_type)
-        logging.info(f'Processed new ticker data: {processed_api_data}')
+    start_date = parse_date(args.start_date)
+    end_date = parse_date(args.end_date)
 
-    # Combine processed API data with DB data for analysis
-    processed_ticker_data = db_data + processed_api_data if api_data else db_data
+    # Fill missing history for the whole universe with batched requests before the per-symbol pipelines
+    if len(args.symbols) > 1:
+        DataFetcher(config).backfill_ticker_data(args.symbols, args.asset_type, start_date, end_date)
 
-    close_prices_df = data_fetcher.fetch_close_prices(symbol, start_date, end_date)
-
-    # Ensure 'timestamp' is datetime and sort ascending
-    close_prices_df['timestamp'] = pd.to_datetime(close_prices_df['timestamp'])
-    df_merged = close_prices_df.sort_values('timestamp', ascending=True).reset_index(drop=True)
-
-    # Initialize Technical Analyzer
-    technical_analyzer = SMATechnicalAnalyzer(df=df_merged, trend_window=5, sma_windows=[10, 50])
-
-    # Run Analysis
-    technical_scores = technical_analyzer.run_analysis()
+    # Fetch, process and analyze every symbol, then gather the results for a single decision step
+    results = run_pipelines(config, args.symbols, args.asset_type, start_date, end_date, args.workers)
+    log_run_summary(results)
+    technical_scores = {result['symbol']: result['technical_scores'] for result in results}
+    logging.info(f'Technical scores: {technical_scores}')
 
     # Perform technical analysis
     # sma10_data = data_fetcher.fetch_technical_analysis_data(symbol, 'sma', '10')
@@ -184,7 +401,7 @@ def main():
     # logging.info(f'Current balance: {balance}')
 
     # Make trading decision
-    # decision = decision_maker.make_decision(sentiment_score, technical_signal, current_holdings)
+    # decision = decision_maker.make_decision(sentiment_score, technical_signal, current_holdings, symbol, price, balance)
 
     # logging.info(f'Trading decision: {decision}')
 
@@ -193,17 +410,37 @@ def main():
 
 
 if __name__ == '__main__':
+    # Checked before the full parser, which requires the positional arguments
+    startup_parser = argparse.ArgumentParser(add_help=False)
+    startup_parser.add_argument('--profile-startup', type=int, nargs='?', const=15)
+    startup_args, _ = startup_parser.parse_known_args()
+    if startup_args.profile_startup is not None:
+        profile_startup(startup_args.profile_startup)
+        sys.exit(0)
+
+    # Only the scheduler loop below needs schedule
+    import schedule
+
     initialize_logging()
 
     # Handle signals for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
 
-    # Run the job immediately before starting the schedule loop
-    job()
+    args = parse_input_arguments()
+    if args.serve:
+        sys.excepthook = handle_exceptions
+        start_service(args)
 
-    # Schedule the job
-    # schedule.every().minute.do(job)
+        # Run the job immediately, then keep the warm service ticking on the schedule
+        service_job()
+        schedule.every(args.interval).seconds.do(service_job)
+    else:
+        # Run the job immediately before starting the schedule loop
+        job()
+
+        # Schedule the job
+        # schedule.every().minute.do(job)
 
     try:
         while True:
@@ -211,5 +448,6 @@ if __name__ == '__main__':
             time.sleep(1)
     except KeyboardInterrupt:
         logging.info("Application interrupted by user. Exiting gracefully...")
+        shutdown_procedure()
         sys.exit(0)
     main()
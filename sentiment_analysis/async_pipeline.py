@@ -0,0 +1,141 @@
+import asyncio
+import datetime
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+from sentiment_analysis.sentiment_analyzer import SentimentAnalyzer
+from sentiment_analysis.services.company_news_service import CompanyNewsService
+from utils.helpers import latency_percentiles
+from utils.llm_cache import get_llm_cache
+from utils.rate_limiter import AsyncRateLimiter
+
+
+class _Endpoint:
+    """
+    One remote API with its own concurrency bound, rate limit and latency samples.
+    Created inside the running event loop, since asyncio primitives are bound to it.
+    """
+
+    def __init__(self, name, client, max_concurrency, requests_per_second, latencies):
+        self.name = name
+        self.client = client
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.limiter = AsyncRateLimiter(requests_per_second)
+        self.latencies = latencies
+
+    async def complete(self, model, messages) -> str:
+        async with self.semaphore:
+            await self.limiter.acquire()
+            start = time.perf_counter()
+            try:
+                completion = await self.client.chat.completions.create(model=model, messages=messages)
+            finally:
+                self.latencies.append(time.perf_counter() - start)
+        return completion.choices[0].message.content
+
+
+class AsyncSentimentPipeline:
+    """
+    Fetch company news and score its sentiment for many tickers concurrently.
+
+    Every ticker runs as its own task, so its news is handed to scoring as soon
+    as it arrives instead of waiting for the whole universe. Perplexity (news)
+    and OpenAI (scoring) calls have separate concurrency bounds and rate limits.
+    Prompts and caching are delegated to CompanyNewsService and SentimentAnalyzer.
+    """
+
+    def __init__(self, config, news_client=None, sentiment_client=None, cache=None):
+        self.config = config
+        self.news_client = news_client
+        self.sentiment_client = sentiment_client
+        self.cache = cache if cache is not None else get_llm_cache(config)
+        # Prompt building and caching policy are shared with the synchronous services
+        self.news_service = CompanyNewsService(config, client=news_client, cache=self.cache)
+        self.sentiment_analyzer = SentimentAnalyzer(config, client=sentiment_client, cache=self.cache)
+        self.latencies = {'news': [], 'sentiment': []}
+
+    def _make_clients(self):
+        # Default clients are created per run: httpx connections cannot outlive their event loop
+        from openai import AsyncOpenAI
+
+        news_client = self.news_client or AsyncOpenAI(api_key=self.config['pplx_api_key'],
+                                                      base_url="https://api.perplexity.ai")
+        sentiment_client = self.sentiment_client or AsyncOpenAI()
+        return news_client, sentiment_client
+
+    async def get_company_news(self, endpoint: _Endpoint, current_date: datetime.date, ticker: str) -> Optional[dict]:
+        # SQLite cache reads and writes run in worker threads so they never block the event loop
+        service = self.news_service
+        news = await asyncio.to_thread(service.cached_news, current_date, ticker)
+        if news is not None:
+            return news
+        response = await endpoint.complete(service.model, service.build_messages(current_date, ticker))
+        return await asyncio.to_thread(service.store_news, current_date, ticker, response)
+
+    async def score_sentiment(self, endpoint: _Endpoint, news) -> Optional[float]:
+        analyzer = self.sentiment_analyzer
+        messages = analyzer.build_messages(news)
+        score = await asyncio.to_thread(analyzer.cached_score, messages)
+        if score is not None:
+            return score
+        score = float(await endpoint.complete(analyzer.model, messages))
+        await asyncio.to_thread(analyzer.store_score, messages, score)
+        return score
+
+    async def _process_ticker(self, news_endpoint, sentiment_endpoint, current_date, ticker):
+        try:
+            news = await self.get_company_news(news_endpoint, current_date, ticker)
+            if news is None:
+                return ticker, None
+            return ticker, await self.score_sentiment(sentiment_endpoint, news)
+        except Exception as e:
+            logging.error(f"Error in sentiment pipeline for {ticker}: {e}", exc_info=True)
+            return ticker, None
+
+    async def run(self, tickers: List[str], current_date: datetime.date,
+                  on_result: Callable[[str, Optional[float]], None] = None) -> Dict[str, Optional[float]]:
+        """
+        Score every ticker's news for current_date.
+
+        :param on_result: Called with (ticker, score) as soon as each ticker completes
+        :return: Dictionary of ticker -> sentiment score (None when the ticker failed)
+        """
+        news_client, sentiment_client = self._make_clients()
+        news_endpoint = _Endpoint(
+            'news', news_client,
+            int(self.config.get('pplx_max_concurrency', 4)),
+            float(self.config.get('pplx_requests_per_second', 0.8)),
+            self.latencies['news'])
+        sentiment_endpoint = _Endpoint(
+            'sentiment', sentiment_client,
+            int(self.config.get('openai_max_concurrency', 16)),
+            float(self.config.get('openai_requests_per_second', 8)),
+            self.latencies['sentiment'])
+
+        scores = {}
+        start = time.perf_counter()
+        try:
+            tasks = [asyncio.create_task(self._process_ticker(news_endpoint, sentiment_endpoint, current_date, ticker))
+                     for ticker in tickers]
+            for task in asyncio.as_completed(tasks):
+                ticker, score = await task
+                scores[ticker] = score
+                if on_result is not None:
+                    on_result(ticker, score)
+        finally:
+            for client, injected in ((news_client, self.news_client), (sentiment_client, self.sentiment_client)):
+                if injected is None:
+                    await client.close()
+        logging.info(f"Scored sentiment for {len(tickers)} tickers in {time.perf_counter() - start:.2f}s; "
+                      f"latency: {self.latency_report()}")
+        return {ticker: scores[ticker] for ticker in tickers}
+
+    def run_sync(self, tickers: List[str], current_date: datetime.date, on_result=None) -> Dict[str, Optional[float]]:
+        return asyncio.run(self.run(tickers, current_date, on_result))
+
+    def latency_report(self) -> Dict[str, dict]:
+        """
+        Latency percentiles (seconds) of the remote calls made so far, per endpoint.
+        """
+        return {name: latency_percentiles(samples) for name, samples in self.latencies.items()}
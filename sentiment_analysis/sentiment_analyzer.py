@@ -1,32 +1,186 @@
+import datetime
+import json
 import logging
-from openai import OpenAI
+import math
+from typing import Dict, List, Optional
+
+from utils.llm_cache import LLMCache, get_llm_cache
 
 
 class SentimentAnalyzer:
-    def __init__(self, config):
+    def __init__(self, config, client=None, cache=None):
         self.config = config
-        self.client = OpenAI()
+        self._client = client
+        self.cache = cache if cache is not None else get_llm_cache(config)
+        self.model = "gpt-4o-mini"
+        self.batch_size = int(config.get('sentiment_batch_size', 10))
+        self.batch_token_budget = int(config.get('sentiment_batch_token_budget', 6000))
 
-    def analyze(self, news):
-        logging.info(f'Performing sentiment analysis for market data')
+    @property
+    def client(self):
+        # Importing openai is slow; runs that never call the model skip it entirely
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI()
+        return self._client
 
+    def build_messages(self, news):
         prompt = (
             f"{news}\n\n"
             "Based on the above company news and your knowledge about the company, "
             "provide a single sentiment score between -100 and 100. Do not provide any other information, "
             "only return the number."
         )
+        return [
+            {"role": "system", "content": "You are an expert financial analyst."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def cache_key(self, messages):
+        return LLMCache.make_key(self.model, messages, datetime.date.today())
+
+    def cached_score(self, messages) -> Optional[float]:
+        """
+        Cached score for messages, or None on a miss or an unparseable entry (which the next score overwrites).
+        """
+        cached = self.cache.get(self.cache_key(messages)) if self.cache is not None else None
+        try:
+            return float(cached)
+        except (TypeError, ValueError):
+            return None
+
+    def store_score(self, messages, score: float):
+        if self.cache is not None:
+            self.cache.set(self.cache_key(messages), str(score))
+
+    def analyze(self, news):
+        logging.info(f'Performing sentiment analysis for market data')
+        messages = self.build_messages(news)
+
+        def complete():
+            completion = self.client.chat.completions.create(model=self.model, messages=messages)
+            # Parsed before get_or_create stores it, so a non-numeric reply is never cached
+            return str(float(completion.choices[0].message.content))
+
         try:
-            completion = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert financial analyst."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            sentiment_score = float(completion.choices[0].message.content)
+            if self.cache is None:
+                content = complete()
+            else:
+                content = self.cache.get_or_create(self.cache_key(messages), complete)
+            sentiment_score = float(content)
             logging.info(f'Sentiment score: {sentiment_score}')
             return sentiment_score
         except Exception as e:
-            logging.error(f'Error during sentiment analysis: {e}', exec_info=True)
+            logging.error(f'Error during sentiment analysis: {e}', exc_info=True)
             return None
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        # Roughly four characters per token for English text
+        return len(text) // 4 + 1
+
+    def pack_batches(self, news_texts: Dict[str, str], batch_size: int, token_budget: int) -> List[List[str]]:
+        """
+        Group tickers into batches of at most batch_size tickers and token_budget
+        estimated prompt tokens. A ticker whose news alone exceeds the budget gets its own batch.
+        """
+        batches, batch, batch_tokens = [], [], 0
+        for ticker, text in news_texts.items():
+            tokens = self.estimate_tokens(text)
+            if batch and (len(batch) >= batch_size or batch_tokens + tokens > token_budget):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(ticker)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def build_batch_messages(self, news_texts: Dict[str, str]):
+        sections = '\n\n'.join(f"### {ticker}\n{text}" for ticker, text in news_texts.items())
+        prompt = (
+            f"{sections}\n\n"
+            "Based on the above company news per ticker and your knowledge about each company, "
+            "provide a sentiment score between -100 and 100 for every ticker. "
+            f"Return only a JSON object mapping each of these tickers to its score: {json.dumps(list(news_texts))}."
+        )
+        return [
+            {"role": "system", "content": "You are an expert financial analyst."},
+            {"role": "user", "content": prompt}
+        ]
+
+    @staticmethod
+    def parse_batch_scores(content: str, tickers: List[str]) -> Dict[str, float]:
+        """
+        Valid scores from a batch response: numeric, finite and within [-100, 100].
+        Tickers with a missing or malformed entry are left out.
+        """
+        try:
+            mapping = json.loads(content)
+        except (TypeError, json.JSONDecodeError):
+            return {}
+        if not isinstance(mapping, dict):
+            return {}
+        scores = {}
+        for ticker in tickers:
+            value = mapping.get(ticker)
+            if isinstance(value, bool):
+                continue
+            try:
+                score = float(value)
+            except (TypeError, ValueError):
+                continue
+            if math.isfinite(score) and -100 <= score <= 100:
+                scores[ticker] = score
+        return scores
+
+    def analyze_batch(self, news_by_ticker: Dict[str, object], batch_size: int = None,
+                      token_budget: int = None) -> Dict[str, float]:
+        """
+        Score many tickers' news with one completion per batch of tickers.
+
+        Scores are cached under the same keys as analyze(), so cached tickers are
+        not sent again. Tickers missing from, or malformed in, a batch response
+        fall back to an individual analyze() call.
+
+        :param news_by_ticker: Dictionary of ticker -> news (e.g. get_company_news output)
+        :param batch_size: Tickers per request; defaults to config['sentiment_batch_size']
+        :param token_budget: Estimated prompt tokens per request; defaults to config['sentiment_batch_token_budget']
+        :return: Dictionary of ticker -> sentiment score (None if scoring failed)
+        """
+        batch_size = batch_size or self.batch_size
+        token_budget = token_budget or self.batch_token_budget
+        scores = {}
+        pending = {}
+        for ticker, news in news_by_ticker.items():
+            cached = self.cached_score(self.build_messages(news))
+            if cached is not None:
+                scores[ticker] = cached
+            else:
+                pending[ticker] = news if isinstance(news, str) else json.dumps(news, default=str)
+
+        batches = self.pack_batches(pending, batch_size, token_budget)
+        fallbacks = []
+        for batch in batches:
+            try:
+                completion = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self.build_batch_messages({ticker: pending[ticker] for ticker in batch}),
+                    response_format={"type": "json_object"},
+                )
+                batch_scores = self.parse_batch_scores(completion.choices[0].message.content, batch)
+            except Exception as e:
+                logging.error(f'Error during batch sentiment analysis: {e}', exc_info=True)
+                batch_scores = {}
+            for ticker in batch:
+                if ticker not in batch_scores:
+                    fallbacks.append(ticker)
+                    continue
+                scores[ticker] = batch_scores[ticker]
+                self.store_score(self.build_messages(news_by_ticker[ticker]), batch_scores[ticker])
+
+        for ticker in fallbacks:
+            scores[ticker] = self.analyze(news_by_ticker[ticker])
+        logging.info(f'Batch sentiment: {len(news_by_ticker)} tickers, {len(news_by_ticker) - len(pending)} cached, '
+                     f'{len(batches)} batch requests, {len(fallbacks)} per-ticker fallbacks')
+        return {ticker: scores[ticker] for ticker in news_by_ticker}
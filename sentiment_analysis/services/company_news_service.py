@@ -1,20 +1,36 @@
 from datetime import date
 import json
 import logging
-from typing import List, Dict
-from openai import OpenAI
+from typing import List, Dict, Optional
 import os
 
+from utils.llm_cache import LLMCache, get_llm_cache
+
 
 class CompanyNewsService:
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, client=None, cache=None):
         self.config = config
         self.api_key = self.config['pplx_api_key']
-        self.client = OpenAI(api_key=self.api_key,
-                             base_url="https://api.perplexity.ai")
+        self._client = client
+        self.cache = cache if cache is not None else get_llm_cache(config)
+        self.model = "llama-3.1-sonar-small-128k-online"
 
-    def get_company_news(self, current_date: date, company_ticker: str) -> dict:
-        messages = [
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=self.api_key, base_url="https://api.perplexity.ai")
+        return self._client
+
+    def cache_key(self, current_date: date, company_ticker: str) -> str:
+        return LLMCache.make_key('company_news', self.model, company_ticker, current_date)
+
+    def cache_ttl(self, current_date: date):
+        # News of a finished day does not change; today's news is still coming in
+        return None if current_date < date.today() else self.cache.ttl
+
+    def build_messages(self, current_date: date, company_ticker: str) -> List[Dict]:
+        return [
             {
                 "role": "system",
                 "content": (
@@ -33,18 +49,47 @@ class CompanyNewsService:
             },
         ]
 
+    def cached_news(self, current_date: date, company_ticker: str) -> Optional[dict]:
+        """
+        Cached news of (ticker, date), or None on a miss.
+        """
+        if self.cache is None:
+            return None
+        cached = self.cache.get(self.cache_key(current_date, company_ticker))
+        if cached is None:
+            return None
+        logging.info(f"Company news for {company_ticker} on {current_date} served from cache")
+        return json.loads(cached)
+
+    def store_news(self, current_date: date, company_ticker: str, response: str) -> Optional[dict]:
+        """
+        Parse a news response and cache it.
+        :return: The news, or None if the response is not JSON (it is then not cached)
+        """
+        try:
+            response_json = json.loads(response)
+        except json.JSONDecodeError:
+            logging.error(f"Failed to parse company news for {company_ticker} as JSON")
+            return None
+        if self.cache is not None:
+            self.cache.set(self.cache_key(current_date, company_ticker), response, self.cache_ttl(current_date))
+        return response_json
+
+    def get_company_news(self, current_date: date, company_ticker: str) -> dict:
+        # Cached by (ticker, date) so that past days are never refetched
+        cached = self.cached_news(current_date, company_ticker)
+        if cached is not None:
+            return cached
+
         completion = self.client.chat.completions.create(
-            model="llama-3.1-sonar-small-128k-online",
-            messages=messages,
+            model=self.model,
+            messages=self.build_messages(current_date, company_ticker),
         )
         response = completion.choices[0].message.content
 
         logging.info(f"Company news response: {response}")
 
-        # Parse the response to ensure it's in JSON format
-        try:
-            response_json = json.loads(response)
-            return response_json
-        except json.JSONDecodeError:
-            print("Failed to parse response as JSON")
+        response_json = self.store_news(current_date, company_ticker, response)
+        if response_json is None:
             return {"error": "Failed to parse response as JSON", "response": response}
+        return response_json
@@ -0,0 +1,101 @@
+import datetime
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from openai import AsyncOpenAI
+
+from sentiment_analysis.async_pipeline import AsyncSentimentPipeline
+from utils.llm_cache import LLMCache
+
+
+class MockChatHandler(BaseHTTPRequestHandler):
+    """ Chat completions endpoint: /news/... returns news JSON, /sentiment/... a score """
+    lock = threading.Lock()
+    in_flight = {'news': 0, 'sentiment': 0}
+    peak = {'news': 0, 'sentiment': 0}
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        endpoint = self.path.split('/')[1]
+        prompt = body['messages'][-1]['content']
+        with self.lock:
+            self.requests.append(endpoint)
+            self.in_flight[endpoint] += 1
+            self.peak[endpoint] = max(self.peak[endpoint], self.in_flight[endpoint])
+        time.sleep(0.05)
+        if endpoint == 'news':
+            ticker = prompt.split('movement of ')[1].split(' published')[0]
+            content = 'not json' if ticker == 'BAD' else json.dumps({'company': ticker, 'news': []})
+        else:
+            content = str(len(prompt) % 100)
+        with self.lock:
+            self.in_flight[endpoint] -= 1
+        payload = json.dumps({
+            'id': 'mock', 'object': 'chat.completion', 'created': 0, 'model': body['model'],
+            'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2},
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadRecordingCache(LLMCache):
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.current_thread())
+        return super().get(key)
+
+    def set(self, key, value, *args):
+        self.threads.add(threading.current_thread())
+        return super().set(key, value, *args)
+
+
+@pytest.fixture
+def mock_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockChatHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+
+def test_pipeline_scores_concurrently_and_caches(mock_server, tmp_path):
+    config = {'pplx_api_key': 'x', 'pplx_max_concurrency': 2, 'pplx_requests_per_second': 1000,
+              'openai_max_concurrency': 3, 'openai_requests_per_second': 1000}
+    cache = ThreadRecordingCache(str(tmp_path / 'llm.sqlite3'))
+    tickers = [f'T{i}' for i in range(8)] + ['BAD']
+    pipeline = AsyncSentimentPipeline(
+        config, cache=cache,
+        news_client=AsyncOpenAI(api_key='x', base_url=f'{mock_server}/news/v1', max_retries=0),
+        sentiment_client=AsyncOpenAI(api_key='x', base_url=f'{mock_server}/sentiment/v1', max_retries=0))
+    streamed = []
+    scores = pipeline.run_sync(tickers, datetime.date(2024, 1, 2), on_result=lambda *result: streamed.append(result))
+
+    assert list(scores) == tickers
+    assert scores['BAD'] is None
+    assert all(isinstance(scores[ticker], float) for ticker in tickers[:-1])
+    assert sorted(streamed) == sorted(scores.items(), key=lambda item: item[0])
+    assert MockChatHandler.peak['news'] <= 2 and MockChatHandler.peak['sentiment'] <= 3
+    report = pipeline.latency_report()
+    assert report['news']['count'] == 9 and report['sentiment']['count'] == 8
+    assert report['news']['p50'] >= 0.05
+    # Cache lookups never run on the event loop's thread
+    assert cache.threads and threading.main_thread() not in cache.threads
+
+    # A second pass is served from the cache, except for the unparseable news
+    MockChatHandler.requests.clear()
+    assert pipeline.run_sync(tickers, datetime.date(2024, 1, 2)) == scores
+    assert MockChatHandler.requests == ['news']
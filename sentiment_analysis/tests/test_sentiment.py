@@ -0,0 +1,55 @@
+import json
+
+from sentiment_analysis.sentiment_analyzer import SentimentAnalyzer
+from utils.fake_openai import FakeOpenAI
+from utils.llm_cache import LLMCache
+
+
+def batch_responder(model, messages):
+    prompt = messages[-1]['content']
+    tickers = json.loads(prompt.rsplit(': ', 1)[1].rstrip('.')) if 'JSON object' in prompt else None
+    if tickers is None:
+        return '7'
+    # One malformed entry, one out of range and one missing per batch
+    scores = {ticker: i * 10 for i, ticker in enumerate(tickers)}
+    scores.update({'BAD': 'bullish', 'HUGE': 500})
+    scores.pop('GONE', None)
+    return json.dumps(scores)
+
+
+def test_analyze_batch_packs_requests_and_falls_back(tmp_path):
+    client = FakeOpenAI(batch_responder)
+    analyzer = SentimentAnalyzer({'sentiment_batch_size': 4}, client=client,
+                                 cache=LLMCache(str(tmp_path / 'llm.sqlite3')))
+    news = {ticker: {'news': [{'headline': f'{ticker} news'}]} for ticker in ['A', 'B', 'BAD', 'C', 'HUGE', 'GONE']}
+    scores = analyzer.analyze_batch(news)
+
+    assert scores == {'A': 0.0, 'B': 10.0, 'BAD': 7.0, 'C': 30.0, 'HUGE': 7.0, 'GONE': 7.0}
+    # Two batch requests plus three per-ticker fallbacks
+    assert len(client.calls) == 5
+    assert client.calls[0]['response_format'] == {'type': 'json_object'}
+
+    # Everything is cached under the single-call keys now
+    assert analyzer.analyze_batch(news) == scores
+    assert analyzer.analyze(news['C']) == 30.0
+    assert len(client.calls) == 5
+
+
+def test_analyze_batch_treats_unparseable_cache_entries_as_misses(tmp_path):
+    client = FakeOpenAI(batch_responder)
+    analyzer = SentimentAnalyzer({}, client=client, cache=LLMCache(str(tmp_path / 'llm.sqlite3')))
+    news = {'A': 'A news', 'B': 'B news'}
+    analyzer.cache.set(analyzer.cache_key(analyzer.build_messages(news['A'])), 'not a number')
+    analyzer.cache.set(analyzer.cache_key(analyzer.build_messages(news['B'])), '55.0')
+
+    assert analyzer.analyze_batch(news) == {'A': 0.0, 'B': 55.0}
+    assert analyzer.analyze(news['A']) == 0.0
+    assert len(client.calls) == 1
+
+
+def test_pack_batches_respects_token_budget():
+    analyzer = SentimentAnalyzer({}, client=FakeOpenAI(), cache=None)
+    texts = {'A': 'x' * 400, 'B': 'x' * 400, 'C': 'x' * 4000, 'D': 'x' * 40}
+    assert analyzer.pack_batches(texts, batch_size=10, token_budget=250) == [['A', 'B'], ['C'], ['D']]
+    assert analyzer.pack_batches(texts, batch_size=1, token_budget=10_000) == [['A'], ['B'], ['C'], ['D']]
+    assert SentimentAnalyzer.parse_batch_scores('[1, 2]', ['A']) == {}
@@ -0,0 +1,117 @@
+import logging
+import numpy as np
+import pandas as pd
+
+from technical_analysis.utils import rolling_mean, rolling_slope, score_lookup
+
+# analyze_panel puts a symbol in the current chunk while its history fills at
+# least this fraction of the chunk's width, bounding padding to 1 / fill of the rows
+PANEL_CHUNK_FILL = 0.75
+
+
+class BatchSMAAnalyzer:
+    """
+    SMA crossover analysis for many symbols at once.
+
+    Works on a 2-D close array of shape (symbols, time) where each row holds one
+    symbol's bars in time order, right-padded with NaN when histories differ in
+    length. Every indicator is computed with array operations along the time
+    axis, so the cost is linear in the number of cells.
+    """
+
+    def __init__(self, trend_window: int = 5, sma_windows: list = [10, 50], scoring: dict = None):
+        self.trend_window = trend_window
+        self.sma_windows = sma_windows
+        self.scoring = scoring
+
+    def calculate(self, closes) -> dict:
+        """
+        Compute every SMATechnicalAnalyzer column for a (symbols, time) close array.
+        :return: Dictionary of column name -> 2-D array
+        """
+        closes = np.atleast_2d(np.asarray(closes, dtype=float))
+        columns = {'close': closes}
+        for window in self.sma_windows:
+            columns[f'SMA{window}'] = rolling_mean(closes, window)
+
+        short_sma = columns[f'SMA{self.sma_windows[0]}']
+        long_sma = columns[f'SMA{self.sma_windows[1]}']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            strength = (short_sma - long_sma) / long_sma * 100
+        columns['SMA_Strength_Percent'] = strength
+        columns['SMA_Strength_MA5'] = rolling_mean(strength, self.trend_window)
+        columns['SMA_Strength_Slope'] = rolling_slope(strength, self.trend_window)
+        columns['SMA_Score'] = score_lookup(strength, columns['SMA_Strength_Slope'], self.scoring)
+        return columns
+
+    def run_array(self, closes, symbols: list = None, lengths=None) -> pd.DataFrame:
+        """
+        Score a (symbols, time) close array.
+        :param symbols: Row labels; defaults to the row numbers
+        :param lengths: Number of valid bars per row; defaults to the full width
+        :return: Per-symbol table of the latest indicator values and SMA_Score
+        """
+        columns = self.calculate(closes)
+        n_symbols, n_bars = columns['close'].shape
+        rows = np.arange(n_symbols)
+        last = np.full(n_symbols, n_bars - 1) if lengths is None else np.asarray(lengths) - 1
+
+        table = pd.DataFrame(
+            {name: values[rows, last] for name, values in columns.items()},
+            index=pd.Index(symbols if symbols is not None else rows, name='symbol'))
+        logging.info(f"Batch SMA analysis scored {n_symbols} symbols over {n_bars} bars.")
+        return table
+
+    def analyze_panel(self, panel: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute per-bar indicators for a long-format panel.
+
+        Symbols are processed in chunks of similar history length (longest
+        first), each padded only to its own longest member, so memory and time
+        stay proportional to the panel's rows even when a few symbols have far
+        longer histories than the rest.
+
+        :param panel: DataFrame with 'symbol', 'timestamp' and 'close' columns
+        :return: The panel sorted by symbol and timestamp with indicator columns added
+        """
+        panel = panel.sort_values(['symbol', 'timestamp'], kind='stable').reset_index(drop=True)
+        codes, symbols = pd.factorize(panel['symbol'], sort=True)
+        lengths = np.bincount(codes, minlength=len(symbols))
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        positions = np.arange(len(panel)) - starts[codes]
+        close = panel['close'].to_numpy(dtype=float)
+
+        # Chunk id and row within the chunk of every symbol
+        chunk_of = np.empty(len(symbols), dtype=np.int64)
+        row_of = np.empty(len(symbols), dtype=np.int64)
+        widths = []
+        for code in np.argsort(-lengths, kind='stable'):
+            if not widths or lengths[code] < widths[-1][0] * PANEL_CHUNK_FILL:
+                widths.append([lengths[code], 0])
+            chunk_of[code], row_of[code] = len(widths) - 1, widths[-1][1]
+            widths[-1][1] += 1
+
+        results = {}
+        bar_chunks = chunk_of[codes]
+        for chunk, (width, n_rows) in enumerate(widths):
+            bars = np.flatnonzero(bar_chunks == chunk)
+            rows, columns = row_of[codes[bars]], positions[bars]
+            closes = np.full((n_rows, width), np.nan)
+            closes[rows, columns] = close[bars]
+            for name, values in self.calculate(closes).items():
+                if name != 'close':
+                    results.setdefault(name, np.empty(len(panel)))[bars] = values[rows, columns]
+
+        for name, values in results.items():
+            panel[name] = values
+        return panel
+
+    def run_panel(self, panel: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score every symbol of a long-format (symbol, timestamp, close) panel.
+        :return: Per-symbol table of the latest bar's indicator values and SMA_Score
+        """
+        analyzed = self.analyze_panel(panel)
+        table = analyzed.groupby('symbol', sort=True).tail(1).set_index('symbol')
+        logging.info(f"Batch SMA analysis scored {len(table)} symbols over {len(analyzed)} bars.")
+        return table
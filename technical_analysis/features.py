@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from technical_analysis.utils import rolling_slope
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def latest_indicator_value(data, column: str):
+    """
+    Latest value of an indicator series given as a Polygon indicator payload
+    ({'results': {'values': [{'timestamp', 'value'}]}}) or a frame such as
+    DataProcessor.process_sma_data returns.
+    """
+    if isinstance(data, pd.DataFrame):
+        if data.empty or column not in data:
+            return None
+        if 'timestamp' in data:
+            data = data.sort_values('timestamp')
+        return float(data[column].iloc[-1])
+    if isinstance(data, dict):
+        values = (data.get('results') or {}).get('values') or []
+        if values:
+            return float(max(values, key=lambda value: value['timestamp'])['value'])
+    return None
+
+
+def _round(value, decimals):
+    if not isinstance(value, (float, np.floating)):
+        return value
+    return round(float(value), decimals) if np.isfinite(value) else None
+
+
+def summarize_price_features(df: pd.DataFrame, sma_windows=(10, 50), horizons=(1, 5, 20, 60, 252),
+                             trend_window: int = 5, volatility_windows=(20, 60), decimals: int = 4) -> dict:
+    """
+    Reduce a price history to a fixed-size numeric summary for LLM prompts:
+    returns over several horizons, SMA levels and strength, strength slope,
+    volatility and drawdown. The size does not depend on the history length.
+
+    :param df: Frame with a 'close' column (and optionally 'timestamp'), in time order
+    :param sma_windows: (short, long) SMA windows
+    :param horizons: Return horizons in bars
+    :param trend_window: Bars used for the SMA strength slope
+    :param volatility_windows: Windows for annualized volatility of daily log returns
+    :param decimals: Rounding applied to every value
+    :return: Ordered dictionary of feature name -> float (None when the history is too short)
+    """
+    close = pd.to_numeric(df['close'], errors='coerce').astype(float).dropna().to_numpy()
+    features = {'bars': len(close)}
+    if 'timestamp' in df and len(df):
+        features['as_of'] = str(pd.Timestamp(df['timestamp'].iloc[-1]).date())
+    if len(close) == 0:
+        return features
+    last = close[-1]
+    features['last_close'] = last
+
+    for horizon in horizons:
+        features[f'return_{horizon}d_pct'] = (last / close[-horizon - 1] - 1) * 100 if len(close) > horizon else None
+
+    short_window, long_window = sma_windows
+    short_sma = pd.Series(close).rolling(short_window, min_periods=1).mean().to_numpy()
+    long_sma = pd.Series(close).rolling(long_window, min_periods=1).mean().to_numpy()
+    strength = (short_sma - long_sma) / long_sma * 100
+    features[f'sma{short_window}'] = short_sma[-1]
+    features[f'sma{long_window}'] = long_sma[-1]
+    features[f'close_vs_sma{long_window}_pct'] = (last / long_sma[-1] - 1) * 100
+    features['sma_strength_pct'] = strength[-1]
+    slope = rolling_slope(strength[-trend_window:], trend_window)[-1] if len(close) >= trend_window else np.nan
+    features['sma_strength_slope'] = slope
+
+    log_returns = np.diff(np.log(close))
+    for window in volatility_windows:
+        features[f'volatility_{window}d_ann_pct'] = (
+            log_returns[-window:].std(ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR) * 100
+            if len(log_returns) >= window else None)
+
+    running_peak = np.maximum.accumulate(close)
+    drawdown = (close / running_peak - 1) * 100
+    features['drawdown_pct'] = drawdown[-1]
+    features['max_drawdown_pct'] = drawdown.min()
+    features['range_high'] = close.max()
+    features['range_low'] = close.min()
+
+    return {name: _round(value, decimals) for name, value in features.items()}
+
+
+def format_features(features: dict) -> str:
+    """
+    One 'name: value' line per feature, the prompt form of summarize_price_features.
+    """
+    return '\n'.join(f'{name}: {"n/a" if value is None else value}' for name, value in features.items())
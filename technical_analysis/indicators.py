@@ -0,0 +1,349 @@
+"""
+Vectorized technical indicators.
+
+Every function works along the last axis of a 1-D series or a 2-D
+(symbols, time) array and runs in O(n): exponential averages use a blocked
+closed form of the recursion, and windowed statistics read cumulative sums.
+Each indicator has a streaming counterpart with an O(1) `update` that
+reproduces the batch values bar by bar.
+
+Exponential indicators (EMA, MACD, RSI, ATR) match pandas
+`ewm(adjust=False)` and expect NaN-free input apart from left and right padding;
+windowed indicators (Bollinger, z-score, rolling VWAP) skip NaN and need a
+full window of valid values.
+"""
+import math
+
+import numpy as np
+
+from technical_analysis.utils import RollingWindow, prefix_sums, window_mean, window_sums
+
+# Largest power of the decay factor a block may span before its inverse overflows precision
+_MAX_BLOCK_EXPONENT = 300.0
+
+
+def _as_float_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=float)
+
+
+def ewma(values, alpha: float) -> np.ndarray:
+    """
+    Exponentially weighted mean y[t] = y[t-1] + alpha * (x[t] - y[t-1]), y[0] = x[0].
+
+    The recursion is evaluated in blocks: within a block
+    y[j] = decay**(j+1) * y[-1] + alpha * decay**j * cumsum(x[k] / decay**k),
+    with blocks short enough that decay**-k stays far from overflow. Leading
+    NaN stay NaN and the recursion starts at the first valid value.
+    """
+    if not 0 < alpha <= 1:
+        raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+    values = _as_float_array(values)
+    out = np.empty_like(values)
+    length = values.shape[-1]
+    if length == 0:
+        return out
+    decay = 1.0 - alpha
+    if decay == 0:
+        out[...] = values
+        return out
+
+    # Rows of a ragged panel start late: seed each at its first valid value, like pandas and EMA.update
+    first = np.argmax(~np.isnan(values), axis=-1)
+    leading = None
+    if np.any(first):
+        leading = np.arange(length) < np.expand_dims(first, -1)
+        values = np.where(leading, np.take_along_axis(values, np.expand_dims(first, -1), axis=-1), values)
+
+    block = max(1, int(_MAX_BLOCK_EXPONENT / -math.log(decay)))
+    exponents = np.arange(min(block, length))
+    powers = decay ** exponents
+    inverse_powers = decay ** -exponents
+    previous = values[..., 0]
+    for start in range(0, length, block):
+        chunk = values[..., start:start + block]
+        size = chunk.shape[-1]
+        weighted = np.cumsum(chunk * inverse_powers[:size], axis=-1) * (alpha * powers[:size])
+        out[..., start:start + size] = weighted + previous[..., None] * (powers[:size] * decay)
+        previous = out[..., start + size - 1]
+    if leading is not None:
+        out[leading] = np.nan
+    return out
+
+
+def ema(values, span: int) -> np.ndarray:
+    """
+    Exponential moving average with alpha = 2 / (span + 1), like pandas `ewm(span, adjust=False).mean()`.
+    """
+    return ewma(values, 2.0 / (span + 1))
+
+
+def macd(values, fast: int = 12, slow: int = 26, signal: int = 9):
+    """
+    :return: (macd line, signal line, histogram)
+    """
+    values = _as_float_array(values)
+    line = ema(values, fast) - ema(values, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def _wilder_ratio_to_rsi(average_gain, average_loss):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi_values = 100 - 100 / (1 + average_gain / average_loss)
+    # No losses in the window: fully overbought (unless there were no moves at all)
+    return np.where(average_loss == 0, np.where(average_gain == 0, 50.0, 100.0), rsi_values)
+
+
+def rsi(values, period: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index with Wilder smoothing (alpha = 1 / period).
+    The first element has no price change and is NaN.
+    """
+    values = _as_float_array(values)
+    out = np.full(values.shape, np.nan)
+    if values.shape[-1] < 2:
+        return out
+    delta = np.diff(values, axis=-1)
+    average_gain = ewma(np.maximum(delta, 0), 1.0 / period)
+    average_loss = ewma(np.maximum(-delta, 0), 1.0 / period)
+    out[..., 1:] = _wilder_ratio_to_rsi(average_gain, average_loss)
+    # Keep padding NaN rather than the neutral value
+    out[..., 1:][np.isnan(delta)] = np.nan
+    return out
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """
+    max(high - low, |high - previous close|, |low - previous close|); the first bar uses high - low.
+    """
+    high, low, close = _as_float_array(high), _as_float_array(low), _as_float_array(close)
+    ranges = high - low
+    previous_close = close[..., :-1]
+    # fmax skips a missing previous close, so the first bar after padding uses high - low
+    ranges[..., 1:] = np.fmax(ranges[..., 1:], np.fmax(np.abs(high[..., 1:] - previous_close),
+                                                       np.abs(low[..., 1:] - previous_close)))
+    return ranges
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """
+    Average True Range with Wilder smoothing.
+    """
+    return ewma(true_range(high, low, close), 1.0 / period)
+
+
+def _rolling_mean_std(values, window: int):
+    """
+    Rolling mean and sample standard deviation (ddof=1) from cumulative sums of
+    centered values and their squares; NaN until a window holds `window` valid values.
+    """
+    values = _as_float_array(values)
+    sums, counts, offset = prefix_sums(values)
+    centered = np.nan_to_num(values - offset)
+    square_sums = np.zeros_like(sums)
+    np.cumsum(centered * centered, axis=-1, out=square_sums[..., 1:])
+
+    n = window_sums(counts, window)
+    totals = window_sums(sums, window)
+    squares = window_sums(square_sums, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = totals / n
+        variance = (squares - totals * mean) / (n - 1)
+    full = n >= window
+    return np.where(full, mean + offset, np.nan), np.where(full, np.sqrt(np.maximum(variance, 0)), np.nan)
+
+
+def bollinger_bands(values, window: int = 20, num_std: float = 2.0):
+    """
+    :return: (middle, upper, lower) bands around the rolling mean, using the sample standard deviation
+    """
+    middle, std = _rolling_mean_std(values, window)
+    return middle, middle + num_std * std, middle - num_std * std
+
+
+def rolling_zscore(values, window: int = 20) -> np.ndarray:
+    """
+    (value - rolling mean) / rolling sample standard deviation over the trailing window.
+    """
+    values = _as_float_array(values)
+    mean, std = _rolling_mean_std(values, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(std > 0, (values - mean) / std, np.nan)
+
+
+def vwap_deviation(close, vwap, volume=None, window: int = None) -> np.ndarray:
+    """
+    Percent distance of the close from VWAP, using the per-bar `vwap` column of
+    ticker_data. With `volume` and `window`, the reference is the volume-weighted
+    average of the last `window` bars' VWAPs instead of the bar's own.
+    """
+    close, vwap = _as_float_array(close), _as_float_array(vwap)
+    reference = vwap
+    if window is not None:
+        if volume is None:
+            raise ValueError("A rolling VWAP needs the volume column")
+        volume = _as_float_array(volume)
+        traded = window_mean(prefix_sums(vwap * volume), window, window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            reference = traded / window_mean(prefix_sums(volume), window, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (close / reference - 1) * 100
+
+
+class EMA:
+    """
+    Streaming EMA; update() returns the same values as ema() for the same series.
+    NaN inputs leave the average unchanged.
+    """
+
+    def __init__(self, span: int = None, alpha: float = None):
+        if (span is None) == (alpha is None):
+            raise ValueError("Pass exactly one of span or alpha")
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1)
+        self.value = np.nan
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        if math.isnan(self.value):
+            self.value = value
+        elif not math.isnan(value):
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class MACD:
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    def update(self, value: float):
+        """
+        :return: (macd line, signal line, histogram)
+        """
+        line = self.fast.update(value) - self.slow.update(value)
+        signal_line = self.signal.update(line)
+        return line, signal_line, line - signal_line
+
+
+class RSI:
+    def __init__(self, period: int = 14):
+        self.gain = EMA(alpha=1.0 / period)
+        self.loss = EMA(alpha=1.0 / period)
+        self.previous = None
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        previous, self.previous = self.previous, value
+        if previous is None:
+            return np.nan
+        delta = value - previous
+        average_gain = self.gain.update(max(delta, 0.0))
+        average_loss = self.loss.update(max(-delta, 0.0))
+        # Plain floats raise on division by zero, so the no-loss case is handled before dividing
+        if average_loss == 0:
+            return 50.0 if average_gain == 0 else 100.0
+        return 100 - 100 / (1 + average_gain / average_loss)
+
+
+class ATR:
+    def __init__(self, period: int = 14):
+        self.average = EMA(alpha=1.0 / period)
+        self.previous_close = None
+
+    def update(self, high: float, low: float, close: float) -> float:
+        bar_range = high - low
+        if self.previous_close is not None:
+            bar_range = max(bar_range, abs(high - self.previous_close), abs(low - self.previous_close))
+        self.previous_close = close
+        return self.average.update(bar_range)
+
+
+class RollingMoments(RollingWindow):
+    """
+    Ring buffer that also keeps the sum of squares, for O(1) rolling mean and
+    sample standard deviation. Values are centered on the first one pushed to
+    keep the running sums well conditioned.
+    """
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.square_total = 0.0
+        self.center = None
+
+    def push(self, value: float):
+        value = float(value)
+        if self.center is None and not math.isnan(value):
+            self.center = value
+        super().push(value - self.center if self.center is not None else value)
+
+    def _evict(self, old: float):
+        super()._evict(old)
+        if not math.isnan(old):
+            self.square_total -= old * old
+
+    def _append(self, value: float):
+        super()._append(value)
+        if not math.isnan(value):
+            self.square_total += value * value
+
+    def _resync(self):
+        super()._resync()
+        self.square_total = math.fsum(v * v for v in self.values if not math.isnan(v))
+
+    def full(self) -> bool:
+        return len(self.values) == self.window and self.nan_count == 0
+
+    def mean(self) -> float:
+        return super().mean() + (self.center or 0.0) if self.full() else np.nan
+
+    def std(self) -> float:
+        if not self.full() or self.window < 2:
+            return np.nan
+        variance = (self.square_total - self.total * self.total / self.window) / (self.window - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+class BollingerBands:
+    def __init__(self, window: int = 20, num_std: float = 2.0):
+        self.moments = RollingMoments(window)
+        self.num_std = num_std
+
+    def update(self, value: float):
+        """
+        :return: (middle, upper, lower)
+        """
+        self.moments.push(value)
+        middle, std = self.moments.mean(), self.moments.std()
+        return middle, middle + self.num_std * std, middle - self.num_std * std
+
+
+class RollingZScore:
+    def __init__(self, window: int = 20):
+        self.moments = RollingMoments(window)
+
+    def update(self, value: float) -> float:
+        self.moments.push(value)
+        std = self.moments.std()
+        return (float(value) - self.moments.mean()) / std if std else np.nan
+
+
+class VWAPDeviation:
+    """
+    Streaming vwap_deviation; with a window, the reference is the rolling volume-weighted VWAP.
+    """
+
+    def __init__(self, window: int = None):
+        self.window = window
+        self.traded = RollingWindow(window) if window else None
+        self.volume = RollingWindow(window) if window else None
+
+    def update(self, close: float, vwap: float, volume: float = None) -> float:
+        reference = vwap
+        if self.window:
+            self.traded.push(vwap * volume)
+            self.volume.push(volume)
+            if len(self.volume.values) < self.window:
+                return np.nan
+            reference = self.traded.total / self.volume.total if self.volume.total else np.nan
+        return (close / reference - 1) * 100 if reference else np.nan
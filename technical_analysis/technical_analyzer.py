@@ -1,9 +1,15 @@
+import datetime
 import logging
-from openai import OpenAI
+import numbers
+import time
 import pandas as pd
 from typing import Dict
 import numpy as np
-import matplotlib.pyplot as plt
+
+from technical_analysis.features import latest_indicator_value, format_features, summarize_price_features
+from technical_analysis.utils import RollingRegression, RollingWindow, rolling_slope, score_lookup
+from utils.llm_cache import LLMCache, get_llm_cache
+from utils.logger import LazyMessage
 
 
 # class TechnicalAnalyzer:
@@ -18,10 +24,13 @@ import matplotlib.pyplot as plt
 #         return 80  # Example mock score
 
 class SMATechnicalAnalyzer:
-    def __init__(self, df: pd.DataFrame, trend_window: int = 5, sma_windows: list = [10, 50]):
-        self.df = df.copy()
+    def __init__(self, df: pd.DataFrame, trend_window: int = 5, sma_windows: list = [10, 50], scoring: dict = None,
+                 copy: bool = True):
+        # copy=False analyzes the caller's frame in place, adding the indicator columns to it
+        self.df = df.copy() if copy else df
         self.trend_window = trend_window
         self.sma_windows = sma_windows
+        self.scoring = scoring
         self.scores = {}
 
     def calculate_sma(self):
@@ -45,11 +54,11 @@ class SMATechnicalAnalyzer:
                 window=self.trend_window, min_periods=1).mean()
 
             # Calculate Slope of SMA Strength over the window
-            self.df['SMA_Strength_Slope'] = self.df['SMA_Strength_Percent'].rolling(
-                window=self.trend_window, min_periods=1).apply(self.calculate_slope, raw=False)
+            self.df['SMA_Strength_Slope'] = rolling_slope(
+                self.df['SMA_Strength_Percent'], window=self.trend_window, min_periods=1)
 
             logging.info("SMA indicators calculated successfully.")
-            logging.info(self.df.tail())
+            logging.debug('SMA indicators tail:\n%s', LazyMessage(self.df.tail))
         except Exception as e:
             logging.error(f"Error calculating SMA indicators: {e}")
 
@@ -123,10 +132,11 @@ class SMATechnicalAnalyzer:
 
     def score_sma_crossover_strength(self):
         """
-        Apply the scoring function to each row.
+        Score every row at once from the declarative scoring table.
         """
         try:
-            self.df['SMA_Score'] = self.df.apply(self.assign_sma_score, axis=1)
+            self.df['SMA_Score'] = score_lookup(
+                self.df['SMA_Strength_Percent'], self.df['SMA_Strength_Slope'], self.scoring)
             latest_sma_score = self.df['SMA_Score'].iloc[-1]
             self.scores['SMA_Score'] = latest_sma_score
             logging.info(f"SMA Crossover Strength Score: {latest_sma_score}")
@@ -158,6 +168,8 @@ class SMATechnicalAnalyzer:
         """
         Plot Close Price along with SMA indicators.
         """
+        import matplotlib.pyplot as plt
+
         try:
             plt.figure(figsize=(12, 6))
             plt.plot(self.df['timestamp'], self.df['close'], label='Close Price', color='blue')
@@ -184,34 +196,169 @@ class SMATechnicalAnalyzer:
         return self.scores
 
 
+class IncrementalSMAAnalyzer:
+    """
+    Streaming counterpart of SMATechnicalAnalyzer for a single symbol.
+
+    Keeps only ring buffers and running sums (O(window) state), so each new bar
+    costs O(1) instead of recomputing the whole history. The short and long
+    SMA used for the strength are sma_windows[0] and sma_windows[1].
+    """
+
+    def __init__(self, trend_window: int = 5, sma_windows: list = [10, 50], scoring: dict = None):
+        self.trend_window = trend_window
+        self.sma_windows = sma_windows
+        self.scoring = scoring
+        self.reset()
+
+    def reset(self):
+        self.sma = {window: RollingWindow(window) for window in self.sma_windows}
+        self.strength_ma = RollingWindow(self.trend_window)
+        self.strength_slope = RollingRegression(self.trend_window)
+        self.latest = {}
+        self.scores = {}
+
+    @classmethod
+    def from_analyzer(cls, analyzer: SMATechnicalAnalyzer):
+        """
+        Build a streaming analyzer warmed from a completed run_analysis().
+        """
+        incremental = cls(analyzer.trend_window, analyzer.sma_windows, analyzer.scoring)
+        incremental.warm(analyzer.df)
+        return incremental
+
+    def warm(self, df: pd.DataFrame):
+        """
+        Load state from run_analysis output (needs 'close' and 'SMA_Strength_Percent').
+        Only the last max(sma_windows) closes and trend_window strengths are read.
+        """
+        self.reset()
+        for window, state in self.sma.items():
+            for close in df['close'].iloc[-window:]:
+                state.push(close)
+        for strength in df['SMA_Strength_Percent'].iloc[-self.trend_window:]:
+            self.strength_ma.push(strength)
+            self.strength_slope.push(strength)
+        if not df.empty:
+            self.latest = df.iloc[-1].to_dict()
+            if 'SMA_Score' in df:
+                self.scores['SMA_Score'] = df['SMA_Score'].iloc[-1]
+        logging.info(f"Incremental SMA analyzer warmed from {len(df)} rows.")
+
+    def update(self, bar):
+        """
+        Add one bar and return the latest SMA_Score.
+        :param bar: Close price, or a mapping/row with a 'close' field
+        :return: Score (int)
+        """
+        return self._apply(bar, replace=False)
+
+    def update_last(self, bar):
+        """
+        Replace the most recent bar, e.g. today's bar after it moved on since
+        the last update, and return the recomputed SMA_Score.
+        :param bar: Close price, or a mapping/row with a 'close' field
+        :return: Score (int)
+        """
+        return self._apply(bar, replace=True)
+
+    def _apply(self, bar, replace: bool):
+        close = bar if isinstance(bar, numbers.Real) else bar['close']
+        push = RollingWindow.replace_last if replace else RollingWindow.push
+        for state in self.sma.values():
+            push(state, close)
+
+        short_sma = self.sma[self.sma_windows[0]].mean()
+        long_sma = self.sma[self.sma_windows[1]].mean()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            strength = float((np.float64(short_sma) - long_sma) / long_sma * 100)
+        push(self.strength_ma, strength)
+        push(self.strength_slope, strength)
+        slope = self.strength_slope.slope()
+
+        score = int(score_lookup(strength, slope, self.scoring))
+        self.latest = {
+            'close': close,
+            **{f'SMA{window}': state.mean() for window, state in self.sma.items()},
+            'SMA_Strength_Percent': strength,
+            'SMA_Strength_MA5': self.strength_ma.mean(),
+            'SMA_Strength_Slope': slope,
+            'SMA_Score': score,
+        }
+        if not isinstance(bar, numbers.Real) and 'timestamp' in bar:
+            self.latest['timestamp'] = bar['timestamp']
+        self.scores['SMA_Score'] = score
+        return score
+
+
 class TechnicalAnalyzer:
-    def __init__(self, config):
+    def __init__(self, config, client=None, cache=None):
         self.config = config
-        self.client = OpenAI()
+        self._client = client
+        self.cache = cache if cache is not None else get_llm_cache(config)
+        self.model = "gpt-4o-mini"
 
-    def analyze(self, processed_ticker_data, sma_10_data, sma_50_data, symbol):
-        logging.info(f'Performing technical analysis for market data')
+    @property
+    def client(self):
+        # Importing openai is slow; runs that never call the model skip it entirely
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI()
+        return self._client
 
-        prompt = (
-            f"price history - {processed_ticker_data}\n\n"
-            f"sma10 - {sma_10_data}\n\n"
-            f"sma50 - {sma_50_data}\n\n"
-            f"Based on the above price history data and data of SMA indicator and your knowledge about the company {
-                symbol}, "
+    def build_prompt(self, processed_ticker_data, sma_10_data, sma_50_data, symbol):
+        """
+        Prompt with a fixed-size feature summary of the price history instead of the raw rows.
+        """
+        features = summarize_price_features(processed_ticker_data)
+        # Provider SMA series only contribute their latest value
+        for name, data, column in (('provider_sma10', sma_10_data, 'SMA10'), ('provider_sma50', sma_50_data, 'SMA50')):
+            value = latest_indicator_value(data, column)
+            if value is not None:
+                features[name] = round(value, 4)
+        return (
+            f"Technical features of {symbol}:\n{format_features(features)}\n\n"
+            f"Based on the above technical features and your knowledge about the company {symbol}, "
             "provide a single technical analysis score between -100 and 100. Do not provide any other information, "
             "only return the number."
         )
+
+    def analyze(self, processed_ticker_data, sma_10_data, sma_50_data, symbol):
+        """
+        Score the technical setup of a symbol with the LLM.
+
+        :param processed_ticker_data: Price history with a 'close' column, in time order
+        :param sma_10_data: Optional SMA10 series (Polygon payload or process_sma_data frame)
+        :param sma_50_data: Optional SMA50 series (Polygon payload or process_sma_data frame)
+        :param symbol: The ticker symbol
+        :return: Score between -100 and 100, or None on error
+        """
+        logging.info(f'Performing technical analysis for market data')
+
+        messages = [
+            {"role": "system", "content": "You are an expert financial analyst."},
+            {"role": "user", "content": self.build_prompt(processed_ticker_data, sma_10_data, sma_50_data, symbol)}
+        ]
+
+        def complete():
+            start = time.perf_counter()
+            completion = self.client.chat.completions.create(model=self.model, messages=messages)
+            usage = getattr(completion, 'usage', None)
+            logging.info(f'Technical analysis call for {symbol}: {time.perf_counter() - start:.2f}s, '
+                         f'prompt_tokens={getattr(usage, "prompt_tokens", None)}, '
+                         f'completion_tokens={getattr(usage, "completion_tokens", None)}')
+            # Parsed before get_or_create stores it, so a non-numeric reply is never cached
+            return str(float(completion.choices[0].message.content))
+
         try:
-            completion = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert financial analyst."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            technical_score = float(completion.choices[0].message.content)
+            if self.cache is None:
+                content = complete()
+            else:
+                key = LLMCache.make_key(self.model, messages, datetime.date.today())
+                content = self.cache.get_or_create(key, complete)
+            technical_score = float(content)
             logging.info(f'Technical score: {technical_score}')
             return technical_score
         except Exception as e:
-            logging.error(f'Error during technical analysis: {e}', exec_info=True)
+            logging.error(f'Error during technical analysis: {e}', exc_info=True)
             return None
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from technical_analysis.indicators import (ATR, EMA, MACD, RSI, BollingerBands, RollingZScore, VWAPDeviation, atr,
+                                           bollinger_bands, ema, ewma, macd, rolling_zscore, rsi, vwap_deviation)
+
+
+def make_bars(n=3000, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.02, n))
+    low = close * (1 - rng.uniform(0, 0.02, n))
+    volume = rng.uniform(1e5, 1e6, n)
+    vwap = (high + low + close) / 3
+    return close, high, low, volume, vwap
+
+
+# Reference implementations written the usual pandas way
+
+def pandas_rsi(close, period):
+    delta = pd.Series(close).diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False).mean()
+    loss = (-delta).clip(lower=0).ewm(alpha=1 / period, adjust=False).mean()
+    return (100 - 100 / (1 + gain / loss)).to_numpy()
+
+
+def pandas_atr(high, low, close, period):
+    previous = pd.Series(close).shift()
+    ranges = pd.concat([pd.Series(high - low), (pd.Series(high) - previous).abs(),
+                        (pd.Series(low) - previous).abs()], axis=1).max(axis=1)
+    return ranges.ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+
+
+@pytest.mark.parametrize('span', [1, 2, 12, 200])
+def test_ema_matches_pandas(span):
+    close = make_bars()[0]
+    expected = pd.Series(close).ewm(span=span, adjust=False).mean().to_numpy()
+    np.testing.assert_allclose(ema(close, span), expected, rtol=1e-10)
+
+
+def test_ewma_long_series_stays_accurate_across_blocks():
+    values = np.random.default_rng(0).normal(0, 1, 100_000)
+    expected = pd.Series(values).ewm(alpha=0.9, adjust=False).mean().to_numpy()
+    np.testing.assert_allclose(ewma(values, 0.9), expected, rtol=1e-9, atol=1e-12)
+
+
+def test_batch_indicators_match_pandas_references():
+    close, high, low, volume, vwap = make_bars()
+    series = pd.Series(close)
+
+    line, signal, histogram = macd(close)
+    expected_line = (series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean())
+    np.testing.assert_allclose(line, expected_line, rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(signal, expected_line.ewm(span=9, adjust=False).mean(), rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(histogram, line - signal)
+
+    np.testing.assert_allclose(rsi(close, 14), pandas_rsi(close, 14), rtol=1e-9)
+    np.testing.assert_allclose(atr(high, low, close, 14), pandas_atr(high, low, close, 14), rtol=1e-9)
+
+    middle, upper, lower = bollinger_bands(close, 20, 2)
+    rolling = series.rolling(20)
+    np.testing.assert_allclose(middle, rolling.mean(), rtol=1e-9)
+    np.testing.assert_allclose(upper, rolling.mean() + 2 * rolling.std(), rtol=1e-9)
+    np.testing.assert_allclose(lower, rolling.mean() - 2 * rolling.std(), rtol=1e-9)
+    np.testing.assert_allclose(rolling_zscore(close, 20), (series - rolling.mean()) / rolling.std(),
+                               rtol=1e-6, atol=1e-8)
+
+    np.testing.assert_allclose(vwap_deviation(close, vwap), (close / vwap - 1) * 100)
+    rolling_vwap = (pd.Series(vwap * volume).rolling(10).sum() / pd.Series(volume).rolling(10).sum())
+    np.testing.assert_allclose(vwap_deviation(close, vwap, volume, 10), (close / rolling_vwap - 1) * 100,
+                               rtol=1e-9, atol=1e-9)
+
+
+def test_2d_input_matches_row_by_row():
+    bars = [make_bars(500, seed) for seed in range(3)]
+    closes = np.stack([bar[0] for bar in bars])
+    highs = np.stack([bar[1] for bar in bars])
+    lows = np.stack([bar[2] for bar in bars])
+    for i in range(3):
+        np.testing.assert_allclose(ema(closes, 20)[i], ema(closes[i], 20))
+        np.testing.assert_allclose(rsi(closes, 14)[i], rsi(closes[i], 14))
+        np.testing.assert_allclose(atr(highs, lows, closes)[i], atr(highs[i], lows[i], closes[i]))
+        np.testing.assert_allclose(bollinger_bands(closes)[1][i], bollinger_bands(closes[i])[1])
+        np.testing.assert_allclose(rolling_zscore(closes)[i], rolling_zscore(closes[i]))
+
+
+def test_incremental_indicators_reproduce_batch_values():
+    close, high, low, volume, vwap = make_bars(1500)
+    cases = [
+        ('ema', EMA(20), lambda ind, i: ind.update(close[i]), ema(close, 20)),
+        ('rsi', RSI(14), lambda ind, i: ind.update(close[i]), rsi(close, 14)),
+        ('atr', ATR(14), lambda ind, i: ind.update(high[i], low[i], close[i]), atr(high, low, close)),
+        ('macd', MACD(), lambda ind, i: ind.update(close[i])[2], macd(close)[2]),
+        ('bollinger', BollingerBands(), lambda ind, i: ind.update(close[i])[2], bollinger_bands(close)[2]),
+        ('zscore', RollingZScore(), lambda ind, i: ind.update(close[i]), rolling_zscore(close)),
+        ('vwap', VWAPDeviation(10), lambda ind, i: ind.update(close[i], vwap[i], volume[i]),
+         vwap_deviation(close, vwap, volume, 10)),
+    ]
+    for name, indicator, update, expected in cases:
+        streamed = np.array([update(indicator, i) for i in range(len(close))])
+        np.testing.assert_allclose(streamed, expected, rtol=1e-7, atol=1e-9, err_msg=name)
+
+
+def test_streaming_rsi_starting_with_rising_and_flat_moves():
+    close = np.concatenate([[100.0, 100.0, 101.0, 102.0], make_bars(200)[0]])
+    indicator = RSI(14)
+    streamed = np.array([indicator.update(value) for value in close])
+    assert streamed[1] == 50.0 and streamed[2] == 100.0
+    np.testing.assert_allclose(streamed, rsi(close, 14), rtol=1e-9)
+
+
+def test_left_padded_rows_start_at_first_valid_value():
+    np.testing.assert_allclose(ema([np.nan, np.nan, 1, 2, 3], 3), [np.nan, np.nan, 1, 1.5, 2.25])
+
+    close, high, low = make_bars(300)[:3]
+    padded = [np.concatenate([np.full(pad, np.nan), values[pad:]]) for values in (close, high, low)
+              for pad in (0, 40)]
+    closes, highs, lows = np.stack(padded[0:2]), np.stack(padded[2:4]), np.stack(padded[4:6])
+    row = closes[1]
+    expected = pd.Series(row).ewm(span=20, adjust=False).mean().to_numpy()
+    np.testing.assert_allclose(ema(closes, 20)[1], expected, rtol=1e-10)
+    indicator = EMA(20)
+    np.testing.assert_allclose(ema(closes, 20)[1], [indicator.update(value) for value in row], rtol=1e-10)
+    np.testing.assert_allclose(rsi(closes, 14)[1], pandas_rsi(row, 14), rtol=1e-9)
+    np.testing.assert_allclose(atr(highs, lows, closes)[1], pandas_atr(highs[1], lows[1], row, 14), rtol=1e-9)
+    np.testing.assert_allclose(macd(closes)[0][1], ema(row, 12) - ema(row, 26))
+    # The unpadded row is unaffected by its neighbour
+    np.testing.assert_allclose(ema(closes, 20)[0], ema(close, 20))
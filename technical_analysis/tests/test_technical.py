@@ -0,0 +1,216 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from technical_analysis.features import summarize_price_features
+from technical_analysis.technical_analyzer import IncrementalSMAAnalyzer, SMATechnicalAnalyzer, TechnicalAnalyzer
+from technical_analysis.batch_analyzer import PANEL_CHUNK_FILL, BatchSMAAnalyzer
+from technical_analysis.utils import DEFAULT_SMA_SCORING, rolling_mean, rolling_slope, score_lookup
+from utils.fake_openai import FakeOpenAI
+
+
+def make_close_df(n=300, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2020-01-01', periods=n, freq='D'),
+        'close': close,
+    })
+
+
+def polyfit_slope(series, window, min_periods=1):
+    analyzer = SMATechnicalAnalyzer(df=make_close_df(1))
+    return series.rolling(window=window, min_periods=min_periods).apply(
+        analyzer.calculate_slope, raw=False).to_numpy()
+
+
+@pytest.mark.parametrize('window', [1, 2, 5, 20])
+def test_rolling_slope_matches_polyfit(window):
+    series = pd.Series(np.random.default_rng(1).normal(0, 10, 200))
+    np.testing.assert_allclose(
+        rolling_slope(series, window), polyfit_slope(series, window), rtol=1e-9, atol=1e-12)
+
+
+def test_rolling_slope_nan_and_short_windows():
+    series = pd.Series([np.nan, 1.0, 3.0, 2.0, np.nan, 5.0, 4.0, 6.0, 8.0, 7.0])
+    np.testing.assert_allclose(
+        rolling_slope(series, 4), polyfit_slope(series, 4), rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(
+        rolling_slope(series, 4, min_periods=3), polyfit_slope(series, 4, min_periods=3),
+        rtol=1e-9, atol=1e-12)
+    assert np.isnan(rolling_slope([1.0], 5)).all()
+    assert rolling_slope([], 5).shape == (0,)
+
+
+def test_rolling_slope_2d_matches_rows():
+    values = np.random.default_rng(2).normal(0, 1, (3, 50))
+    result = rolling_slope(values, 5)
+    for row, expected in zip(values, result):
+        np.testing.assert_allclose(rolling_slope(row, 5), expected)
+
+
+def test_run_analysis_slope_matches_polyfit():
+    analyzer = SMATechnicalAnalyzer(df=make_close_df(), trend_window=5, sma_windows=[10, 50])
+    analyzer.run_analysis()
+    expected = polyfit_slope(analyzer.df['SMA_Strength_Percent'], 5)
+    np.testing.assert_allclose(
+        analyzer.df['SMA_Strength_Slope'].to_numpy(), expected, rtol=1e-9, atol=1e-12)
+
+
+def test_score_lookup_matches_assign_sma_score():
+    rng = np.random.default_rng(3)
+    edges = [-5, 5, 15, 25, -0.5, 0.5, np.nan, np.inf, -np.inf]
+    strength = np.concatenate([rng.uniform(-40, 40, 2000), np.repeat(edges, len(edges))])
+    slope = np.concatenate([rng.uniform(-2, 2, 2000), np.tile(edges, len(edges))])
+    df = pd.DataFrame({'SMA_Strength_Percent': strength, 'SMA_Strength_Slope': slope})
+    analyzer = SMATechnicalAnalyzer(df=df)
+    expected = df.apply(analyzer.assign_sma_score, axis=1)
+
+    analyzer.score_sma_crossover_strength()
+    pd.testing.assert_series_equal(analyzer.df['SMA_Score'], expected, check_names=False)
+
+
+def test_score_lookup_custom_table():
+    scoring = dict(DEFAULT_SMA_SCORING, strength_bins=[0], score_matrix=[[-1, -2, -3], [1, 2, 3]])
+    scores = score_lookup([-1.0, 1.0, 1.0, np.nan], [1.0, 0.0, -1.0, 0.0], scoring)
+    np.testing.assert_array_equal(scores, [-1, 2, 3, 0])
+
+
+def test_incremental_analyzer_matches_run_analysis():
+    df = make_close_df(200)
+    df.loc[60, 'close'] = np.nan
+    analyzer = SMATechnicalAnalyzer(df=df)
+    analyzer.run_analysis()
+
+    incremental = IncrementalSMAAnalyzer()
+    streamed = [incremental.update(bar) for bar in df.to_dict('records')]
+
+    np.testing.assert_array_equal(streamed, analyzer.df['SMA_Score'].to_numpy())
+    for column in ['SMA10', 'SMA50', 'SMA_Strength_MA5', 'SMA_Strength_Slope']:
+        np.testing.assert_allclose(incremental.latest[column], analyzer.df[column].iloc[-1], rtol=1e-9)
+
+
+def test_incremental_analyzer_warm_start():
+    df = make_close_df(300)
+    full = SMATechnicalAnalyzer(df=df)
+    full.run_analysis()
+    warm = SMATechnicalAnalyzer(df=df.iloc[:220])
+    warm.run_analysis()
+
+    incremental = IncrementalSMAAnalyzer.from_analyzer(warm)
+    assert incremental.scores['SMA_Score'] == full.df['SMA_Score'].iloc[219]
+    streamed = [incremental.update(close) for close in df['close'].iloc[220:]]
+    np.testing.assert_array_equal(streamed, full.df['SMA_Score'].iloc[220:].to_numpy())
+    np.testing.assert_allclose(
+        incremental.latest['SMA_Strength_Slope'], full.df['SMA_Strength_Slope'].iloc[-1], rtol=1e-9)
+
+
+def test_incremental_analyzer_replaces_a_forming_bar():
+    df = make_close_df(120)
+    analyzer = SMATechnicalAnalyzer(df=df)
+    analyzer.run_analysis()
+
+    incremental = IncrementalSMAAnalyzer()
+    for close in df['close'].iloc[:-1]:
+        incremental.update(close)
+    # The last bar is first seen with a partial close, then refreshed with the final one
+    incremental.update(df['close'].iloc[-1] * 1.05)
+    score = incremental.update_last(df['close'].iloc[-1])
+
+    assert score == analyzer.df['SMA_Score'].iloc[-1]
+    for column in ['SMA10', 'SMA50', 'SMA_Strength_MA5', 'SMA_Strength_Slope']:
+        np.testing.assert_allclose(incremental.latest[column], analyzer.df[column].iloc[-1], rtol=1e-9)
+
+
+def test_rolling_mean_matches_pandas():
+    series = pd.Series(make_close_df(120)['close'])
+    series.iloc[[3, 40, 41]] = np.nan
+    for window in [1, 10, 50]:
+        np.testing.assert_allclose(
+            rolling_mean(series, window), series.rolling(window, min_periods=1).mean(), rtol=1e-12)
+
+
+def make_panel():
+    frames = []
+    for seed, (symbol, n) in enumerate([('AAPL', 300), ('BTC', 40), ('MSFT', 180)]):
+        df = make_close_df(n, seed=seed)
+        df['symbol'] = symbol
+        frames.append(df)
+    return pd.concat(frames).sample(frac=1, random_state=0)
+
+
+def test_batch_panel_matches_single_symbol_analyzer():
+    panel = make_panel()
+    analyzed = BatchSMAAnalyzer().analyze_panel(panel)
+    table = BatchSMAAnalyzer().run_panel(panel)
+
+    assert list(table.index) == ['AAPL', 'BTC', 'MSFT']
+    for symbol, group in analyzed.groupby('symbol'):
+        analyzer = SMATechnicalAnalyzer(df=panel[panel['symbol'] == symbol].sort_values('timestamp'))
+        analyzer.run_analysis()
+        expected = analyzer.df.reset_index(drop=True)
+        group = group.reset_index(drop=True)
+        for column in ['SMA10', 'SMA50', 'SMA_Strength_MA5', 'SMA_Strength_Slope']:
+            np.testing.assert_allclose(group[column], expected[column], rtol=1e-9, atol=1e-9)
+        np.testing.assert_array_equal(group['SMA_Score'], expected['SMA_Score'])
+        assert table.loc[symbol, 'SMA_Score'] == analyzer.scores['SMA_Score']
+
+
+def test_batch_panel_pads_chunks_not_whole_panel():
+    frames = []
+    for seed, n in enumerate([2000] + [60] * 20):
+        df = make_close_df(n, seed=seed)
+        df['symbol'] = f'S{seed:02d}'
+        frames.append(df)
+    panel = pd.concat(frames)
+
+    analyzer = BatchSMAAnalyzer()
+    shapes = []
+    calculate = analyzer.calculate
+    analyzer.calculate = lambda closes: shapes.append(closes.shape) or calculate(closes)
+    analyzed = analyzer.analyze_panel(panel)
+
+    assert sum(rows * width for rows, width in shapes) <= len(panel) / PANEL_CHUNK_FILL
+    single = SMATechnicalAnalyzer(df=panel[panel['symbol'] == 'S05'])
+    single.run_analysis()
+    np.testing.assert_allclose(analyzed.loc[analyzed['symbol'] == 'S05', 'SMA50'], single.df['SMA50'],
+                               rtol=1e-9, atol=1e-9)
+
+
+def test_batch_array_respects_lengths():
+    closes = np.full((2, 60), np.nan)
+    closes[0] = make_close_df(60)['close']
+    closes[1, :30] = make_close_df(30, seed=1)['close']
+    table = BatchSMAAnalyzer().run_array(closes, symbols=['A', 'B'], lengths=[60, 30])
+
+    analyzer = SMATechnicalAnalyzer(df=make_close_df(30, seed=1))
+    analyzer.run_analysis()
+    assert table.loc['B', 'SMA_Score'] == analyzer.scores['SMA_Score']
+    np.testing.assert_allclose(table.loc['B', 'SMA50'], analyzer.df['SMA50'].iloc[-1])
+
+
+def test_price_features_are_fixed_size_and_match_pandas():
+    short, long = make_close_df(30), make_close_df(2000)
+    assert list(summarize_price_features(short)) == list(summarize_price_features(long))
+
+    df = make_close_df(300)
+    features = summarize_price_features(df, decimals=10)
+    close = df['close']
+    assert features['bars'] == 300 and features['as_of'] == '2020-10-26'
+    np.testing.assert_allclose(features['return_20d_pct'], (close.iloc[-1] / close.iloc[-21] - 1) * 100)
+    np.testing.assert_allclose(features['sma50'], close.rolling(50).mean().iloc[-1])
+    np.testing.assert_allclose(
+        features['volatility_20d_ann_pct'], np.log(close).diff().iloc[-20:].std() * np.sqrt(252) * 100)
+    np.testing.assert_allclose(features['max_drawdown_pct'], ((close / close.cummax() - 1) * 100).min())
+    assert summarize_price_features(make_close_df(3))['return_5d_pct'] is None
+
+
+def test_technical_analyzer_prompt_uses_feature_summary():
+    client = FakeOpenAI('35')
+    analyzer = TechnicalAnalyzer({}, client=client, cache=None)
+    sma10 = {'results': {'values': [{'timestamp': 2, 'value': 101.5}, {'timestamp': 1, 'value': 99.0}]}}
+    assert analyzer.analyze(make_close_df(5000), sma10, None, 'AAPL') == 35.0
+
+    prompt = client.calls[0]['messages'][-1]['content']
+    assert 'provider_sma10: 101.5' in prompt and 'provider_sma50' not in prompt
+    assert len(prompt) < 1500
@@ -0,0 +1,261 @@
+from collections import deque
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def prefix_sums(values):
+    """
+    NaN-skipping cumulative sums and counts along the last axis, zero-padded at
+    the front. Every rolling mean over `values` can be read from them, so a
+    sweep over many windows computes them once (see window_mean).
+
+    :return: (sums, counts, offset) where sums are of `values - offset`
+    """
+    values = np.asarray(values, dtype=float)
+    length = values.shape[-1]
+    valid = ~np.isnan(values)
+
+    # Offset by the first value of each row to keep the cumulative sums small
+    offset = np.nan_to_num(values[..., :1]) if length else 0.0
+    centered = np.where(valid, values - offset, 0.0)
+    padded_shape = values.shape[:-1] + (length + 1,)
+    sums = np.zeros(padded_shape)
+    counts = np.zeros(padded_shape, dtype=np.int64)
+    np.cumsum(centered, axis=-1, out=sums[..., 1:])
+    np.cumsum(valid, axis=-1, out=counts[..., 1:])
+    return sums, counts, offset
+
+
+def window_sums(cumulative, window: int) -> np.ndarray:
+    """
+    Trailing-window totals from cumulative sums that are zero-padded at the
+    front (length + 1 along the last axis). The first `window - 1` positions
+    cover the shorter windows available so far.
+    """
+    length = cumulative.shape[-1] - 1
+    out = np.empty(cumulative.shape[:-1] + (length,), dtype=cumulative.dtype)
+    head = min(window, length)
+    # Slices instead of index arrays: no gathers, one subtraction pass
+    out[..., :head] = cumulative[..., 1:head + 1]
+    np.subtract(cumulative[..., head + 1:], cumulative[..., 1:length - head + 1], out=out[..., head:])
+    return out
+
+
+def window_mean(prefix, window: int, min_periods: int = 1) -> np.ndarray:
+    """
+    Rolling mean for one window from the output of prefix_sums.
+    """
+    sums, counts, offset = prefix
+    totals = window_sums(sums, window)
+    window_counts = window_sums(counts, window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = totals / window_counts + offset
+    return np.where(window_counts >= max(min_periods, 1), means, np.nan)
+
+
+def rolling_mean(values, window: int, min_periods: int = 1) -> np.ndarray:
+    """
+    Rolling mean along the last axis that skips NaN, like pandas
+    `rolling(window, min_periods).mean()`, computed from cumulative sums.
+
+    :param values: 1-D array/Series, or 2-D array of shape (symbols, time)
+    :param window: Number of observations in each window
+    :param min_periods: Minimum non-NaN observations required to produce a value
+    :return: Array of means with the same shape as `values`
+    """
+    return window_mean(prefix_sums(values), window, min_periods)
+
+
+def _slope_weights(length):
+    """
+    Least-squares weights w such that slope = w . y for y sampled at x = 0..length-1.
+    """
+    x = np.arange(length, dtype=float)
+    x -= x.mean()
+    return x / np.dot(x, x)
+
+
+def rolling_slope(values, window: int, min_periods: int = 1) -> np.ndarray:
+    """
+    Rolling least-squares slope along the last axis.
+
+    Matches `Series.rolling(window, min_periods).apply(calculate_slope)`: the
+    first `window - 1` positions use the shorter windows available so far,
+    windows shorter than 2 (or than `min_periods`) yield NaN, and any NaN
+    inside a window makes its slope NaN.
+
+    :param values: 1-D array/Series, or 2-D array of shape (symbols, time)
+    :param window: Number of observations in each regression window
+    :param min_periods: Minimum window length required to produce a value
+    :return: Array of slopes with the same shape as `values`
+    """
+    if min_periods > window:
+        raise ValueError(f"min_periods {min_periods} must be <= window {window}")
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    length = values.shape[-1]
+    if length == 0:
+        return out
+
+    # Full windows: one matrix-vector product over a strided view, no copies
+    if length >= window >= 2:
+        windows = sliding_window_view(values, window, axis=-1)
+        out[..., window - 1:] = windows @ _slope_weights(window)
+
+    # Leading partial windows, as produced by min_periods < window
+    for size in range(max(2, min_periods), min(window, length + 1)):
+        out[..., size - 1] = values[..., :size] @ _slope_weights(size)
+    return out
+
+
+# Declarative SMA crossover scoring table. Strength buckets are right-closed:
+# (-inf, -5], (-5, 5], (5, 15], (15, 25], (25, inf). Trend columns are
+# Increasing (slope > upper), Stable, Decreasing (slope < lower); a NaN slope
+# counts as Stable and a NaN strength gets `default_score`.
+DEFAULT_SMA_SCORING = {
+    'strength_bins': [-5, 5, 15, 25],
+    'slope_thresholds': [-0.5, 0.5],
+    'score_matrix': [
+        [-4, -5, -7],
+        [-1, -1, -2],
+        [4, 2, 0],
+        [7, 5, 2],
+        [10, 8, 5],
+    ],
+    'default_score': 0,
+}
+
+
+def score_lookup(strength, slope, scoring: dict = None) -> np.ndarray:
+    """
+    Vectorized bucketed score: digitize strength, classify the slope trend and
+    index the score matrix.
+
+    :param strength: Array of SMA strength percentages
+    :param slope: Array of strength slopes, same shape as `strength`
+    :param scoring: Scoring table in the layout of DEFAULT_SMA_SCORING
+    :return: Integer array of scores
+    """
+    scoring = scoring or DEFAULT_SMA_SCORING
+    strength = np.asarray(strength, dtype=float)
+    slope = np.asarray(slope, dtype=float)
+    score_matrix = np.asarray(scoring['score_matrix'])
+    lower, upper = scoring['slope_thresholds']
+
+    bucket = np.digitize(strength, scoring['strength_bins'], right=True)
+    trend = np.ones(slope.shape, dtype=np.intp)
+    trend[slope > upper] = 0
+    trend[slope < lower] = 2
+
+    scores = score_matrix[np.minimum(bucket, len(score_matrix) - 1), trend]
+    return np.where(np.isnan(strength), scoring['default_score'], scores)
+
+
+class RollingWindow:
+    """
+    Fixed-size ring buffer with a running sum, for O(1) streaming rolling means.
+
+    NaN values occupy a slot but are skipped by the mean, like pandas
+    `rolling(window, min_periods=1).mean()`.
+    """
+    # Running sums are recomputed from the buffer this often to bound drift
+    resync_interval = 1000
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.nan_count = 0
+        self._pushes = 0
+
+    def push(self, value: float):
+        value = float(value)
+        if len(self.values) == self.window:
+            self._evict(self.values[0])
+        self._append(value)
+        self.values.append(value)
+        self._pushes += 1
+        if self._pushes % self.resync_interval == 0:
+            self._resync()
+
+    def replace_last(self, value: float):
+        """
+        Overwrite the most recent value (e.g. a bar that was still forming); pushes when empty.
+        """
+        if not self.values:
+            self.push(value)
+            return
+        value = float(value)
+        self._replace(self.values[-1], value)
+        self.values[-1] = value
+
+    def _evict(self, old: float):
+        if math.isnan(old):
+            self.nan_count -= 1
+        else:
+            self.total -= old
+
+    def _append(self, value: float):
+        if math.isnan(value):
+            self.nan_count += 1
+        else:
+            self.total += value
+
+    def _replace(self, old: float, value: float):
+        RollingWindow._evict(self, old)
+        RollingWindow._append(self, value)
+
+    def _resync(self):
+        self.total = math.fsum(v for v in self.values if not math.isnan(v))
+
+    def mean(self) -> float:
+        count = len(self.values) - self.nan_count
+        return self.total / count if count else np.nan
+
+
+class RollingRegression(RollingWindow):
+    """
+    Ring buffer that keeps sum(y) and sum(x*y) with x = 0..len-1 so the
+    least-squares slope of the window is available in O(1).
+
+    Same semantics as rolling_slope: NaN if the window holds fewer than two
+    values or any NaN.
+    """
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.weighted_total = 0.0
+
+    def _evict(self, old: float):
+        super()._evict(old)
+        # Every remaining value moves one position to the left
+        self.weighted_total -= self.total
+
+    def _append(self, value: float):
+        position = len(self.values) - 1 if len(self.values) == self.window else len(self.values)
+        super()._append(value)
+        if not math.isnan(value):
+            self.weighted_total += position * value
+
+    def _replace(self, old: float, value: float):
+        super()._replace(old, value)
+        position = len(self.values) - 1
+        if not math.isnan(old):
+            self.weighted_total -= position * old
+        if not math.isnan(value):
+            self.weighted_total += position * value
+
+    def _resync(self):
+        super()._resync()
+        self.weighted_total = math.fsum(
+            i * v for i, v in enumerate(self.values) if not math.isnan(v))
+
+    def slope(self) -> float:
+        n = len(self.values)
+        if n < 2 or self.nan_count:
+            return np.nan
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        return (n * self.weighted_total - sum_x * self.total) / (n * sum_xx - sum_x * sum_x)
@@ -1,3 +1,3 @@
 from .logger import initialize_logging
 from .notifier import send_notification
-from .helpers import some_helper_function
\ No newline at end of file
+from .helpers import some_helper_function, timed_stage, latency_percentiles
@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+
+class FakeOpenAI:
+    """
+    In-process stand-in for the OpenAI client's chat.completions.create, for
+    tests and offline runs.
+
+    :param responses: A string returned for every call, a list of strings
+                      returned in turn, or a callable taking (model, messages)
+    """
+
+    def __init__(self, responses='0'):
+        self.responses = responses
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, **kwargs):
+        self.calls.append({'model': model, 'messages': messages, **kwargs})
+        if callable(self.responses):
+            content = self.responses(model, messages)
+        elif isinstance(self.responses, list):
+            content = self.responses[(len(self.calls) - 1) % len(self.responses)]
+        else:
+            content = self.responses
+        prompt_tokens = sum(len(str(message['content']).split()) for message in messages)
+        completion_tokens = len(str(content).split())
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(index=0, finish_reason='stop',
+                                     message=SimpleNamespace(role='assistant', content=content))],
+            usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                  total_tokens=prompt_tokens + completion_tokens),
+        )
@@ -1,6 +1,38 @@
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+
 def some_helper_function():
     """
     A miscellaneous helper function.
     """
     # Placeholder for actual helper logic
-    pass
\ No newline at end of file
+    pass
+
+
+@contextmanager
+def timed_stage(timings, stage):
+    """
+    Add the wall-clock seconds spent inside the block to timings[stage].
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def latency_percentiles(samples, percentiles=(50, 90, 99)):
+    """
+    Summarize latency samples (seconds) as count, mean, the given percentiles and max.
+    """
+    if len(samples) == 0:
+        return {'count': 0}
+    values = np.asarray(samples, dtype=float)
+    summary = {'count': len(values), 'mean': float(values.mean())}
+    for percentile, value in zip(percentiles, np.percentile(values, percentiles)):
+        summary[f'p{percentile}'] = float(value)
+    summary['max'] = float(values.max())
+    return summary
@@ -0,0 +1,34 @@
+import os
+import threading
+
+from utils.response_cache import ResponseCache
+
+
+class LLMCache(ResponseCache):
+    """
+    ResponseCache for LLM completions, keyed by (model, messages, date) and the like.
+    """
+    table = 'llm_cache'
+
+
+# One cache per (process, path), shared by every LLM client of the process
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_llm_cache(config):
+    """
+    Return the shared LLM cache for config['llm_cache_path'], or None if caching is disabled.
+    """
+    path = config.get('llm_cache_path')
+    if not path:
+        return None
+    key = (os.getpid(), path)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = LLMCache(
+                path,
+                ttl=float(config.get('llm_cache_ttl', 3600)),
+                max_entries=int(config.get('llm_cache_max_entries', 10000)),
+            )
+        return _caches[key]
@@ -1,16 +1,149 @@
+import atexit
+import itertools
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Background listener of the queue handler, when LOG_ASYNC is enabled
+_queue_listener = None
+
 
 def initialize_logging():
     """
     Set up the logging configuration.
+
+    LOG_LEVEL sets the level (default INFO). With LOG_ASYNC=1 records are put on
+    an in-memory queue and written by a background thread, so slow handlers
+    (terminals, network file systems) do not block the pipelines.
     """
+    global _queue_listener
     log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
+    stream_handler = _stream_handler()
+    handler = stream_handler
+    if os.getenv('LOG_ASYNC', '').lower() in ('1', 'true', 'yes') and _queue_listener is None:
+        log_queue = queue.SimpleQueue()
+        _queue_listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _queue_listener.start()
+        atexit.register(stop_logging)
+        os.register_at_fork(after_in_child=_log_directly)
+        handler = logging.handlers.QueueHandler(log_queue)
+        # The listener's handler applies LOG_FORMAT; the queued record only carries the merged message
+        handler.setFormatter(logging.Formatter('%(message)s'))
     logging.basicConfig(
         level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler()
-        ]
+        format=LOG_FORMAT,
+        handlers=[handler]
     )
-    logging.info('Logger initialized with level: %s', log_level)
\ No newline at end of file
+    logging.info('Logger initialized with level: %s', log_level)
+
+
+def _stream_handler() -> logging.Handler:
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    return handler
+
+
+def _log_directly():
+    """
+    In a forked child (e.g. a ProcessPoolExecutor worker), swap the inherited
+    QueueHandler for a plain stream handler: the listener thread draining the
+    queue only runs in the parent, so queued records would be lost.
+    """
+    global _queue_listener
+    _queue_listener = None
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+            root.addHandler(_stream_handler())
+
+
+def stop_logging():
+    """
+    Flush and stop the background queue listener, if one is running.
+    """
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+class LazyMessage:
+    """
+    Defers an expensive message argument until a handler actually formats it:
+    logging.debug('%s', LazyMessage(describe, df)) never calls describe when DEBUG is off.
+    """
+
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return str(self.func(*self.args, **self.kwargs))
+
+
+def _describe_frame(df, time_column, max_columns):
+    if df is None:
+        return 'no data'
+    rows = len(df)
+    description = f'{rows} rows'
+    columns = getattr(df, 'columns', None)
+    if rows and columns is not None and time_column in columns:
+        timestamps = df[time_column]
+        description += f', {time_column} {timestamps.min()} .. {timestamps.max()}'
+    if columns is not None:
+        names = [str(column) for column in columns]
+        shown = ', '.join(names[:max_columns])
+        description += f', columns [{shown}{", ..." if len(names) > max_columns else ""}]'
+    return description
+
+
+def summarize_frame(df, time_column: str = 'timestamp', max_columns: int = 12) -> LazyMessage:
+    """
+    Size-capped description of a frame for log messages: row count, time range
+    and column names, never the rows themselves. Evaluated only when emitted.
+    """
+    return LazyMessage(_describe_frame, df, time_column, max_columns)
+
+
+class SampledLog:
+    """
+    Emits one of every `every` messages logged under the same key, for per-row or
+    per-tick messages that would otherwise flood the log. Emitted messages carry
+    the number of calls seen so far. Thread-safe.
+    """
+
+    def __init__(self, every: int = 100, logger: logging.Logger = None):
+        if every < 1:
+            raise ValueError('every must be at least 1')
+        self.every = every
+        self.logger = logger or logging.getLogger()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def log(self, level: int, key, msg: str, *args) -> bool:
+        """
+        :return: True if this call was emitted
+        """
+        if not self.logger.isEnabledFor(level):
+            return False
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = itertools.count(1)
+            seen = next(counter)
+        if (seen - 1) % self.every:
+            return False
+        self.logger.log(level, f'{msg} [sampled 1/{self.every}, {seen} seen]', *args)
+        return True
+
+    def debug(self, key, msg: str, *args) -> bool:
+        return self.log(logging.DEBUG, key, msg, *args)
+
+    def info(self, key, msg: str, *args) -> bool:
+        return self.log(logging.INFO, key, msg, *args)
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+import time
+
+
+class AsyncRateLimiter:
+    """
+    Token-bucket rate limiter for asyncio code: at most `rate` acquisitions per
+    `per` seconds on average, with bursts of up to `burst` (defaults to `rate`).
+    """
+
+    def __init__(self, rate: float, per: float = 1.0, burst: int = None):
+        self.rate = rate / per
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        # The lock makes waiters queue in arrival order instead of racing for tokens
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket with the same parameters as AsyncRateLimiter.
+    A caller short of a token reserves the next one and sleeps outside the
+    lock, so waiting threads are released in arrival order, one per 1 / rate seconds.
+    """
+
+    def __init__(self, rate: float, per: float = 1.0, burst: int = None):
+        self.rate = rate / per
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            # Tokens may go negative: each waiter owns the debt it has to sleep off
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# Sentinel for "use the cache's default TTL"; None means the entry never expires
+DEFAULT_TTL = object()
+
+
+class ResponseCache:
+    """
+    Persistent, content-addressed cache for text responses of remote APIs, stored in SQLite.
+
+    Entries expire after their TTL and the least recently used entries are
+    evicted once the cache holds more than `max_entries`. Safe to share between
+    threads; every process opens its own SQLite connection.
+    """
+
+    # SQLite table holding the entries; subclasses sharing a file use their own
+    table = 'response_cache'
+
+    def __init__(self, path, ttl=3600, max_entries=10000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """
+        SHA-256 of the JSON encoding of the key parts, e.g. (model, messages, date).
+        """
+        payload = json.dumps(parts, sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _connect(self):
+        # SQLite connections must not cross a fork
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False,
+                                               isolation_level=None)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._connection.execute(
+                f'CREATE INDEX IF NOT EXISTS {self.table}_accessed_at ON {self.table} (accessed_at)')
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, key: str):
+        """
+        Return the cached value for key, or None if it is missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                connection = self._connect()
+                row = connection.execute(f'SELECT value, expires_at FROM {self.table} WHERE key = ?', (key,)).fetchone()
+                if row is not None and row[1] is not None and row[1] <= now:
+                    connection.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                    row = None
+                if row is not None:
+                    connection.execute(f'UPDATE {self.table} SET accessed_at = ? WHERE key = ?', (now, key))
+            except sqlite3.Error as e:
+                logging.error(f"Error reading {self.table}: {e}")
+                row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def set(self, key: str, value: str, ttl=DEFAULT_TTL):
+        """
+        Store value under key.
+        :param ttl: Seconds until the entry expires, None for never; defaults to the cache TTL
+        """
+        ttl = self.ttl if ttl is DEFAULT_TTL else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.execute(f"""
+                    INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)
+                """, (key, value, expires_at, now))
+                self._evict(connection)
+            except sqlite3.Error as e:
+                logging.error(f"Error writing {self.table}: {e}")
+
+    def _evict(self, connection):
+        count = connection.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+        if count > self.max_entries:
+            connection.execute(f"""
+                DELETE FROM {self.table} WHERE key IN (
+                    SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?
+                )
+            """, (count - self.max_entries,))
+
+    def get_or_create(self, key: str, create, ttl=DEFAULT_TTL) -> str:
+        """
+        Return the cached value for key, calling create() and caching its result on a miss.
+        """
+        value = self.get(key)
+        if value is None:
+            value = create()
+            if value is not None:
+                self.set(key, value, ttl)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._connect().execute(f'DELETE FROM {self.table}')
@@ -0,0 +1,76 @@
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import List, NamedTuple
+
+# One line of `python -X importtime` output: "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$')
+
+
+class ImportTiming(NamedTuple):
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(text: str) -> List[ImportTiming]:
+    """
+    Parse the stderr of `python -X importtime`, keeping the order of the output.
+    Nesting depth comes from the indentation of the package name (two spaces per level).
+    """
+    timings = []
+    for line in text.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings.append(ImportTiming(name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return timings
+
+
+def profile_imports(module: str, cwd: str = None, python: str = None):
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+    :return: (timings, wall-clock seconds of the whole interpreter run)
+    """
+    start = time.perf_counter()
+    result = subprocess.run([python or sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=cwd or os.getcwd(), capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr), wall
+
+
+def format_import_report(timings: List[ImportTiming], module: str, wall: float = None, top: int = 15) -> str:
+    """
+    Summarize import timings: the total for `module`, its direct imports by
+    cumulative time and the single most expensive modules by self time.
+    """
+    target = next((timing for timing in reversed(timings) if timing.name == module), None)
+    lines = []
+    if wall is not None:
+        lines.append(f"interpreter start + import {module}: {wall * 1000:.0f} ms wall")
+    if target is None:
+        lines.append(f"{module} was not imported")
+        return '\n'.join(lines)
+    lines.append(f"import {module}: {target.cumulative_us / 1000:.1f} ms cumulative")
+
+    # Direct imports of the target are the lines one level deeper that precede it
+    index = timings.index(target)
+    children = []
+    for timing in reversed(timings[:index]):
+        if timing.depth <= target.depth:
+            break
+        if timing.depth == target.depth + 1:
+            children.append(timing)
+    lines.append(f"\nslowest imports of {module} (cumulative ms):")
+    for timing in sorted(children, key=lambda timing: timing.cumulative_us, reverse=True)[:top]:
+        lines.append(f"  {timing.cumulative_us / 1000:9.1f}  {timing.name}")
+
+    lines.append("\nslowest modules (self ms):")
+    for timing in sorted(timings, key=lambda timing: timing.self_us, reverse=True)[:top]:
+        lines.append(f"  {timing.self_us / 1000:9.1f}  {timing.name}")
+    return '\n'.join(lines)
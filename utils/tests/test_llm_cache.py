@@ -0,0 +1,66 @@
+import datetime
+
+from sentiment_analysis.sentiment_analyzer import SentimentAnalyzer
+from sentiment_analysis.services.company_news_service import CompanyNewsService
+from utils.fake_openai import FakeOpenAI
+from utils.llm_cache import LLMCache
+
+
+def make_cache(tmp_path, **kwargs):
+    return LLMCache(str(tmp_path / 'llm.sqlite3'), **kwargs)
+
+
+def test_cache_key_is_content_addressed():
+    messages = [{'role': 'user', 'content': 'hi'}]
+    assert LLMCache.make_key('m', messages, datetime.date(2024, 1, 2)) == \
+        LLMCache.make_key('m', [{'content': 'hi', 'role': 'user'}], datetime.date(2024, 1, 2))
+    assert LLMCache.make_key('m', messages, datetime.date(2024, 1, 2)) != \
+        LLMCache.make_key('m', messages, datetime.date(2024, 1, 3))
+
+
+def test_cache_ttl_and_lru_eviction(tmp_path):
+    cache = make_cache(tmp_path, ttl=60, max_entries=2)
+    cache.set('expired', 'x', ttl=-1)
+    assert cache.get('expired') is None
+
+    cache.set('a', '1')
+    cache.set('b', '2')
+    assert cache.get('a') == '1'
+    cache.set('c', '3')
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == ('1', '3')
+
+
+def test_sentiment_analyzer_reuses_cached_score(tmp_path):
+    client = FakeOpenAI('42')
+    analyzer = SentimentAnalyzer({}, client=client, cache=make_cache(tmp_path))
+    assert analyzer.analyze('Strong earnings') == 42.0
+    assert analyzer.analyze('Strong earnings') == 42.0
+    assert analyzer.analyze('Weak guidance') == 42.0
+    assert len(client.calls) == 2
+
+
+def test_unparseable_scores_are_not_cached(tmp_path):
+    client = FakeOpenAI(['n/a', '42'])
+    cache = make_cache(tmp_path)
+    analyzer = SentimentAnalyzer({}, client=client, cache=cache)
+    assert analyzer.analyze('Strong earnings') is None
+    assert analyzer.analyze('Strong earnings') == 42.0
+    assert analyzer.analyze('Strong earnings') == 42.0
+    assert len(client.calls) == 2
+
+
+def test_company_news_cached_by_ticker_and_date(tmp_path):
+    client = FakeOpenAI(['{"news": []}', 'not json'])
+    cache = make_cache(tmp_path, ttl=60)
+    service = CompanyNewsService({'pplx_api_key': 'x'}, client=client, cache=cache)
+    past = datetime.date(2024, 1, 2)
+    assert service.get_company_news(past, 'AAPL') == {'news': []}
+    assert CompanyNewsService({'pplx_api_key': 'x'}, client=client, cache=cache).get_company_news(
+        past, 'AAPL') == {'news': []}
+    assert len(client.calls) == 1
+
+    # Unparseable responses are not cached
+    assert 'error' in service.get_company_news(past, 'MSFT')
+    assert service.get_company_news(past, 'MSFT') == {'news': []}
+    assert len(client.calls) == 3
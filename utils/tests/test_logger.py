@@ -0,0 +1,78 @@
+import logging
+import os
+import subprocess
+import sys
+import textwrap
+
+import pandas as pd
+
+from utils.logger import LazyMessage, SampledLog, summarize_frame
+
+
+class _Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def _logger(name, level):
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    logger.propagate = False
+    handler = _Records()
+    logger.handlers = [handler]
+    return logger, handler
+
+
+def test_lazy_message_is_not_formatted_when_level_is_disabled():
+    calls = []
+    logger, handler = _logger('tests.lazy', logging.INFO)
+    logger.debug('%s', LazyMessage(lambda: calls.append(1) or 'expensive'))
+    assert calls == [] and handler.messages == []
+    logger.info('%s', LazyMessage(lambda: calls.append(1) or 'expensive'))
+    assert calls == [1] and handler.messages == ['expensive']
+
+
+def test_summarize_frame_reports_size_and_range_not_rows():
+    df = pd.DataFrame({'timestamp': pd.date_range('2024-01-01', periods=1000), 'close': range(1000)})
+    summary = str(summarize_frame(df))
+    assert summary.startswith('1000 rows, timestamp 2024-01-01 00:00:00 .. 2026-09-26 00:00:00')
+    assert 'columns [timestamp, close]' in summary
+    assert '999' not in summary
+    assert str(summarize_frame(pd.DataFrame({'a': [1]}), max_columns=0)) == '1 rows, columns [, ...]'
+
+
+def test_sampled_log_emits_one_in_every_n_per_key():
+    logger, handler = _logger('tests.sampled', logging.DEBUG)
+    sampled = SampledLog(every=10, logger=logger)
+    emitted = [sampled.debug('AAPL', 'bar %s', i) for i in range(25)]
+    sampled.debug('MSFT', 'bar %s', 0)
+    assert sum(emitted) == 3
+    assert handler.messages[:3] == ['bar 0 [sampled 1/10, 1 seen]', 'bar 10 [sampled 1/10, 11 seen]',
+                                    'bar 20 [sampled 1/10, 21 seen]']
+    assert handler.messages[3].startswith('bar 0 ')
+
+
+def test_async_logging_reaches_stderr_from_forked_workers():
+    script = textwrap.dedent("""
+        import logging, multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from utils.logger import initialize_logging
+
+        def work(i):
+            logging.info(f'worker line {i}')
+
+        if __name__ == '__main__':
+            initialize_logging()
+            with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context('fork')) as executor:
+                list(executor.map(work, range(2)))
+            logging.info('parent line')
+    """)
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, timeout=60,
+                            cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                            env=dict(os.environ, LOG_ASYNC='1', LOG_LEVEL='INFO'))
+    assert 'worker line 0' in result.stderr and 'worker line 1' in result.stderr
+    assert 'parent line' in result.stderr
@@ -0,0 +1,32 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.helpers import latency_percentiles
+from utils.rate_limiter import AsyncRateLimiter, RateLimiter
+
+
+def test_async_rate_limiter_spaces_acquisitions_after_burst():
+    async def acquire_all():
+        limiter = AsyncRateLimiter(20, burst=5)
+        start = time.perf_counter()
+        await asyncio.gather(*(limiter.acquire() for _ in range(15)))
+        return time.perf_counter() - start
+
+    # 5 tokens up front, the other 10 at 20 per second
+    assert 0.45 <= asyncio.run(acquire_all()) < 1.0
+
+
+def test_rate_limiter_spaces_acquisitions_across_threads():
+    limiter = RateLimiter(20, burst=5)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: limiter.acquire(), range(15)))
+    assert 0.45 <= time.perf_counter() - start < 1.0
+
+
+def test_latency_percentiles():
+    summary = latency_percentiles([0.1, 0.2, 0.3, 0.4])
+    assert summary['count'] == 4 and summary['max'] == 0.4
+    assert abs(summary['p50'] - 0.25) < 1e-12
+    assert latency_percentiles([]) == {'count': 0}
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+from utils.startup_profile import format_import_report, parse_importtime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   config.settings
+import time:       300 |        900 |     pandas.core
+import time:      2000 |       2900 |   pandas
+import time:        50 |       3070 | main
+"""
+
+
+def test_parse_importtime_reads_depth_and_times():
+    timings = parse_importtime(SAMPLE)
+    assert [(timing.name, timing.depth) for timing in timings] == [
+        ('config.settings', 1), ('pandas.core', 2), ('pandas', 1), ('main', 0)]
+    assert timings[2].self_us == 2000 and timings[2].cumulative_us == 2900
+
+
+def test_format_import_report_lists_direct_imports():
+    report = format_import_report(parse_importtime(SAMPLE), 'main', top=5)
+    direct = report.split('slowest imports of main')[1].split('slowest modules')[0]
+    assert 'pandas' in direct and 'config.settings' in direct and 'pandas.core' not in direct
+    assert 'import main: 3.1 ms cumulative' in report
+
+
+def test_main_import_skips_llm_plotting_and_alpaca():
+    heavy = ['openai', 'matplotlib', 'alpaca', 'requests', 'schedule']
+    code = f"import sys, main; print([name for name in {heavy!r} if name in sys.modules])"
+    result = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'